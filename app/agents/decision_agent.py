@@ -1,32 +1,130 @@
 from __future__ import annotations
 
-from pydantic_ai import Agent, RunContext
+import threading
+from typing import TYPE_CHECKING, Any
 
 from app.agents.dependencies import AgentDependencies
 from app.config.settings import get_settings
-from app.agents.models import DecisionOutput, TenQInsights
-
-settings = get_settings()
-
-decision_agent = Agent(
-    settings.llm_model, 
-    deps_type=AgentDependencies,
-    output_type=DecisionOutput,
-    instructions=(
-        "You are an equity analyst asked to provide a high-level Buy/Sell/Hold style "
-        "view purely from the latest 10-Q. "
-        "Be conservative, highlight uncertainties, and clearly explain that this is "
-        "not investment advice. Prefer HOLD when information is incomplete or ambiguous."
-    ),
+from app.agents.models import (
+    DecisionOutput,
+    DecisionVerdict,
+    LiquidityView,
+    RiskView,
+    TenQInsights,
 )
 
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+
+_ANALYST = (
+    "You are an equity analyst asked to provide a high-level Buy/Sell/Hold style "
+    "view purely from the latest 10-Q. "
+)
 
-@decision_agent.tool
-def pass_insights(
-    ctx: RunContext[AgentDependencies],
-    insights: TenQInsights,
-) -> TenQInsights:
+# name -> (output type, instructions). The Agents themselves are built on
+# first use by get_agent(): pydantic-ai and the model SDK take seconds to
+# import, and the model comes from settings.
+_AGENT_SPECS: dict[str, tuple[type, str]] = {
+    "decision_agent": (
+        DecisionOutput,
+        _ANALYST + "Be conservative, highlight uncertainties, and clearly explain that this is "
+        "not investment advice. Prefer HOLD when information is incomplete or ambiguous.",
+    ),
+    # -----------------------------------------------------------------------
+    # Split mode (DECISION_MODE=split): three focused agents over the same
+    # insights run concurrently; merge_decision assembles a DecisionOutput.
+    # -----------------------------------------------------------------------
+    "verdict_agent": (
+        DecisionVerdict,
+        _ANALYST + "Give only the call, your confidence, the time horizon and the positives "
+        "behind it; risks are assessed separately. Prefer HOLD when information is "
+        "incomplete or ambiguous.",
+    ),
+    "risk_agent": (
+        RiskView,
+        "You are a risk analyst. From the 10-Q risk items and notable events given, "
+        "list the key negatives and open uncertainties and summarize the risk profile "
+        "in one or two sentences. Do not invent facts.",
+    ),
+    "liquidity_agent": (
+        LiquidityView,
+        "You are a credit analyst. From the 10-Q liquidity, capital structure and "
+        "financial summary given, list liquidity-related negatives and uncertainties "
+        "and assess liquidity in one or two sentences. Do not invent facts.",
+    ),
+}
+
+_agents: dict[str, Agent[AgentDependencies, Any]] = {}
+_agents_lock = threading.Lock()
+
+
+def get_agent(name: str) -> Agent[AgentDependencies, Any]:
     """
-    No-op tool that just passes the structured insights into the model context.
+    The decision_agent / verdict_agent / risk_agent / liquidity_agent
+    Agent, built on first use.
     """
-    return insights
+    agent = _agents.get(name)
+    if agent is None:
+        output_type, instructions = _AGENT_SPECS[name]
+        with _agents_lock:
+            agent = _agents.get(name)
+            if agent is None:
+                from pydantic_ai import Agent
+
+                from app.agents.fake_model import build_model
+                from app.agents.timed_model import TimedModel
+
+                agent = _agents[name] = Agent(
+                    TimedModel(build_model(get_settings().llm_model)),
+                    deps_type=AgentDependencies,
+                    output_type=output_type,
+                    instructions=instructions,
+                )
+    return agent
+
+
+def __getattr__(name: str) -> Any:
+    # The agents were module-level Agents before they were built lazily.
+    if name in _AGENT_SPECS:
+        return get_agent(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_RISK_FIELDS = {"company_profile", "risk_summary", "notable_events"}
+_LIQUIDITY_FIELDS = {"company_profile", "financial_summary", "liquidity_and_capital_structure"}
+
+
+def build_decision_prompt(insights_json: str) -> str:
+    return (
+        "You're given structured 10-Q insights in JSON format below.\n"
+        "Based ONLY on this information, provide a Buy/Sell/Hold style view, "
+        "with clear rationale, key risks, and time horizon. "
+        "This is not investment advice.\n\n"
+        f"INSIGHTS_JSON:\n{insights_json}"
+    )
+
+
+def build_risk_prompt(insights: TenQInsights) -> str:
+    return f"INSIGHTS_JSON:\n{insights.model_dump_json(include=_RISK_FIELDS)}"
+
+
+def build_liquidity_prompt(insights: TenQInsights) -> str:
+    return f"INSIGHTS_JSON:\n{insights.model_dump_json(include=_LIQUIDITY_FIELDS)}"
+
+
+def _merged(*lists: list[str]) -> list[str]:
+    return list(dict.fromkeys(item for items in lists for item in items))
+
+
+def merge_decision(
+    verdict: DecisionVerdict, risk: RiskView, liquidity: LiquidityView
+) -> DecisionOutput:
+    return DecisionOutput(
+        decision=verdict.decision,
+        confidence=verdict.confidence,
+        time_horizon=verdict.time_horizon,
+        positives=verdict.positives,
+        negatives=_merged(risk.negatives, liquidity.negatives),
+        uncertainties=_merged(risk.uncertainties, liquidity.uncertainties),
+        risk_profile=f"{risk.risk_profile} Liquidity: {liquidity.assessment}",
+    )
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
 
-from app.edgar.client import EdgarHttpClient
-from app.edgar.cik_resolver import CikResolver
-from app.edgar.submissions import SubmissionsService
-from app.edgar.downloader import FilingDownloader
-from app.parsing.tenq_parser import TenQParser
-from app.vectorstore.embeddings import EmbeddingService
-from app.vectorstore.base import VectorStore
+if TYPE_CHECKING:
+    from app.agents.result_cache import AgentResultCache
+    from app.edgar.client import EdgarHttpClient
+    from app.edgar.cik_resolver import CikResolver
+    from app.edgar.submissions import SubmissionsService
+    from app.edgar.downloader import FilingDownloader
+    from app.edgar.form_index import FormIndex
+    from app.ingestion.boilerplate import BoilerplateDetector
+    from app.ingestion.diff_index import ChunkDiffIndex
+    from app.parsing.tenq_parser import TenQParser
+    from app.vectorstore.embeddings import EmbeddingService
+    from app.vectorstore.base import VectorStore
 
 
 @dataclass
@@ -20,3 +26,10 @@ class AgentDependencies:
     tenq_parser: TenQParser
     embeddings: EmbeddingService
     vector_store: VectorStore
+    diff_index: Optional[ChunkDiffIndex] = None
+    boilerplate: Optional[BoilerplateDetector] = None
+    form_index: Optional[FormIndex] = None
+    agent_cache: Optional[AgentResultCache] = None
+    # The filing an agent run analyses; set on a per-run copy (see
+    # orchestrator.run_agents), never on the shared process-wide deps.
+    accession_number: Optional[str] = None
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+from datetime import date, timedelta
+from typing import Any, Optional, Sequence, Union
+
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart, UserPromptPart
+from pydantic_ai.models import Model
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from app.config.settings import get_settings
+
+# "Stock Ticker / Company Name: AAPL" (insights prompt) or "ticker": "AAPL" (insights JSON)
+_TICKER_RE = re.compile(r'Ticker / Company Name: (\S+)|"ticker":\s*"([^"]+)"')
+
+
+def parse_tool_calls(pattern: str) -> list[list[str]]:
+    """
+    "a,b+c" -> [["a"], ["b", "c"]]: one model round-trip per comma-separated
+    step, "+" for tool calls issued together in one response.
+    """
+    return [
+        [name.strip() for name in step.split("+") if name.strip()]
+        for step in pattern.split(",")
+        if step.strip()
+    ]
+
+
+def sample_from_schema(
+    schema: dict[str, Any],
+    rnd: random.Random,
+    *,
+    hints: Optional[dict[str, Any]] = None,
+) -> Any:
+    """
+    A deterministic (for a given `rnd`) instance of a JSON schema as
+    pydantic emits it: $ref/$defs, anyOf, enums, numeric bounds, dates.
+    `hints` pins values for properties by name (e.g. the ticker).
+    """
+    defs = schema.get("$defs", {})
+    hints = hints or {}
+
+    def sample(node: dict[str, Any], name: str) -> Any:
+        if name in hints:
+            return hints[name]
+        if "$ref" in node:
+            return sample(defs[node["$ref"].rsplit("/", 1)[-1]], name)
+        if "const" in node:
+            return node["const"]
+        if "enum" in node:
+            return rnd.choice(node["enum"])
+        for key in ("anyOf", "oneOf"):
+            if key in node:
+                options = [o for o in node[key] if o.get("type") != "null"] or node[key]
+                return sample(options[0], name)
+        if node.get("default") not in (None, [], {}):
+            return node["default"]
+
+        kind = node.get("type")
+        if isinstance(kind, list):
+            kind = next((k for k in kind if k != "null"), "null")
+        if kind == "object" or "properties" in node:
+            out = {key: sample(prop, key) for key, prop in node.get("properties", {}).items()}
+            extra = node.get("additionalProperties")
+            if isinstance(extra, dict) and not out:
+                out = {f"{name}_{i}": sample(extra, name) for i in range(1, 3)}
+            return out
+        if kind == "array":
+            low = node.get("minItems", 1)
+            high = max(low, min(node.get("maxItems", 3), 3))
+            return [sample(node.get("items", {}), name) for _ in range(rnd.randint(low, high))]
+        if kind == "string":
+            if node.get("format") == "date":
+                return (date(2025, 1, 1) + timedelta(days=rnd.randint(0, 364))).isoformat()
+            if node.get("format") == "date-time":
+                return f"{date(2025, 1, 1) + timedelta(days=rnd.randint(0, 364))}T00:00:00Z"
+            return f"Synthetic {name.replace('_', ' ')} #{rnd.randint(1, 999)}"
+        if kind in ("number", "integer"):
+            low = node.get("minimum", node.get("exclusiveMinimum", 0))
+            high = node.get("maximum", node.get("exclusiveMaximum", low + 100))
+            if kind == "integer":
+                return rnd.randint(int(low), int(high))
+            return round(rnd.uniform(low, high), 3)
+        if kind == "boolean":
+            return rnd.random() < 0.5
+        return None
+
+    return sample(schema, "value")
+
+
+def _ticker_in(messages: Sequence[ModelMessage]) -> str:
+    for message in messages:
+        for part in getattr(message, "parts", ()):
+            if isinstance(part, UserPromptPart) and isinstance(part.content, str):
+                match = _TICKER_RE.search(part.content)
+                if match:
+                    return match.group(1) or match.group(2)
+    return "TEST"
+
+
+class FakeLLM:
+    """
+    Local, deterministic stand-in for the LLM behind the agents, for
+    offline load tests and profiling (LLM_MODEL=fake).
+
+    Each model request sleeps `latency_seconds` plus up to `jitter_seconds`,
+    then either issues the next step of `tool_calls` (tools the agent
+    doesn't have are skipped, their arguments sampled from the tool
+    schema) or returns a schema-valid instance of the agent's output type.
+    Outputs depend only on `seed`, the ticker in the prompt and the output
+    schema, so identical requests get identical results.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        tool_calls: str = "",
+        seed: int = 0,
+    ) -> None:
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.steps = parse_tool_calls(tool_calls)
+        self.seed = seed
+        self._jitter = random.Random(seed)
+
+    def model(self) -> FunctionModel:
+        return FunctionModel(self.respond, model_name="fake")
+
+    async def respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        delay = self.latency_seconds + self._jitter.uniform(0.0, self.jitter_seconds)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        ticker = _ticker_in(messages)
+        tools = {t.name: t for t in info.function_tools}
+        steps = [[n for n in step if n in tools] for step in self.steps]
+        steps = [step for step in steps if step]
+        done = sum(isinstance(m, ModelResponse) for m in messages)
+
+        if done < len(steps):
+            parts = []
+            for i, name in enumerate(steps[done]):
+                rnd = random.Random(f"{self.seed}:{ticker}:{name}:{done}:{i}")
+                args = sample_from_schema(
+                    tools[name].parameters_json_schema,
+                    rnd,
+                    hints={"ticker": ticker, "query": f"{ticker} results and risks"},
+                )
+                # Optional parameters keep their defaults.
+                required = tools[name].parameters_json_schema.get("required", [])
+                parts.append(ToolCallPart(name, {k: v for k, v in args.items() if k in required}))
+            return ModelResponse(parts=parts, model_name="fake")
+
+        output = info.output_tools[0]
+        rnd = random.Random(f"{self.seed}:{ticker}:{output.parameters_json_schema.get('title')}")
+        args = sample_from_schema(output.parameters_json_schema, rnd, hints={"ticker": ticker})
+        return ModelResponse(parts=[ToolCallPart(output.name, args)], model_name="fake")
+
+
+def build_model(name: str) -> Union[Model, str]:
+    """
+    The agents' model: "fake" (or "fake:<anything>") builds a FakeLLM from
+    the FAKE_LLM_* settings; any other name is passed to pydantic-ai as is.
+    """
+    if name != "fake" and not name.startswith("fake:"):
+        return name
+    settings = get_settings()
+    return FakeLLM(
+        latency_seconds=settings.fake_llm_latency_seconds,
+        jitter_seconds=settings.fake_llm_jitter_seconds,
+        tool_calls=settings.fake_llm_tool_calls,
+        seed=settings.fake_llm_seed,
+    ).model()
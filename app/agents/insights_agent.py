@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-from pydantic_ai import Agent, RunContext
+import functools
+import threading
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from app.agents.dependencies import AgentDependencies
 from app.agents.models import TenQInsights
 from app.config.settings import get_settings
+from app.ingestion.diff_index import ChunkChange, ChunkDiffEntry
+from app.observability.tracing import span
 from app.parsing.models import TenQChunk
 from app.vectorstore.base import ScoredChunk
 
-settings = get_settings()
+if TYPE_CHECKING:
+    from pydantic_ai import Agent, RunContext
 
 # ---------------------------------------------------------------------------
 # Prompt template (formatted, dynamic fields)
@@ -60,6 +66,8 @@ FORMATTING REQUIREMENTS:
 
 TOOLING & GROUNDING RULES:
 - Use `retrieve_tenq_chunks` sparingly (max 3 calls).
+- Call `retrieve_changed_chunks` once to see what changed vs. the prior quarter's 10-Q;
+  set `changed_since_prior` on a risk item only when it is backed by a changed/new chunk.
 - Request only a small number of chunks per call.
 - Base claims strictly on retrieved 10-Q text; do NOT invent numbers.
 - If a required fact is not in the filing, say **"not disclosed"** or **"unknown"**.
@@ -76,26 +84,76 @@ Return ONLY valid JSON that matches the TenQInsights schema.
 # Agent definition
 # ---------------------------------------------------------------------------
 
-insights_agent = Agent(
-    settings.llm_model,
-    deps_type=AgentDependencies,
-    output_type=TenQInsights,
-    # We keep instructions concise and stable; the big template goes in the user prompt.
-    instructions=(
-        "You are an equity research analyst. "
-        "Follow the user's prompt, which provides the detailed analysis framework. "
-        "Use tools when needed, ground all claims in retrieved 10-Q text, "
-        "and return ONLY JSON that matches the TenQInsights schema, with no extra text."
-    ),
-    retries=3,
-    output_retries=3,
+# We keep instructions concise and stable; the big template goes in the user prompt.
+_INSTRUCTIONS = (
+    "You are an equity research analyst. "
+    "Follow the user's prompt, which provides the detailed analysis framework. "
+    "Use tools when needed, ground all claims in retrieved 10-Q text, "
+    "and return ONLY JSON that matches the TenQInsights schema, with no extra text."
 )
 
+_agent: Optional[Agent[AgentDependencies, TenQInsights]] = None
+_agent_lock = threading.Lock()
+
+
+def get_insights_agent() -> Agent[AgentDependencies, TenQInsights]:
+    """
+    The insights agent, built on first use: importing pydantic-ai and the
+    model SDK takes seconds, and the model comes from settings.
+    """
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                _agent = _build_agent()
+    return _agent
+
+
+def _build_agent() -> Agent[AgentDependencies, TenQInsights]:
+    from pydantic_ai import Agent, RunContext
+
+    from app.agents.fake_model import build_model
+    from app.agents.timed_model import TimedModel
+
+    agent = Agent(
+        TimedModel(build_model(get_settings().llm_model)),
+        deps_type=AgentDependencies,
+        output_type=TenQInsights,
+        instructions=_INSTRUCTIONS,
+        # Same budget for tool and output retries.
+        retries=3,
+    )
+    for tool in (retrieve_tenq_chunks, retrieve_changed_chunks):
+        agent.tool(_with_context_type(tool, RunContext[AgentDependencies]))
+    return agent
+
+
+def _with_context_type(tool: Callable[..., Any], context_type: Any) -> Callable[..., Any]:
+    """
+    `tool` with its `ctx` annotation resolved. RunContext is only imported
+    for type checking here, so pydantic-ai could not resolve the string
+    annotation it reads from the tool's signature.
+    """
+
+    @functools.wraps(tool)
+    async def wrapper(ctx: Any, *args: Any, **kwargs: Any) -> Any:
+        return await tool(ctx, *args, **kwargs)
+
+    wrapper.__annotations__ = {**tool.__annotations__, "ctx": context_type}
+    return wrapper
+
+
+def __getattr__(name: str) -> Any:
+    # `insights_agent` was a module-level Agent before it was built lazily.
+    if name == "insights_agent":
+        return get_insights_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 MAX_CHUNK_CHARS = 1500
 MAX_TOP_K = 5
 
 
-@insights_agent.tool
 async def retrieve_tenq_chunks(
     ctx: RunContext[AgentDependencies],
     ticker: str,
@@ -110,32 +168,59 @@ async def retrieve_tenq_chunks(
     """
     effective_top_k = min(top_k, MAX_TOP_K)
 
-    embeds = await ctx.deps.embeddings.embed_many([query])
-    scored: list[ScoredChunk] = await ctx.deps.vector_store.search(
-        embeds[0],
-        top_k=effective_top_k,
-        ticker=ticker,
-    )
+    with span("retrieve_tenq_chunks", top_k=effective_top_k) as tool_span:
+        embeds = await ctx.deps.embeddings.embed_many([query])
+        scored: list[ScoredChunk] = await ctx.deps.vector_store.search(
+            embeds[0],
+            top_k=effective_top_k,
+            ticker=ticker,
+            accession_number=ctx.deps.accession_number,
+            exclude_boilerplate=True,
+        )
+        tool_span.set(hits=len(scored))
 
     limited_chunks: list[TenQChunk] = []
     for s in scored:
         chunk = s.chunk
         if len(chunk.text) > MAX_CHUNK_CHARS:
-            limited_chunks.append(
-                TenQChunk(
-                    section_name=chunk.section_name,
-                    section_item=chunk.section_item,
-                    chunk_index=chunk.chunk_index,
-                    text=chunk.text[:MAX_CHUNK_CHARS],
-                    metadata=chunk.metadata,
-                )
-            )
-        else:
-            limited_chunks.append(chunk)
+            chunk = replace(chunk, text=chunk.text[:MAX_CHUNK_CHARS])
+        limited_chunks.append(chunk)
 
     return limited_chunks
 
 
+MAX_CHANGED_CHUNKS = 8
+
+
+async def retrieve_changed_chunks(
+    ctx: RunContext[AgentDependencies],
+    ticker: str,
+    change: ChunkChange | None = None,
+    limit: int = MAX_CHANGED_CHUNKS,
+) -> list[ChunkDiffEntry]:
+    """
+    Return chunks that changed, were added, or were removed since the prior
+    quarter's 10-Q, as computed at ingestion time. Empty when no prior filing
+    was available to diff against, or the run doesn't name its filing
+    (deps.accession_number).
+
+    - limit is capped to MAX_CHANGED_CHUNKS; text is truncated to MAX_CHUNK_CHARS.
+    - changed/new chunks come first, removed chunks last.
+    """
+    if ctx.deps.diff_index is None or ctx.deps.accession_number is None:
+        return []
+    with span("retrieve_changed_chunks"):
+        diff = ctx.deps.diff_index.get_for(ticker, ctx.deps.accession_number)
+    if diff is None:
+        return []
+
+    entries = diff.entries if change is None else diff.of(change)
+    entries = sorted(entries, key=lambda e: e.change == ChunkChange.REMOVED)
+    return [
+        replace(e, text=e.text[:MAX_CHUNK_CHARS]) for e in entries[: min(limit, MAX_CHANGED_CHUNKS)]
+    ]
+
+
 def build_insights_prompt(
     ticker: str,
     thesis: str | None = None,
@@ -147,11 +232,16 @@ def build_insights_prompt(
     If thesis/goal aren't provided by the caller (e.g. API only supplies ticker),
     we fill them with sensible defaults.
     """
-    thesis_text = thesis or "Not explicitly specified; infer a reasonable thesis from the latest 10-Q."
-    goal_text = goal or "Summarize and analyze the latest 10-Q into the requested equity research structure."
+    thesis_text = (
+        thesis or "Not explicitly specified; infer a reasonable thesis from the latest 10-Q."
+    )
+    goal_text = (
+        goal
+        or "Summarize and analyze the latest 10-Q into the requested equity research structure."
+    )
 
     return INSIGHTS_PROMPT_TEMPLATE.format(
         ticker=ticker,
         thesis=thesis_text,
         goal=goal_text,
-    )
\ No newline at end of file
+    )
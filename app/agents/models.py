@@ -76,3 +76,26 @@ class DecisionOutput(BaseModel):
         "This is an automated, heuristic assessment based on the latest 10-Q filing and "
         "does not constitute investment advice. Do your own research."
     )
+
+
+# Split decision mode: the decision is assembled from focused sub-analyses
+# of the insights report that run concurrently.
+
+
+class DecisionVerdict(BaseModel):
+    decision: DecisionEnum
+    confidence: float = Field(ge=0.0, le=1.0)
+    time_horizon: str
+    positives: list[str]
+
+
+class RiskView(BaseModel):
+    negatives: list[str]
+    uncertainties: list[str]
+    risk_profile: str
+
+
+class LiquidityView(BaseModel):
+    negatives: list[str]
+    uncertainties: list[str]
+    assessment: str
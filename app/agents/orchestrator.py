@@ -1,30 +1,165 @@
 from __future__ import annotations
 
+import asyncio
+import sys
+from dataclasses import dataclass, replace
 from datetime import date
+from time import monotonic
+
+import structlog
+from typing import Any, AsyncIterator, Collection, Optional, Sequence
 from pathlib import Path
 
 from app.agents.dependencies import AgentDependencies
-from app.agents.decision_agent import decision_agent
-from app.agents.insights_agent import insights_agent, build_insights_prompt
+from app.agents.decision_agent import (
+    build_decision_prompt,
+    build_liquidity_prompt,
+    build_risk_prompt,
+    get_agent,
+    merge_decision,
+)
+from app.agents.insights_agent import build_insights_prompt, get_insights_agent
 from app.agents.models import DecisionOutput, TenQInsights
+from app.agents.result_cache import insights_key
 from app.config.settings import get_settings
-from app.edgar.client import EdgarHttpClient
-from app.edgar.cik_resolver import CikResolver
-from app.edgar.downloader import FilingDownloader
 from app.edgar.metadata_cache import TenQMetadataCache
-from app.edgar.storage import LocalFileStorage
-from app.edgar.submissions import SubmissionsService
-from app.parsing.tenq_parser import TenQParser
-from app.vectorstore.embeddings import EmbeddingService
-from app.vectorstore.in_memory import InMemoryVectorStore
+from app.ingestion.pipeline import (
+    IngestionStats,
+    ProgressCallback,
+    refresh_latest_tenq,
+    refresh_stages,
+)
+from app.observability.metrics import CACHE_LOOKUPS
+from app.observability.profiler import tag_profile
+from app.observability.tracing import span
+
+_AGENTS = ("decision_agent", "verdict_agent", "risk_agent", "liquidity_agent")
+
+_default_deps: AgentDependencies | None = None
+# In-flight background SEC re-checks (swr cache gate), one per ticker.
+_revalidations: dict[str, asyncio.Task[None]] = {}
+
+
+def __getattr__(name: str) -> Any:
+    # The agents are built on first use (see get_insights_agent / get_agent)
+    # and then kept as ordinary module attributes.
+    if name == "insights_agent":
+        agent = get_insights_agent()
+    elif name in _AGENTS:
+        agent = get_agent(name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = agent
+    return agent
+
+
+async def _agent(name: str) -> Any:
+    """
+    The agent `name`. Building one blocks (imports, or waiting on the
+    startup warm-up), so the first access happens in a thread rather than
+    stalling the event loop. Read through the module, so an agent set on
+    it (tests monkeypatch orch.decision_agent etc.) takes precedence.
+    """
+    module = sys.modules[__name__]
+    if name not in vars(module):
+        await asyncio.to_thread(getattr, module, name)
+    return getattr(module, name)
+
+
+def warm_agents() -> None:
+    """
+    Build the agents now (pydantic-ai and the model SDK imports included)
+    rather than on the first request. Blocking; run it in a thread.
+    """
+    get_insights_agent()
+    split = get_settings().decision_mode == "split"
+    for name in _AGENTS[1:] if split else _AGENTS[:1]:
+        get_agent(name)
+
+
+def schedule_revalidation(
+    deps: AgentDependencies,
+    ticker: str,
+    cache: TenQMetadataCache,
+) -> asyncio.Task[None]:
+    """
+    Re-check SEC for `ticker` in the background and ingest a newer filing
+    if there is one. The cached filing keeps being served until the new
+    one is fully embedded and set_latest swaps it in. Concurrent calls for
+    the same ticker share one task.
+    """
+    task = _revalidations.get(ticker)
+    if task is not None:
+        return task
+
+    async def revalidate() -> None:
+        await refresh_latest_tenq(deps, ticker, cache)
+
+    task = asyncio.create_task(revalidate())
+    _revalidations[ticker] = task
+
+    def done(t: asyncio.Task[None]) -> None:
+        _revalidations.pop(ticker, None)
+        if not t.cancelled():
+            t.exception()  # retrieved; the next stale request retries
+
+    task.add_done_callback(done)
+    return task
 
 
 async def build_default_deps() -> AgentDependencies:
+    """
+    Process-wide default dependencies, built on first use and then shared,
+    so every request reuses one pooled EdgarHttpClient (and the resolver
+    cache, vector store, etc.) instead of opening new connections.
+    """
+    global _default_deps
+    if _default_deps is None:
+        _default_deps = _create_default_deps()
+    return _default_deps
+
+
+async def close_default_deps() -> None:
+    global _default_deps
+    for task in list(_revalidations.values()):
+        task.cancel()
+    if _default_deps is not None:
+        if _default_deps.boilerplate is not None:
+            _default_deps.boilerplate.flush()
+        await _default_deps.edgar_client.aclose()
+        _default_deps = None
+
+
+def _create_default_deps() -> AgentDependencies:
+    # Imported here rather than at module level: the HTTP client, parser
+    # and vector store backends are not needed until a request ingests.
+    from app.agents.result_cache import AgentResultCache
+    from app.edgar.cik_resolver import CikResolver
+    from app.edgar.client import EdgarHttpClient
+    from app.edgar.downloader import FilingDownloader
+    from app.edgar.form_index import FormIndex
+    from app.edgar.http_cache import HttpCache
+    from app.edgar.storage import LocalFileStorage
+    from app.edgar.submissions import SubmissionsService
+    from app.ingestion.boilerplate import BoilerplateDetector
+    from app.ingestion.diff_index import ChunkDiffIndex
+    from app.parsing.tenq_parser import TenQParser
+    from app.vectorstore.embeddings import EmbeddingService
+    from app.vectorstore.in_memory import InMemoryVectorStore
+
     settings = get_settings()
-    edgar_client = EdgarHttpClient()
+    http_cache = (
+        HttpCache(
+            Path(settings.sec_http_cache_dir),
+            max_age_seconds=settings.sec_http_cache_max_age_seconds,
+        )
+        if settings.sec_http_cache_enabled
+        else None
+    )
+    edgar_client = EdgarHttpClient(http_cache=http_cache)
     cik_resolver = CikResolver(edgar_client)
     submissions = SubmissionsService(edgar_client)
-    storage = LocalFileStorage(Path("data"))
+    storage = LocalFileStorage(Path("data"), compression=settings.filing_compression)
     filing_downloader = FilingDownloader(edgar_client, storage)
     parser = TenQParser()
     embeddings = EmbeddingService(settings.embedding_model)
@@ -38,100 +173,421 @@ async def build_default_deps() -> AgentDependencies:
         tenq_parser=parser,
         embeddings=embeddings,
         vector_store=vector_store,
+        diff_index=ChunkDiffIndex(),
+        form_index=FormIndex(
+            edgar_client,
+            lookback_days=settings.form_index_lookback_days,
+            retain_days=settings.form_index_retain_days,
+        ),
+        boilerplate=BoilerplateDetector(
+            mode=settings.boilerplate_mode,
+            min_filings=settings.boilerplate_min_filings,
+        ),
+        agent_cache=(
+            AgentResultCache(Path(settings.agent_cache_path), model=settings.llm_model)
+            if settings.agent_cache_enabled
+            else None
+        ),
     )
 
 
-async def summarize_10q_for_ticker(
+async def run_agents(
+    deps: AgentDependencies,
     ticker: str,
-    filing_period: date | None = None,
     *,
-    deps: AgentDependencies | None = None,
-    force_refresh: bool = False,
+    accession_number: str | None = None,
+    on_event: ProgressCallback | None = None,
 ) -> tuple[TenQInsights, DecisionOutput]:
     """
-    Top-level orchestration:
-      * Skip SEC entirely if cached latest metadata exists AND already ingested
-      * Else call SEC submissions, compare (filing_date, period_of_report)
-      * Re-ingest only when metadata changed or ingestion missing
-      * Run insights + decision agents
+    Run insights + decision on already-ingested data for the filing
+    `accession_number` (what retrieve_changed_chunks diffs). `on_event`
+    gets the validated insights before the decision step starts.
     """
-    deps = deps or await build_default_deps()
-    cache = TenQMetadataCache()
-
     ticker_norm = ticker.upper()
+    if accession_number is not None:
+        deps = replace(deps, accession_number=accession_number)
+    # For now we don't have user-provided thesis/goal at API level,
+    # so we pass reasonable defaults.
+    insights_prompt = build_insights_prompt(
+        ticker=ticker_norm,
+        thesis=None,
+        goal=None,
+    )
 
-    # ----------------------------------------------------------------------
-    # Helper: run insights + decision on already-ingested data
-    # ----------------------------------------------------------------------
-    async def _run_agents() -> tuple[TenQInsights, DecisionOutput]:
-        # For now we don't have user-provided thesis/goal at API level,
-        # so we pass reasonable defaults.
-        insights_prompt = build_insights_prompt(
-            ticker=ticker_norm,
-            thesis=None,
-            goal=None,
-        )
-
+    started = monotonic()
+    with span("insights_agent"):
+        insights_agent = await _agent("insights_agent")
         insights_result = await insights_agent.run(
             insights_prompt,
             deps=deps,
         )
-        insights: TenQInsights = insights_result.output
-
-        decision_prompt = (
-            "You are an equity analyst.\n\n"
-            "You're given structured 10-Q insights in JSON format below.\n"
-            "Based ONLY on this information, provide a Buy/Sell/Hold style view, "
-            "with clear rationale, key risks, and time horizon. "
-            "This is not investment advice.\n\n"
-            f"INSIGHTS_JSON:\n{insights.model_dump_json()}"
+    insights: TenQInsights = insights_result.output
+    if on_event is not None:
+        on_event(
+            "insights",
+            {
+                "seconds": round(monotonic() - started, 3),
+                "insights": insights.model_dump(mode="json"),
+            },
         )
 
-        decision_result = await decision_agent.run(decision_prompt, deps=deps)
-        decision: DecisionOutput = decision_result.output
-        return insights, decision
+    decision = await run_decision(deps, insights, on_event=on_event)
+    return insights, decision
+
+
+async def run_decision(
+    deps: AgentDependencies,
+    insights: TenQInsights,
+    *,
+    on_event: ProgressCallback | None = None,
+) -> DecisionOutput:
+    """
+    Turn insights into a DecisionOutput: one decision_agent run, or with
+    DECISION_MODE=split the verdict / risk / liquidity agents concurrently
+    (merged by merge_decision). Cached in deps.agent_cache by a hash of the
+    insights JSON, so identical insights never pay for a second run.
+    """
+    started = monotonic()
+    mode = get_settings().decision_mode
+    # Serialized once: the same JSON is hashed and sent to the model.
+    insights_json = insights.model_dump_json()
+    key = insights_key(insights_json, mode)
+    decision = None
+    if deps.agent_cache is not None:
+        decision = deps.agent_cache.get_decision(key)
+        CACHE_LOOKUPS.inc(cache="decision", result="miss" if decision is None else "hit")
+    cached = decision is not None
+
+    if decision is None:
+        with span("decision_agent", mode=mode):
+            if mode == "split":
+                verdict_agent = await _agent("verdict_agent")
+                risk_agent = await _agent("risk_agent")
+                liquidity_agent = await _agent("liquidity_agent")
+                verdict, risk, liquidity = await asyncio.gather(
+                    verdict_agent.run(build_decision_prompt(insights_json), deps=deps),
+                    risk_agent.run(build_risk_prompt(insights), deps=deps),
+                    liquidity_agent.run(build_liquidity_prompt(insights), deps=deps),
+                )
+                decision = merge_decision(verdict.output, risk.output, liquidity.output)
+            else:
+                decision_agent = await _agent("decision_agent")
+                decision_result = await decision_agent.run(
+                    build_decision_prompt(insights_json), deps=deps
+                )
+                decision = decision_result.output
+        if deps.agent_cache is not None:
+            deps.agent_cache.put_decision(key, decision)
+
+    if on_event is not None:
+        on_event(
+            "decision",
+            {
+                "seconds": round(monotonic() - started, 3),
+                "cached": cached,
+                "decision": decision.model_dump(mode="json"),
+            },
+        )
+    return decision
+
+
+async def ensure_tenq_ingested(
+    deps: AgentDependencies,
+    ticker: str,
+    filing_period: date | None = None,
+    *,
+    force_refresh: bool = False,
+    refresh: Collection[str] = (),
+    on_event: ProgressCallback | None = None,
+) -> tuple[str, IngestionStats | None]:
+    """
+    The cache gate: make sure the ticker's latest (or `filing_period`)
+    10-Q is ingested, calling SEC only when the cache can't vouch for it.
+    Any `refresh` stage other than "agents" bypasses the gate (see
+    refresh_latest_tenq). Returns the filing's accession number and, when
+    ingestion ran, the ingestion stats.
+    `on_event` gets a "cache" event (hit, stale or miss) and then the
+    ingestion stage timings.
+    """
+    cache = TenQMetadataCache()
+    ticker_norm = ticker.upper()
+    stages = refresh_stages(refresh, force_refresh=force_refresh)
+
+    def cache_event(status: str, **data: Any) -> None:
+        CACHE_LOOKUPS.inc(cache="tenq_metadata", result=status)
+        tag_profile(ticker=ticker_norm, accession_number=data.get("accession_number"))
+        if on_event is not None:
+            on_event("cache", {"status": status, **data})
 
     # -------- Stage A: skip SEC entirely if cache+vectors are valid --------
+    # The form index (when refreshed) knows about 10-Qs filed since the
+    # cached one without a per-ticker SEC call; a newer filing there
+    # invalidates the fast path (in swr mode it triggers a re-check).
+    settings = get_settings()
     cached_latest = cache.get_latest(ticker_norm)
-    if cached_latest and not force_refresh:
-        already_ingested = await deps.vector_store.has_accession(
-            ticker_norm, cached_latest.accession_number
+    if (
+        cached_latest
+        and not stages - {"agents"}
+        and (filing_period is None or filing_period == cached_latest.period_of_report)
+    ):
+        newer_indexed = deps.form_index is not None and deps.form_index.has_newer(
+            int(cached_latest.cik), cached_latest.filing_date
         )
-        if already_ingested:
-            return await _run_agents()
+        if settings.cache_gate_mode == "swr":
+            age = cached_latest.age_seconds()
+            fresh_enough = age <= settings.cache_gate_max_stale_seconds
+            if fresh_enough and await deps.vector_store.has_accession(
+                ticker_norm, cached_latest.accession_number
+            ):
+                stale = newer_indexed or age > settings.cache_gate_fresh_seconds
+                if stale:
+                    schedule_revalidation(deps, ticker_norm, cache)
+                cache_event(
+                    "stale" if stale else "hit",
+                    accession_number=cached_latest.accession_number,
+                    age_seconds=round(age, 1),
+                )
+                return cached_latest.accession_number, None
+        elif not newer_indexed:
+            already_ingested = await deps.vector_store.has_accession(
+                ticker_norm, cached_latest.accession_number
+            )
+            if already_ingested:
+                cache_event("hit", accession_number=cached_latest.accession_number)
+                return cached_latest.accession_number, None
 
     # -------- Otherwise: call SEC to check for updates --------
+    if stages - {"agents"}:
+        cache_event("miss", refresh=sorted(stages))
+    else:
+        cache_event("miss")
+    tenq_meta, stats = await refresh_latest_tenq(
+        deps,
+        ticker_norm,
+        cache,
+        filing_period=filing_period,
+        refresh=stages,
+        on_event=on_event,
+    )
+    tag_profile(accession_number=tenq_meta.accession_number)
+    return tenq_meta.accession_number, stats
+
 
-    # Resolve ticker -> CIK (may hit SEC if resolver TTL expired)
-    cik_info = await deps.cik_resolver.resolve(ticker_norm)
+async def run_agents_cached(
+    deps: AgentDependencies,
+    ticker: str,
+    *,
+    accession_number: str | None = None,
+    reuse: bool = True,
+    on_event: ProgressCallback | None = None,
+) -> tuple[TenQInsights, DecisionOutput]:
+    """
+    run_agents on the filing ensure_tenq_ingested returned (by default the
+    ticker's cached latest), keyed on it and the decision mode in
+    deps.agent_cache: with `reuse`
+    a stored result is returned without calling the LLM, and a fresh
+    result is stored either way.
+    """
+    ticker_norm = ticker.upper()
+    if accession_number is None:
+        latest = TenQMetadataCache().get_latest(ticker_norm)
+        if latest is None:
+            return await run_agents(deps, ticker_norm, on_event=on_event)
+        accession_number = latest.accession_number
+    if deps.agent_cache is None:
+        return await run_agents(
+            deps, ticker_norm, accession_number=accession_number, on_event=on_event
+        )
+    mode = get_settings().decision_mode
+    if reuse:
+        hit = deps.agent_cache.get(ticker_norm, accession_number, mode)
+        CACHE_LOOKUPS.inc(cache="agent_results", result="miss" if hit is None else "hit")
+        if hit is not None:
+            insights, decision = hit
+            if on_event is not None:
+                on_event("insights", {"cached": True, "insights": insights.model_dump(mode="json")})
+                on_event("decision", {"cached": True, "decision": decision.model_dump(mode="json")})
+            return insights, decision
 
-    # Fetch submissions (SEC call)
-    subs = await deps.submissions.fetch_submissions(cik_info.cik_str)
+    insights, decision = await run_agents(
+        deps, ticker_norm, accession_number=accession_number, on_event=on_event
+    )
+    deps.agent_cache.put(ticker_norm, accession_number, mode, insights, decision)
+    return insights, decision
 
-    # Select latest 10-Q
-    tenq_meta = deps.submissions.select_latest_10q(subs, target_period=filing_period)
-    if tenq_meta is None:
-        raise RuntimeError(f"No 10-Q found for ticker {ticker_norm}")
 
-    # -------- Stage B: compare metadata to decide re-ingest --------
-    if cached_latest and not force_refresh and cached_latest.matches(tenq_meta):
-        already_ingested = await deps.vector_store.has_accession(
-            ticker_norm, tenq_meta.accession_number
+async def summarize_10q_for_ticker(
+    ticker: str,
+    filing_period: date | None = None,
+    *,
+    deps: AgentDependencies | None = None,
+    force_refresh: bool = False,
+    refresh: Collection[str] = (),
+) -> tuple[TenQInsights, DecisionOutput]:
+    """
+    Top-level orchestration:
+      * Skip SEC entirely if cached latest metadata exists AND already ingested
+      * Else call SEC submissions, compare (filing_date, period_of_report)
+      * Re-ingest only when metadata changed or ingestion missing
+      * Run insights + decision agents, unless the filing wasn't re-ingested
+        and their result for it is cached
+    `refresh` redoes only the named stages (REFRESH_STAGES);
+    `force_refresh` redoes all of them.
+    """
+    deps = deps or await build_default_deps()
+    stages = refresh_stages(refresh, force_refresh=force_refresh)
+    with structlog.contextvars.bound_contextvars(ticker=ticker.upper()), span("summarize"):
+        accession_number, stats = await ensure_tenq_ingested(
+            deps, ticker, filing_period, refresh=stages
         )
-        if already_ingested:
-            # Skip download/parse/embed
-            return await _run_agents()
+        return await run_agents_cached(
+            deps,
+            ticker,
+            accession_number=accession_number,
+            reuse=stats is None and "agents" not in stages,
+        )
+
+
+async def stream_10q_summary(
+    ticker: str,
+    filing_period: date | None = None,
+    *,
+    deps: AgentDependencies | None = None,
+    force_refresh: bool = False,
+    refresh: Collection[str] = (),
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    summarize_10q_for_ticker as a stream of (event, data) pairs, yielded
+    as they happen: "cache", "stage" (ingestion timings), "insights",
+    "decision", then "done" -- or "error" if any step fails.
+    """
+    deps = deps or await build_default_deps()
+    stages = refresh_stages(refresh, force_refresh=force_refresh)
+    events: asyncio.Queue[tuple[str, dict[str, Any]] | None] = asyncio.Queue()
+    started = monotonic()
+
+    def emit(name: str, data: dict[str, Any]) -> None:
+        events.put_nowait((name, data))
+
+    async def run() -> None:
+        structlog.contextvars.bind_contextvars(ticker=ticker.upper())
+        try:
+            with span("summarize"):
+                accession_number, stats = await ensure_tenq_ingested(
+                    deps, ticker, filing_period, refresh=stages, on_event=emit
+                )
+                await run_agents_cached(
+                    deps,
+                    ticker,
+                    accession_number=accession_number,
+                    reuse=stats is None and "agents" not in stages,
+                    on_event=emit,
+                )
+        except Exception as exc:
+            events.put_nowait(("error", {"error": str(exc) or repr(exc)}))
+        else:
+            events.put_nowait(("done", {"seconds": round(monotonic() - started, 3)}))
+        events.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    try:
+        while (item := await events.get()) is not None:
+            yield item
+    finally:
+        # The consumer may stop early (e.g. the client disconnected).
+        task.cancel()
+
+
+@dataclass
+class BatchItem:
+    ticker: str
+    cik: Optional[str] = None
+    insights: Optional[TenQInsights] = None
+    decision: Optional[DecisionOutput] = None
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def summarize_10q_batch(
+    tickers: Sequence[str],
+    filing_period: date | None = None,
+    *,
+    deps: AgentDependencies | None = None,
+    force_refresh: bool = False,
+    refresh: Collection[str] = (),
+    ingest_concurrency: int | None = None,
+    agent_concurrency: int | None = None,
+) -> AsyncIterator[BatchItem]:
+    """
+    Summarize many tickers, yielding one BatchItem per requested ticker as
+    soon as it finishes (completion order, not request order).
+
+      * all tickers are resolved against one CikResolver snapshot; unknown
+        ones are reported immediately
+      * tickers sharing a CIK (share classes such as GOOG/GOOGL) are
+        ingested and analysed once
+      * SEC work + ingestion and agent runs have separate concurrency caps;
+        SEC requests additionally share the client's global rate limit
+      * a failure is reported on its own items and never aborts the batch
+      * `refresh` / `force_refresh` apply to every ticker, as in
+        summarize_10q_for_ticker
+    """
+    deps = deps or await build_default_deps()
+    stages = refresh_stages(refresh, force_refresh=force_refresh)
+    settings = get_settings()
+    ingest_sem = asyncio.Semaphore(ingest_concurrency or settings.batch_ingest_concurrency)
+    agent_sem = asyncio.Semaphore(agent_concurrency or settings.batch_agent_concurrency)
+
+    requested = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    resolved = await deps.cik_resolver.resolve_many(requested)
 
-    # -------- Ingest because it's new or missing --------
-    rel_path = await deps.filing_downloader.download_primary_html(tenq_meta)
-    html = Path("data").joinpath(rel_path).read_text(encoding="utf-8", errors="ignore")
+    groups: dict[str, list[str]] = {}
+    for ticker in requested:
+        info = resolved.get(ticker)
+        if info is None:
+            yield BatchItem(ticker=ticker, error=f"Unknown ticker: {ticker!r}")
+            continue
+        groups.setdefault(info.cik_str, []).append(ticker)
 
-    chunks = deps.tenq_parser.parse_html(html, tenq_meta)
-    embeddings = await deps.embeddings.embed_many([c.text for c in chunks])
-    await deps.vector_store.upsert_chunks(chunks, embeddings)
+    results: asyncio.Queue[list[BatchItem]] = asyncio.Queue()
 
-    # Update cache to new "latest"
-    cache.set_latest(ticker_norm, tenq_meta)
+    async def run_group(cik: str, members: list[str]) -> None:
+        started = monotonic()
+        lead = members[0]
+        # Each group runs in its own task (own context), so this binding stays local.
+        structlog.contextvars.bind_contextvars(ticker=lead)
+        try:
+            async with ingest_sem:
+                accession_number, stats = await ensure_tenq_ingested(
+                    deps, lead, filing_period, refresh=stages
+                )
+            async with agent_sem:
+                insights, decision = await run_agents_cached(
+                    deps,
+                    lead,
+                    accession_number=accession_number,
+                    reuse=stats is None and "agents" not in stages,
+                )
+        except Exception as exc:
+            items = [BatchItem(ticker=t, cik=cik, error=str(exc) or repr(exc)) for t in members]
+        else:
+            items = [
+                BatchItem(ticker=t, cik=cik, insights=insights, decision=decision) for t in members
+            ]
+        for item in items:
+            item.elapsed_seconds = round(monotonic() - started, 3)
+        await results.put(items)
 
-    # Run agents on fresh ingestion
-    return await _run_agents()
\ No newline at end of file
+    tasks = [asyncio.create_task(run_group(cik, members)) for cik, members in groups.items()]
+    try:
+        for _ in tasks:
+            for item in await results.get():
+                yield item
+    finally:
+        # The consumer may stop early (e.g. the client disconnected).
+        for task in tasks:
+            task.cancel()
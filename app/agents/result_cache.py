@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from time import time
+from typing import Optional
+
+from app.agents.models import DecisionOutput, TenQInsights
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_results (
+    ticker TEXT NOT NULL,
+    accession_number TEXT NOT NULL,
+    model TEXT NOT NULL,
+    decision_mode TEXT NOT NULL,
+    insights TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (ticker, accession_number, model, decision_mode)
+);
+CREATE TABLE IF NOT EXISTS decisions (
+    insights_key TEXT NOT NULL,
+    model TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (insights_key, model)
+)
+"""
+
+
+def insights_key(insights_json: str, mode: str) -> str:
+    """
+    Decision cache key: the exact insights JSON the decision step sees,
+    plus the decision mode that turns it into a DecisionOutput.
+    """
+    return hashlib.sha256(f"{mode}\n{insights_json}".encode("utf-8")).hexdigest()
+
+
+class AgentResultCache:
+    """
+    Last insights + decision per (ticker, accession, model, decision mode),
+    so a summary of a filing that has not been re-ingested skips both LLM
+    runs. Results for a new accession, another model or another
+    DECISION_MODE are simply different keys.
+
+    Decisions are also cached on their own, by insights_key() and model:
+    identical insights (e.g. re-parsed but unchanged) never pay for a
+    second decision run.
+
+    Stored at: data/cache/agent_results.sqlite3
+    """
+
+    def __init__(
+        self,
+        path: Path = Path("data/cache/agent_results.sqlite3"),
+        *,
+        model: str,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.model = model
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(agent_results)")}
+        if columns and "decision_mode" not in columns:
+            # Written before results were keyed by decision mode; recompute.
+            self._conn.execute("DROP TABLE agent_results")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(
+        self, ticker: str, accession_number: str, decision_mode: str
+    ) -> Optional[tuple[TenQInsights, DecisionOutput]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT insights, decision FROM agent_results "
+                "WHERE ticker = ? AND accession_number = ? AND model = ? AND decision_mode = ?",
+                (ticker.upper(), accession_number, self.model, decision_mode),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return (
+                TenQInsights.model_validate_json(row[0]),
+                DecisionOutput.model_validate_json(row[1]),
+            )
+        except ValueError:
+            return None  # written by an older schema; recompute
+
+    def put(
+        self,
+        ticker: str,
+        accession_number: str,
+        decision_mode: str,
+        insights: TenQInsights,
+        decision: DecisionOutput,
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO agent_results "
+                "(ticker, accession_number, model, decision_mode, insights, decision, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    ticker.upper(),
+                    accession_number,
+                    self.model,
+                    decision_mode,
+                    insights.model_dump_json(),
+                    decision.model_dump_json(),
+                    time(),
+                ),
+            )
+
+    def get_decision(self, key: str) -> Optional[DecisionOutput]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT decision FROM decisions WHERE insights_key = ? AND model = ?",
+                (key, self.model),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return DecisionOutput.model_validate_json(row[0])
+        except ValueError:
+            return None
+
+    def put_decision(self, key: str, decision: DecisionOutput) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO decisions (insights_key, model, decision, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, self.model, decision.model_dump_json(), time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from time import time
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    owner_pid INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+"""
+
+_ACTIVE = ("queued", "running")
+
+
+class QueueFull(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: dict[str, Any]
+    status: str  # queued | running | succeeded | failed | cancelled
+    result: Optional[dict[str, Any]]
+    error: Optional[str]
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """
+    SQLite (WAL) table of jobs, shared by every API worker process on the
+    host: any worker can answer a status request for a job another worker
+    runs. A queued/running job whose owning process is gone reads as failed.
+
+    Stored at: data/cache/jobs.sqlite3
+    """
+
+    def __init__(self, path: Path = Path("data/cache/jobs.sqlite3")) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def create(self, kind: str, payload: dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, owner_pid, created_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, json.dumps(payload, default=str), os.getpid(), time()),
+            )
+        return job_id
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+
+    def mark_running(self, job_id: str) -> None:
+        self._update(job_id, status="running", started_at=time())
+
+    def mark_succeeded(self, job_id: str, result: dict[str, Any]) -> None:
+        self._update(
+            job_id, status="succeeded", result=json.dumps(result, default=str), finished_at=time()
+        )
+
+    def mark_failed(self, job_id: str, error: str, status: str = "failed") -> None:
+        self._update(job_id, status=status, error=error, finished_at=time())
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, payload, status, result, error, owner_pid, created_at, "
+                "started_at, finished_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        jid, kind, payload, status, result, error, owner, created, started, finished = row
+        if status in _ACTIVE and owner != os.getpid() and not _pid_alive(owner):
+            status, error = "failed", "worker process exited before the job finished"
+        return Job(
+            id=jid,
+            kind=kind,
+            payload=json.loads(payload),
+            status=status,
+            result=json.loads(result) if result else None,
+            error=error,
+            created_at=created,
+            started_at=started,
+            finished_at=finished,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobRunner:
+    """
+    Bounded in-process job queue drained by `workers` asyncio workers.
+    submit() only writes the job row and enqueues, so it returns in
+    milliseconds; a full queue raises QueueFull instead of growing.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: dict[str, JobHandler],
+        *,
+        workers: int = 4,
+        max_queue: int = 100,
+    ) -> None:
+        self.store = store
+        self._handlers = handlers
+        self._n_workers = workers
+        self._queue: asyncio.Queue[tuple[str, str, dict[str, Any]]] = asyncio.Queue(max_queue)
+        self._workers: list[asyncio.Task[None]] = []
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self._n_workers)]
+
+    async def stop(self) -> None:
+        for w in self._workers:
+            w.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            job_id, _, _ = self._queue.get_nowait()
+            self.store.mark_failed(job_id, "server shut down before the job started", "cancelled")
+
+    def submit(self, kind: str, payload: dict[str, Any]) -> str:
+        if kind not in self._handlers:
+            raise KeyError(f"Unknown job kind {kind!r}")
+        if self._queue.full():
+            raise QueueFull(f"job queue is full ({self._queue.maxsize})")
+        job_id = self.store.create(kind, payload)
+        self._queue.put_nowait((job_id, kind, payload))
+        return job_id
+
+    async def _work(self) -> None:
+        while True:
+            job_id, kind, payload = await self._queue.get()
+            self.store.mark_running(job_id)
+            try:
+                with structlog.contextvars.bound_contextvars(job_id=job_id):
+                    result = await self._handlers[kind](payload)
+            except asyncio.CancelledError:
+                self.store.mark_failed(job_id, "server shut down while the job ran", "cancelled")
+                raise
+            except Exception as exc:
+                self.store.mark_failed(job_id, str(exc) or repr(exc))
+            else:
+                self.store.mark_succeeded(job_id, result)
@@ -1,11 +1,110 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from datetime import date
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
 
-from app.agents.orchestrator import summarize_10q_for_ticker
-from app.api.schemas import TenQSummaryRequest, TenQSummaryResponse
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-app = FastAPI(title="SEC 10-Q Analyst API")
+from app.agents.orchestrator import (
+    build_default_deps,
+    close_default_deps,
+    stream_10q_summary,
+    summarize_10q_batch,
+    summarize_10q_for_ticker,
+    warm_agents,
+)
+from app.api.jobs import JobRunner, JobStore, QueueFull
+from app.api.middleware import ProfilingMiddleware, RequestContextMiddleware
+from app.api.schemas import (
+    BackfillRequest,
+    BackfillStatusResponse,
+    BatchSummaryItem,
+    BatchSummaryRequest,
+    CompanyResolveRequest,
+    JobStatusResponse,
+    TenQSummaryRequest,
+    TenQSummaryResponse,
+    WatchlistRefreshRequest,
+)
+from app.config.settings import get_settings
+from app.edgar.models import CikResolutionResult
+from app.ingestion.backfill import BackfillRun, BackfillSpec
+from app.ingestion.pipeline import RefreshStage
+from app.ingestion.watchlist import refresh_watchlist
+from app.observability.metrics import REGISTRY
+from app.observability.tracing import configure_logging, logger
+
+# Backfills started by this process, by backfill_id.
+_backfills: dict[str, BackfillRun] = {}
+# Background job queue; started with the app.
+_jobs: Optional[JobRunner] = None
+
+
+async def _run_summary_job(payload: dict[str, Any]) -> dict[str, Any]:
+    req = TenQSummaryRequest.model_validate(payload)
+    insights, decision = await summarize_10q_for_ticker(
+        ticker=req.ticker,
+        filing_period=req.filing_period,
+        force_refresh=req.force_refresh,
+        refresh=req.refresh,
+    )
+    return TenQSummaryResponse(insights=insights, decision=decision).model_dump(mode="json")
+
+
+async def _warm_agents() -> None:
+    try:
+        await asyncio.to_thread(warm_agents)
+    except Exception as exc:
+        # Not fatal: the first request builds them and reports the error.
+        logger.warning("agent_warmup_failed", error=repr(exc))
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    global _jobs
+    settings = get_settings()
+    configure_logging(settings.log_level, settings.log_format)
+    _jobs = JobRunner(
+        JobStore(Path(settings.jobs_db_path)),
+        {"summary_10q": _run_summary_job},
+        workers=settings.jobs_workers,
+        max_queue=settings.jobs_max_queue,
+    )
+    _jobs.start()
+    warmup = asyncio.create_task(_warm_agents()) if settings.warm_agents_on_startup else None
+    yield
+    if warmup is not None:
+        await warmup
+    await _jobs.stop()
+    _jobs.store.close()
+    _jobs = None
+    for run in _backfills.values():
+        run.task.cancel()
+    # Close the shared pooled EDGAR client on shutdown.
+    await close_default_deps()
+
+
+app = FastAPI(title="SEC 10-Q Analyst API", lifespan=lifespan)
+# Last added runs first: the request id is bound before profiling starts.
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RequestContextMiddleware)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Prometheus text format: per-stage latency histograms, cache lookups,
+    EDGAR responses and API request latency for this worker process.
+    """
+    if not get_settings().metrics_enabled:
+        raise HTTPException(status_code=404, detail="metrics are disabled")
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.post("/summaries/10q", response_model=TenQSummaryResponse)
@@ -14,8 +113,208 @@ async def summarize_10q(req: TenQSummaryRequest) -> TenQSummaryResponse:
         insights, decision = await summarize_10q_for_ticker(
             ticker=req.ticker,
             filing_period=req.filing_period,
+            force_refresh=req.force_refresh,
+            refresh=req.refresh,
         )
     except Exception as exc:  # tighten this over time
         raise HTTPException(status_code=400, detail=str(exc))
 
     return TenQSummaryResponse(insights=insights, decision=decision)
+
+
+def _sse_response(req: TenQSummaryRequest) -> StreamingResponse:
+    async def events() -> AsyncIterator[str]:
+        async for name, data in stream_10q_summary(
+            req.ticker, req.filing_period, force_refresh=req.force_refresh, refresh=req.refresh
+        ):
+            yield f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Proxies must not buffer the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/summaries/10q/stream")
+async def stream_10q(req: TenQSummaryRequest) -> StreamingResponse:
+    """
+    Server-sent events for one summary: "cache" (hit / stale / miss),
+    "stage" per ingestion step with its timing, "insights" as soon as the
+    insights agent's output validates, "decision", then "done" or "error".
+    """
+    return _sse_response(req)
+
+
+@app.get("/summaries/10q/stream")
+async def stream_10q_get(
+    ticker: str,
+    filing_period: Optional[date] = None,
+    force_refresh: bool = False,
+    refresh: list[RefreshStage] = Query(default_factory=list),
+) -> StreamingResponse:
+    """
+    Same stream as POST, for EventSource clients (which can only GET).
+    """
+    return _sse_response(
+        TenQSummaryRequest(
+            ticker=ticker,
+            filing_period=filing_period,
+            force_refresh=force_refresh,
+            refresh=refresh,
+        )
+    )
+
+
+@app.post("/summaries/10q/batch")
+async def summarize_10q_batch_endpoint(req: BatchSummaryRequest) -> StreamingResponse:
+    """
+    Summarize many tickers; streams one JSON object per ticker
+    (application/x-ndjson) as each finishes. Failures are per line.
+    """
+    limit = get_settings().batch_max_tickers
+    if len(req.tickers) > limit:
+        raise HTTPException(status_code=400, detail=f"At most {limit} tickers per batch")
+
+    async def lines() -> AsyncIterator[str]:
+        async for item in summarize_10q_batch(
+            req.tickers,
+            req.filing_period,
+            force_refresh=req.force_refresh,
+            refresh=req.refresh,
+        ):
+            line = BatchSummaryItem(
+                ticker=item.ticker,
+                status="ok" if item.ok else "error",
+                cik=item.cik,
+                result=(
+                    TenQSummaryResponse(insights=item.insights, decision=item.decision)
+                    if item.ok
+                    else None
+                ),
+                error=item.error,
+                elapsed_seconds=item.elapsed_seconds,
+            )
+            yield line.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _job_runner() -> JobRunner:
+    if _jobs is None:
+        raise HTTPException(status_code=503, detail="job queue is not running")
+    return _jobs
+
+
+@app.post("/jobs/summaries/10q", response_model=JobStatusResponse, status_code=202)
+async def submit_summary_job(req: TenQSummaryRequest) -> JobStatusResponse:
+    """
+    Queue a 10-Q summary and return its job id immediately; poll
+    GET /jobs/{job_id} for the result.
+    """
+    runner = _job_runner()
+    try:
+        job_id = runner.submit("summary_10q", req.model_dump(mode="json"))
+    except QueueFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"})
+    return await get_job(job_id)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str) -> JobStatusResponse:
+    job = _job_runner().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id!r}")
+    return JobStatusResponse(
+        job_id=job.id,
+        status=job.status,
+        request=TenQSummaryRequest.model_validate(job.payload),
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        result=TenQSummaryResponse.model_validate(job.result) if job.result else None,
+    )
+
+
+@app.get("/edgar/pool")
+async def edgar_pool_stats() -> dict[str, Any]:
+    """
+    Per-host request counts and HTTP-cache metrics for the shared EDGAR client.
+    """
+    deps = await build_default_deps()
+    cache = deps.edgar_client.http_cache
+    return {
+        "hosts": deps.edgar_client.pool_stats(),
+        "http_cache": vars(cache.stats) if cache is not None else None,
+    }
+
+
+def _backfill_status(run: BackfillRun) -> BackfillStatusResponse:
+    return BackfillStatusResponse(
+        backfill_id=run.spec.backfill_id,
+        status=run.status,
+        error=run.error,
+        progress=run.progress.summary(),
+    )
+
+
+@app.post("/backfills", response_model=BackfillStatusResponse, status_code=202)
+async def start_backfill(req: BackfillRequest) -> BackfillStatusResponse:
+    """
+    Start (or resume) a historical backfill in the background. Submitting
+    the same tickers and range while it runs returns the running backfill.
+    """
+    try:
+        spec = BackfillSpec.of(req.tickers, req.start, req.end, req.download_only)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    run = _backfills.get(spec.backfill_id)
+    if run is None or run.status != "running":
+        settings = get_settings()
+        run = BackfillRun.start(
+            await build_default_deps(),
+            spec,
+            download_concurrency=settings.backfill_download_concurrency,
+            ingest_workers=settings.backfill_ingest_workers,
+        )
+        _backfills[spec.backfill_id] = run
+    return _backfill_status(run)
+
+
+@app.get("/backfills/{backfill_id}", response_model=BackfillStatusResponse)
+async def get_backfill(backfill_id: str) -> BackfillStatusResponse:
+    run = _backfills.get(backfill_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown backfill {backfill_id!r}")
+    return _backfill_status(run)
+
+
+@app.post("/watchlist/refresh")
+async def refresh_watchlist_endpoint(req: WatchlistRefreshRequest) -> dict[str, Any]:
+    """
+    Refresh the EDGAR daily form index and re-ingest only the tickers that
+    filed a new 10-Q.
+    """
+    report = await refresh_watchlist(await build_default_deps(), req.tickers)
+    return asdict(report)
+
+
+@app.get("/companies/search", response_model=list[CikResolutionResult])
+async def search_companies(
+    q: str = Query(min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+) -> list[CikResolutionResult]:
+    """
+    Ticker / company-name prefix search over SEC's ticker table.
+    """
+    deps = await build_default_deps()
+    return await deps.cik_resolver.search(q, limit)
+
+
+@app.post("/companies/resolve", response_model=dict[str, Optional[CikResolutionResult]])
+async def resolve_companies(req: CompanyResolveRequest) -> dict[str, Optional[CikResolutionResult]]:
+    deps = await build_default_deps()
+    return await deps.cik_resolver.resolve_many(req.tickers)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import uuid
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Awaitable, Callable, MutableMapping, Optional
+
+import structlog
+
+from app.config.settings import get_settings
+from app.observability.metrics import HTTP_REQUEST_SECONDS
+from app.observability.profiler import SamplingProfiler, activate, deactivate, write_profile
+from app.observability.tracing import logger, request_timings
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+# Client-supplied ids are echoed back only when they look like ids.
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class RequestContextMiddleware:
+    """
+    Per request: a request id (the client's X-Request-ID, or a new one)
+    bound into every structlog line and echoed in the response header,
+    sec10q_http_request_duration_seconds by route template, and one
+    "request" log line with the total time per pipeline stage.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so streamed responses
+    (server-sent events, NDJSON batches) are timed to their last byte and
+    keep the request context while they run.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        supplied = headers.get(b"x-request-id", b"").decode("latin-1")
+        request_id = supplied if _REQUEST_ID_RE.match(supplied) else uuid.uuid4().hex
+        status = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        started = perf_counter()
+        with structlog.contextvars.bound_contextvars(request_id=request_id):
+            with request_timings() as timings:
+                try:
+                    await self.app(scope, receive, send_with_id)
+                finally:
+                    seconds = perf_counter() - started
+                    route = getattr(scope.get("route"), "path", None) or "unmatched"
+                    HTTP_REQUEST_SECONDS.observe(
+                        seconds, method=scope["method"], route=route, status=str(status)
+                    )
+                    logger.info(
+                        "request",
+                        method=scope["method"],
+                        path=scope["path"],
+                        route=route,
+                        status=status,
+                        duration_ms=round(seconds * 1000, 2),
+                        stages_ms={k: round(v * 1000, 2) for k, v in timings.items()},
+                    )
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in sampling profile of a request: sent "X-Profile: 1" (with
+    PROFILE_HEADER_ENABLED) or picked at PROFILE_SAMPLE_RATE. The profile
+    covers the whole response, streamed bodies included, and is written
+    to PROFILE_DIR as folded stacks tagged with the request id, route and
+    whatever the pipeline tagged (ticker, accession_number).
+
+    Add it inside RequestContextMiddleware so the request id is bound.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._profiler: Optional[SamplingProfiler] = None
+
+    def _wanted(self, scope: Scope) -> bool:
+        settings = get_settings()
+        if settings.profile_header_enabled:
+            value = dict(scope.get("headers") or []).get(b"x-profile", b"").lower()
+            if value in (b"1", b"true", b"yes"):
+                return True
+        rate = settings.profile_sample_rate
+        return rate > 0 and random.random() < rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        settings = get_settings()
+        if self._profiler is None:
+            self._profiler = SamplingProfiler(settings.profile_interval_ms / 1000)
+        request_id = structlog.contextvars.get_contextvars().get("request_id")
+        session = self._profiler.start(request_id=request_id, method=scope["method"])
+        token = activate(session)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            deactivate(token)
+            self._profiler.stop(session)
+            session.tag(route=getattr(scope.get("route"), "path", None) or scope["path"])
+            path = await asyncio.to_thread(
+                write_profile,
+                session,
+                Path(settings.profile_dir),
+                max_files=settings.profile_max_files,
+            )
+            logger.info("profile", file=str(path), samples=session.samples, **session.tags)
@@ -1,19 +1,75 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from typing import Any, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.agents.models import TenQInsights, DecisionOutput
+from app.ingestion.pipeline import RefreshStage
 
 
 class TenQSummaryRequest(BaseModel):
     ticker: str
     filing_period: Optional[date] = None
-    force_refresh: bool = False
+    force_refresh: bool = False  # redo every stage
+    # Redo only these stages; the others reuse cached artifacts.
+    refresh: list[RefreshStage] = Field(default_factory=list)
 
 
 class TenQSummaryResponse(BaseModel):
     insights: TenQInsights
     decision: DecisionOutput
+
+
+class BatchSummaryRequest(BaseModel):
+    tickers: list[str] = Field(min_length=1)
+    filing_period: Optional[date] = None
+    force_refresh: bool = False
+    refresh: list[RefreshStage] = Field(default_factory=list)
+
+
+class BatchSummaryItem(BaseModel):
+    """
+    One NDJSON line of the batch summaries stream.
+    """
+
+    ticker: str
+    status: str  # ok | error
+    cik: Optional[str] = None
+    result: Optional[TenQSummaryResponse] = None
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str  # queued | running | succeeded | failed | cancelled
+    request: TenQSummaryRequest
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[TenQSummaryResponse] = None
+
+
+class BackfillRequest(BaseModel):
+    tickers: list[str] = Field(min_length=1)
+    start: date
+    end: date
+    download_only: bool = False
+
+
+class BackfillStatusResponse(BaseModel):
+    backfill_id: str
+    status: str  # running | completed | failed | cancelled
+    error: Optional[str] = None
+    progress: dict[str, Any]
+
+
+class WatchlistRefreshRequest(BaseModel):
+    tickers: list[str] = Field(min_length=1)
+
+
+class CompanyResolveRequest(BaseModel):
+    tickers: list[str] = Field(min_length=1, max_length=1000)
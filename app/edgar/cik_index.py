@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from app.edgar.models import CikResolutionResult
+
+# File layout (little endian):
+#   header   MAGIC, version, count, names_size, fetched_at
+#   records  `count` x (ticker[12], cik, name_offset, name_len), sorted by ticker
+#   by_name  `count` x record index, sorted by casefolded company name
+#   names    UTF-8 company names
+MAGIC = b"CIKX"
+VERSION = 1
+_HEADER = struct.Struct("<4sIIId")
+_RECORD = struct.Struct("<12sIIH")
+_INDEX = struct.Struct("<I")
+TICKER_BYTES = 12
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+def build_index_bytes(entries: Iterable[tuple[str, int, str]], fetched_at: float) -> bytes:
+    """
+    Serialize (ticker, cik, company name) rows into the binary index
+    format. Tickers are upper-cased; the first row wins on duplicates.
+    """
+    rows: dict[bytes, tuple[int, str]] = {}
+    for ticker, cik, name in entries:
+        key = ticker.strip().upper().encode("ascii", "ignore")[:TICKER_BYTES]
+        if key and key not in rows:
+            rows[key] = (int(cik), name)
+
+    tickers = sorted(rows)
+    names = bytearray()
+    records = bytearray()
+    for key in tickers:
+        cik, name = rows[key]
+        raw = name.encode("utf-8")[:0xFFFF]
+        records += _RECORD.pack(key, cik, len(names), len(raw))
+        names += raw
+
+    by_name = sorted(range(len(tickers)), key=lambda i: rows[tickers[i]][1].casefold())
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, len(tickers), len(names), fetched_at))
+    out += records
+    for i in by_name:
+        out += _INDEX.pack(i)
+    out += names
+    return bytes(out)
+
+
+def write_index(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+class CikIndex:
+    """
+    Read-only ticker -> CIK index over the binary format above, usually
+    memory-mapped: opening it costs no parsing, and lookups / prefix
+    searches are binary searches that decode only the rows they touch.
+    """
+
+    def __init__(self, buf: Buffer) -> None:
+        magic, version, count, names_size, fetched_at = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a CIK index (or an unsupported version)")
+        self._buf = buf
+        self._count = count
+        self.fetched_at = fetched_at
+        self._records_at = _HEADER.size
+        self._by_name_at = self._records_at + count * _RECORD.size
+        self._names_at = self._by_name_at + count * _INDEX.size
+        if len(buf) < self._names_at + names_size:
+            raise ValueError("truncated CIK index")
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["CikIndex"]:
+        """
+        Memory-map an index file; None when it is missing or unreadable.
+        """
+        try:
+            with path.open("rb") as fh:
+                buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            return cls(buf)
+        except (ValueError, struct.error):
+            buf.close()
+            return None
+
+    def close(self) -> None:
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ------------------------------------------------------------------ #
+    # Row access
+    # ------------------------------------------------------------------ #
+
+    def _ticker(self, i: int) -> bytes:
+        at = self._records_at + i * _RECORD.size
+        return bytes(self._buf[at : at + TICKER_BYTES]).rstrip(b"\0")
+
+    def _row(self, i: int) -> CikResolutionResult:
+        key, cik, name_off, name_len = _RECORD.unpack_from(
+            self._buf, self._records_at + i * _RECORD.size
+        )
+        at = self._names_at + name_off
+        return CikResolutionResult(
+            ticker=key.rstrip(b"\0").decode("ascii"),
+            cik_int=cik,
+            cik_str=f"{cik:010d}",
+            company_name=bytes(self._buf[at : at + name_len]).decode("utf-8"),
+        )
+
+    def _name_row(self, j: int) -> int:
+        return _INDEX.unpack_from(self._buf, self._by_name_at + j * _INDEX.size)[0]
+
+    def _folded_name(self, j: int) -> str:
+        at = self._records_at + self._name_row(j) * _RECORD.size
+        _, _, name_off, name_len = _RECORD.unpack_from(self._buf, at)
+        start = self._names_at + name_off
+        return bytes(self._buf[start : start + name_len]).decode("utf-8").casefold()
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+
+    def _ticker_lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ticker(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup(self, ticker: str) -> Optional[CikResolutionResult]:
+        key = ticker.strip().upper().encode("ascii", "ignore")
+        i = self._ticker_lower_bound(key)
+        if i < self._count and self._ticker(i) == key:
+            return self._row(i)
+        return None
+
+    def ticker_prefix(self, prefix: str, limit: int = 10) -> list[CikResolutionResult]:
+        key = prefix.strip().upper().encode("ascii", "ignore")
+        out: list[CikResolutionResult] = []
+        i = self._ticker_lower_bound(key)
+        while i < self._count and len(out) < limit and self._ticker(i).startswith(key):
+            out.append(self._row(i))
+            i += 1
+        return out
+
+    def name_prefix(self, prefix: str, limit: int = 10) -> list[CikResolutionResult]:
+        key = prefix.strip().casefold()
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._folded_name(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        out: list[CikResolutionResult] = []
+        j = lo
+        while j < self._count and len(out) < limit and self._folded_name(j).startswith(key):
+            out.append(self._row(self._name_row(j)))
+            j += 1
+        return out
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta, datetime
-from typing import Dict, Optional
+from datetime import timedelta
+from pathlib import Path
+from time import time
+from typing import Dict, Iterable, Optional
 
+from app.edgar.cik_index import CikIndex, build_index_bytes, write_index
 from app.edgar.client import EdgarHttpClient
 from app.edgar.models import CikResolutionResult
 
@@ -11,44 +14,106 @@ from app.edgar.models import CikResolutionResult
 class CikResolver:
     """
     Resolve a ticker symbol to CIK + company name via company_tickers.json.
-    Uses in-memory cache with a simple TTL.
+
+    The ticker table is kept as a compact binary index on disk and
+    memory-mapped, so a restart resolves immediately without fetching or
+    parsing anything. Once the index is older than the TTL it is still
+    served while one background task re-downloads and swaps it in
+    (stale-while-revalidate); only the very first load, with no index on
+    disk, makes callers wait.
+
+    Stored at: data/cache/cik_index.bin
     """
 
     _TTL = timedelta(hours=6)
+    # After a failed background refresh, wait this long before retrying.
+    _RETRY_AFTER = timedelta(minutes=5)
 
-    def __init__(self, client: EdgarHttpClient) -> None:
+    def __init__(
+        self,
+        client: EdgarHttpClient,
+        index_path: Optional[Path] = Path("data/cache/cik_index.bin"),
+    ) -> None:
         self._client = client
-        self._cache_by_ticker: Dict[str, CikResolutionResult] = {}
-        self._last_refresh: Optional[datetime] = None
-        self._lock = asyncio.Lock()
-
-    async def _ensure_loaded(self) -> None:
-        async with self._lock:
-            if self._last_refresh and datetime.utcnow() - self._last_refresh < self._TTL:
-                return
-
-            raw = await self._client.get_json("files/company_tickers.json", data_host=False)
-            # SEC format: { "0": { "cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc." }, ... }
-            cache: Dict[str, CikResolutionResult] = {}
-            for _, entry in raw.items():
-                ticker = str(entry["ticker"]).upper()
-                cik_int = int(entry["cik_str"])
-                cik_str = f"{cik_int:010d}"
-                result = CikResolutionResult(
-                    ticker=ticker,
-                    cik_int=cik_int,
-                    cik_str=cik_str,
-                    company_name=entry["title"],
-                )
-                cache[ticker] = result
-
-            self._cache_by_ticker = cache
-            self._last_refresh = datetime.utcnow()
+        self._index_path = index_path
+        self._index: Optional[CikIndex] = CikIndex.open(index_path) if index_path else None
+        self._refresh_task: Optional[asyncio.Task[CikIndex]] = None
+        self._next_attempt = 0.0
+        self.last_error: Optional[BaseException] = None
+
+    async def _fetch_index(self) -> CikIndex:
+        raw = await self._client.get_json("files/company_tickers.json", data_host=False)
+        # SEC format: { "0": { "cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc." }, ... }
+        data = build_index_bytes(
+            ((str(e["ticker"]), int(e["cik_str"]), e["title"]) for e in raw.values()),
+            fetched_at=time(),
+        )
+        if self._index_path is not None:
+            write_index(self._index_path, data)
+            index = CikIndex.open(self._index_path)
+            if index is not None:
+                return index
+        return CikIndex(data)
+
+    def _swap(self, task: "asyncio.Task[CikIndex]") -> None:
+        self._refresh_task = None
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self.last_error = exc
+            self._next_attempt = time() + self._RETRY_AFTER.total_seconds()
+            return
+        old, self._index = self._index, task.result()
+        self.last_error = None
+        if old is not None:
+            old.close()
+
+    def _start_refresh(self) -> "asyncio.Task[CikIndex]":
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._fetch_index())
+            self._refresh_task.add_done_callback(self._swap)
+        return self._refresh_task
+
+    async def _current(self) -> CikIndex:
+        index = self._index
+        if index is None:
+            # Nothing to serve yet: every caller waits on the same fetch.
+            return await asyncio.shield(self._start_refresh())
+        if time() - index.fetched_at >= self._TTL.total_seconds() and time() >= self._next_attempt:
+            self._start_refresh()
+        return index
+
+    async def refresh(self) -> None:
+        """
+        Re-download the ticker table now and wait for it.
+        """
+        await asyncio.shield(self._start_refresh())
 
     async def resolve(self, ticker: str) -> CikResolutionResult:
-        await self._ensure_loaded()
-        norm = ticker.strip().upper()
-        try:
-            return self._cache_by_ticker[norm]
-        except KeyError:
+        index = await self._current()
+        result = index.lookup(ticker)
+        if result is None:
             raise KeyError(f"Unknown ticker: {ticker!r}")
+        return result
+
+    async def resolve_many(
+        self, tickers: Iterable[str]
+    ) -> Dict[str, Optional[CikResolutionResult]]:
+        """
+        Resolve a batch against one index snapshot; unknown tickers map to None.
+        """
+        index = await self._current()
+        return {t.strip().upper(): index.lookup(t) for t in tickers}
+
+    async def search(self, prefix: str, limit: int = 10) -> list[CikResolutionResult]:
+        """
+        Ticker-prefix matches first, then company-name-prefix matches.
+        """
+        if not prefix.strip():
+            return []
+        index = await self._current()
+        out: Dict[str, CikResolutionResult] = {}
+        for r in index.ticker_prefix(prefix, limit) + index.name_prefix(prefix, limit):
+            out.setdefault(r.ticker, r)
+        return list(out.values())[:limit]
@@ -1,29 +1,194 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import importlib.util
+import json
+import random
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from time import monotonic
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional
 
 import httpx
 
-from app.config.settings import get_settings
+from app.config.settings import Settings, get_settings
+from app.edgar.http_cache import HttpCache
+from app.observability.metrics import CACHE_LOOKUPS, EDGAR_RESPONSES
+from app.observability.tracing import span
 
 
-@dataclass
 class RateLimiter:
-    max_rps: int
-    _lock: asyncio.Lock = asyncio.Lock()
-    _last_request_ts: float = 0.0
+    """
+    Token bucket shared by all EDGAR requests in a process.
+
+    * Bursts up to `burst` requests (default: max_rps) and refills at `rate`
+      tokens/sec, so many requests can be in flight at once.
+    * Callers reserve a token immediately (the balance may go negative) and
+      sleep only for their own deficit: no lock is held while sleeping and
+      waiters are served in arrival order.
+    * On throttling (`throttle`), the rate is halved down to `min_rps` and
+      all callers pause until Retry-After; successes recover the rate
+      additively back towards max_rps (AIMD). Tokens only start refilling
+      once the block lifts, so queued callers resume paced, not all at once.
+    """
+
+    def __init__(
+        self,
+        max_rps: float,
+        *,
+        burst: Optional[int] = None,
+        min_rps: float = 0.5,
+    ) -> None:
+        if max_rps <= 0:
+            raise ValueError("max_rps must be positive")
+        self.max_rps = float(max_rps)
+        self.min_rps = min(float(min_rps), self.max_rps)
+        self.rate = self.max_rps
+        self.capacity = float(burst or max_rps)
+        self._tokens = self.capacity
+        self._updated = monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
 
     async def wait(self) -> None:
-        async with self._lock:
-            min_interval = 1.0 / float(self.max_rps)
-            now = monotonic()
-            delta = now - self._last_request_ts
-            if delta < min_interval:
-                await asyncio.sleep(min_interval - delta)
-            self._last_request_ts = monotonic()
+        # No await between refill and reservation, so this is atomic on the loop.
+        now = monotonic()
+        self._refill(now)
+        self._tokens -= 1.0
+        # While blocked, _updated sits at _blocked_until: the deficit is paid
+        # off after the block, on top of it.
+        delay = max(0.0, self._blocked_until - now) + max(0.0, -self._tokens / self.rate)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Multiplicative decrease after a 429/503; optionally block everyone
+        for `retry_after` seconds.
+        """
+        now = monotonic()
+        self._refill(now)
+        self.rate = max(self.min_rps, self.rate / 2.0)
+        self._tokens = min(self._tokens, 0.0)
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._updated = max(self._updated, self._blocked_until)
+
+    def on_success(self) -> None:
+        """
+        Additive increase back towards max_rps.
+        """
+        if self.rate < self.max_rps:
+            self._refill(monotonic())
+            self.rate = min(self.max_rps, self.rate + self.max_rps / 20.0)
+
+
+_shared_limiter: Optional[RateLimiter] = None
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """
+    Process-wide limiter so every EdgarHttpClient shares the SEC budget.
+    """
+    global _shared_limiter
+    if _shared_limiter is None:
+        settings = get_settings()
+        _shared_limiter = RateLimiter(settings.sec_max_rps, burst=settings.sec_burst)
+    return _shared_limiter
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After is either delta-seconds or an HTTP-date.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _limits(settings: Settings) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.sec_max_connections_per_host,
+        max_keepalive_connections=settings.sec_max_keepalive_connections_per_host,
+        keepalive_expiry=settings.sec_keepalive_expiry_seconds,
+    )
+
+
+def build_host_transports(
+    settings: Optional[Settings] = None,
+) -> Dict[str, httpx.AsyncHTTPTransport]:
+    """
+    One pooled transport per SEC host, keyed by host name.
+    """
+    settings = settings or get_settings()
+    use_http2 = settings.sec_http2 and http2_available()
+    transports: Dict[str, httpx.AsyncHTTPTransport] = {}
+    for base in (settings.sec_base_url, settings.sec_data_base_url):
+        host = httpx.URL(str(base)).host
+        if host not in transports:
+            transports[host] = httpx.AsyncHTTPTransport(
+                http2=use_http2, limits=_limits(settings), retries=0
+            )
+    return transports
+
+
+def build_http_client(
+    settings: Optional[Settings] = None,
+    transports: Optional[Dict[str, httpx.AsyncHTTPTransport]] = None,
+) -> httpx.AsyncClient:
+    """
+    AsyncClient tuned for EDGAR: one pooled transport per SEC host (so
+    www.sec.gov downloads can't starve data.sec.gov lookups; see
+    build_host_transports), HTTP/2 multiplexing when `h2` is installed,
+    split connect/read/write/pool timeouts and keep-alive expiry from
+    settings.
+    """
+    settings = settings or get_settings()
+    use_http2 = settings.sec_http2 and http2_available()
+    if transports is None:
+        transports = build_host_transports(settings)
+    timeout = httpx.Timeout(
+        connect=settings.sec_connect_timeout_seconds,
+        read=settings.sec_read_timeout_seconds,
+        write=settings.sec_write_timeout_seconds,
+        pool=settings.sec_pool_timeout_seconds,
+    )
+    return httpx.AsyncClient(
+        headers={
+            "User-Agent": settings.sec_user_agent,
+            "Accept-Encoding": "gzip, deflate",
+            "Accept": "application/json, text/html, */*",
+        },
+        timeout=timeout,
+        limits=_limits(settings),
+        http2=use_http2,
+        mounts={f"all://{host}": t for host, t in transports.items()},
+    )
 
 
 class EdgarHttpClient:
@@ -31,6 +196,12 @@ class EdgarHttpClient:
     Thin wrapper over httpx.AsyncClient that:
     * Adds SEC User-Agent and headers
     * Applies global rate limiting
+    * Retries 429/5xx and transport errors with Retry-After or jittered
+      exponential backoff; a Retry-After over sec_max_retry_after_seconds
+      fails the request instead
+    * Optionally caches JSON endpoints on disk and revalidates them with
+      conditional GETs (ETag / If-Modified-Since), so an unchanged
+      resource costs a 304 instead of a full body
     * Centralizes error handling
     """
 
@@ -38,39 +209,225 @@ class EdgarHttpClient:
         self,
         client: Optional[httpx.AsyncClient] = None,
         max_rps: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        http_cache: Optional[HttpCache] = None,
     ) -> None:
         settings = get_settings()
-        self._client = client or httpx.AsyncClient(
-            headers={
-                "User-Agent": settings.sec_user_agent,
-                "Accept-Encoding": "gzip, deflate",
-                "Accept": "application/json, text/html, */*",
-                "Connection": "keep-alive",
-            },
-            timeout=30.0,
-        )
-        self._rate_limiter = RateLimiter(max_rps or settings.sec_max_rps)
+        if client is None:
+            client = build_http_client(settings)
+        self._client = client
+        # Per-host counters for pool_stats(), kept here rather than read
+        # from the transports' (private) connection pools.
+        self._requests_by_host: Counter[str] = Counter()
+        self._in_flight_by_host: Counter[str] = Counter()
+        self._http2_by_host: Counter[str] = Counter()
+        if rate_limiter is not None:
+            self._rate_limiter = rate_limiter
+        elif max_rps is not None:
+            self._rate_limiter = RateLimiter(max_rps, burst=settings.sec_burst)
+        else:
+            self._rate_limiter = get_shared_rate_limiter()
+        self._http_cache = http_cache
+        self._max_retries = settings.sec_max_retries
+        self._backoff_base = settings.sec_backoff_base_seconds
+        self._backoff_max = settings.sec_backoff_max_seconds
+        self._max_retry_after = settings.sec_max_retry_after_seconds
         self._sec_base = str(settings.sec_base_url)
         self._data_base = str(settings.sec_data_base_url)
 
-    async def _get(self, url: str) -> httpx.Response:
-        await self._rate_limiter.wait()
-        resp = await self._client.get(url)
-        if resp.status_code == 429:
-            # naive backoff; you can refine later
-            await asyncio.sleep(2.0)
+    def _backoff(self, attempt: int) -> float:
+        # "full jitter": uniform over [0, min(max, base * 2**attempt)]
+        return random.uniform(0.0, min(self._backoff_max, self._backoff_base * (2**attempt)))
+
+    @property
+    def http_cache(self) -> Optional[HttpCache]:
+        return self._http_cache
+
+    @property
+    def sec_base_url(self) -> str:
+        """
+        Base URL of www.sec.gov (or the SEC_BASE_URL stand-in), no trailing slash.
+        """
+        return self._sec_base.rstrip("/")
+
+    async def _send(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        *,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Rate-limited GET with retries. With stream=True the body is left
+        unread for the caller to iterate (and close). One "edgar_request"
+        span covers rate-limit waits, retries and the response headers.
+        """
+        parsed = httpx.URL(url)
+        with span("edgar_request", host=parsed.host, path=parsed.path) as request_span:
+            resp = await self._send_with_retries(url, headers, parsed.host, stream=stream)
+            request_span.set(status=resp.status_code)
+            return resp
+
+    async def _send_with_retries(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        host: str,
+        *,
+        stream: bool,
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self._rate_limiter.wait()
+            self._requests_by_host[host] += 1
+            request = self._client.build_request("GET", url, headers=headers)
+            try:
+                resp = await self._client.send(request, stream=stream)
+            except httpx.TransportError as exc:
+                EDGAR_RESPONSES.inc(host=host, status=type(exc).__name__)
+                if attempt >= self._max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            EDGAR_RESPONSES.inc(host=host, status=str(resp.status_code))
+            if resp.http_version == "HTTP/2":
+                self._http2_by_host[host] += 1
+
+            if resp.status_code in _RETRY_STATUSES and attempt < self._max_retries:
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                too_long = retry_after is not None and retry_after > self._max_retry_after
+                if resp.status_code in (429, 503):
+                    # An over-long Retry-After still slows the rate, but
+                    # doesn't block every caller until then.
+                    self._rate_limiter.throttle(None if too_long else retry_after)
+                if not too_long:
+                    await resp.aclose()
+                    await asyncio.sleep(
+                        retry_after if retry_after is not None else self._backoff(attempt)
+                    )
+                    attempt += 1
+                    continue
+
+            if resp.status_code < 400:
+                self._rate_limiter.on_success()
+            if resp.status_code == 304:
+                return resp
+            if resp.is_error and stream:
+                await resp.aread()
+            resp.raise_for_status()
+            return resp
+
+    @asynccontextmanager
+    async def _in_flight(self, url: str) -> AsyncIterator[None]:
+        # Covers rate-limit waits, retries and, for streams, the body.
+        host = httpx.URL(url).host
+        self._in_flight_by_host[host] += 1
+        try:
+            yield
+        finally:
+            self._in_flight_by_host[host] -= 1
+
+    async def _get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        async with self._in_flight(url):
+            return await self._send(url, headers)
+
+    async def _get_cached(self, url: str) -> bytes:
+        """
+        GET through the on-disk HTTP cache, returning the body bytes.
+        """
+        cache = self._http_cache
+        if cache is None:
+            return (await self._get(url)).content
+
+        entry = cache.get(url)
+        if entry is not None and cache.is_fresh(entry):
+            cache.stats.fresh_hits += 1
+            CACHE_LOOKUPS.inc(cache="edgar_http", result="hit")
+            return cache.read_body(url)
+
+        resp = await self._get(url, headers=entry.validators() if entry else None)
+        if resp.status_code == 304 and entry is not None:
+            cache.stats.revalidated += 1
+            CACHE_LOOKUPS.inc(cache="edgar_http", result="revalidated")
+            cache.touch(url, entry)
+            return cache.read_body(url)
         resp.raise_for_status()
-        return resp
+
+        cache.stats.misses += 1
+        CACHE_LOOKUPS.inc(cache="edgar_http", result="miss")
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            cache.store(
+                url,
+                resp.content,
+                etag=etag,
+                last_modified=last_modified,
+                content_type=resp.headers.get("Content-Type"),
+            )
+        return resp.content
 
     async def get_json(self, path: str, data_host: bool = False) -> Dict[str, Any]:
         base = self._data_base if data_host else self._sec_base
         url = f"{base.rstrip('/')}/{path.lstrip('/')}"
-        resp = await self._get(url)
-        return resp.json()
+        return json.loads(await self._get_cached(url))
 
     async def get_text(self, url: str) -> str:
         resp = await self._get(url)
         return resp.text
 
+    async def stream_to(self, url: str, sink: BinaryIO, chunk_size: int = 1 << 16) -> int:
+        """
+        Stream a (content-decoded) response body into `sink` without holding
+        it in memory. Returns the number of bytes written. Retries happen
+        only before the first byte; a failure mid-body propagates so the
+        caller can discard the partial output.
+        """
+        async with self._in_flight(url):
+            resp = await self._send(url, stream=True)
+            written = 0
+            try:
+                async for block in resp.aiter_bytes(chunk_size):
+                    sink.write(block)
+                    written += len(block)
+            finally:
+                await resp.aclose()
+        return written
+
+    async def stream_lines(self, url: str) -> AsyncIterator[str]:
+        """
+        Yield the decoded lines of a (possibly large) text response as they
+        arrive, e.g. EDGAR form indexes.
+        """
+        async with self._in_flight(url):
+            resp = await self._send(url, stream=True)
+            try:
+                async for line in resp.aiter_lines():
+                    yield line
+            finally:
+                await resp.aclose()
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Per-host request counts from this client's own bookkeeping, e.g.
+        {"data.sec.gov": {"requests": 412, "in_flight": 3, "http2": 412}}:
+        requests sent (retries included), requests not yet finished, and
+        responses that came back over HTTP/2 (multiplexed on a shared
+        connection).
+        """
+        hosts = dict.fromkeys(
+            [httpx.URL(self._sec_base).host, httpx.URL(self._data_base).host]
+            + list(self._requests_by_host)
+        )
+        return {
+            host: {
+                "requests": self._requests_by_host.get(host, 0),
+                "in_flight": self._in_flight_by_host.get(host, 0),
+                "http2": self._http2_by_host.get(host, 0),
+            }
+            for host in hosts
+        }
+
     async def aclose(self) -> None:
         await self._client.aclose()
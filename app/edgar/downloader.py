@@ -11,6 +11,9 @@ class FilingDownloader:
     """
     Download primary 10-Q HTML (and optionally XBRL) and persist
     via a pluggable storage backend.
+
+    Documents are streamed from SEC straight into storage (compressed per
+    the backend) and never held in memory as a whole.
     """
 
     def __init__(
@@ -20,7 +23,7 @@ class FilingDownloader:
     ) -> None:
         self._client = client
         self._storage = storage
-        self._archives_base = "https://www.sec.gov/Archives/edgar/data"
+        self._archives_base = f"{client.sec_base_url}/Archives/edgar/data"
 
     def _build_primary_url(self, metadata: TenQMetadata) -> str:
         cik_no_zero = metadata.cik.lstrip("0")
@@ -28,7 +31,11 @@ class FilingDownloader:
         path = PurePosixPath(cik_no_zero) / accession_nodash / metadata.primary_document
         return f"{self._archives_base}/{path}"
 
-    async def download_primary_html(self, metadata: TenQMetadata) -> str:
+    async def download_primary_html(self, metadata: TenQMetadata, *, force: bool = False) -> str:
+        """
+        Store the primary document and return its relative path. A stored
+        copy is reused unless `force`, which fetches it again in place.
+        """
         url = self._build_primary_url(metadata)
         rel_path = (
             f"filings/{metadata.ticker}/{metadata.cik}/"
@@ -36,8 +43,10 @@ class FilingDownloader:
             f"{metadata.primary_document}"
         )
 
-        if not self._storage.exists(rel_path):
-            text = await self._client.get_text(url)
-            self._storage.write_bytes(rel_path, text.encode("utf-8", errors="ignore"))
+        # Filings stored before compression was enabled are reused as-is.
+        stored = rel_path if self._storage.exists(rel_path) else self._storage.stored_path(rel_path)
+        if force or not self._storage.exists(stored):
+            with self._storage.open_write(stored) as sink:
+                await self._client.stream_to(url, sink)
 
-        return rel_path
+        return stored
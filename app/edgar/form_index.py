@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Collection, Dict, Iterable, Iterator, Optional
+
+import httpx
+
+from app.edgar.client import EdgarHttpClient
+from app.edgar.models import TENQ_FORMS
+
+
+@dataclass(frozen=True)
+class FormIndexEntry:
+    cik: int
+    form_type: str
+    date_filed: date
+    accession_number: str
+    company_name: str
+
+
+def _parse_date(raw: str) -> date:
+    # daily indexes use YYYYMMDD, quarterly full-index YYYY-MM-DD
+    raw = raw.strip()
+    if len(raw) == 8:
+        return datetime.strptime(raw, "%Y%m%d").date()
+    return date.fromisoformat(raw)
+
+
+def _parse_row(line: str, forms: Optional[Collection[str]]) -> Optional[FormIndexEntry]:
+    parts = line.rstrip("\r\n").split("|")
+    if len(parts) != 5:
+        return None
+    cik, company, form_type, filed, filename = parts
+    if forms is not None and form_type not in forms:
+        return None
+    # edgar/data/320193/0000320193-25-000073.txt
+    accession = filename.rsplit("/", 1)[-1].removesuffix(".txt")
+    return FormIndexEntry(
+        cik=int(cik),
+        form_type=form_type,
+        date_filed=_parse_date(filed),
+        accession_number=accession,
+        company_name=company,
+    )
+
+
+def parse_master_index(
+    lines: Iterable[str],
+    forms: Optional[Collection[str]] = TENQ_FORMS,
+) -> Iterator[FormIndexEntry]:
+    """
+    Parse an EDGAR master.idx (pipe-delimited: CIK|Company Name|Form Type|
+    Date Filed|File Name) line by line, yielding only rows whose form type
+    is in `forms` (all rows when None). The free-text header is skipped.
+    """
+    in_body = False
+    for line in lines:
+        if not in_body:
+            in_body = line.startswith("-----")
+            continue
+        entry = _parse_row(line, forms)
+        if entry is not None:
+            yield entry
+
+
+async def _aparse_master_index(
+    lines: AsyncIterator[str],
+    forms: Optional[Collection[str]],
+) -> list[FormIndexEntry]:
+    # parse_master_index over a streaming response
+    in_body = False
+    out: list[FormIndexEntry] = []
+    async for line in lines:
+        if not in_body:
+            in_body = line.startswith("-----")
+            continue
+        entry = _parse_row(line, forms)
+        if entry is not None:
+            out.append(entry)
+    return out
+
+
+class FormIndex:
+    """
+    Local index of recent EDGAR filings (form type -> (cik, accession,
+    date)), fed from the EDGAR daily master indexes. One small fetch per
+    business day tells us every company that filed a 10-Q that day, so a
+    watchlist can be checked without a submissions call per ticker.
+
+    Daily files are immutable once published, so each day is fetched once;
+    weekends are skipped and days with no index (holidays) are remembered
+    as empty. Entries older than `retain_days` are pruned.
+
+    Stored at: data/cache/form_index.json
+    """
+
+    def __init__(
+        self,
+        client: EdgarHttpClient,
+        path: Path = Path("data/cache/form_index.json"),
+        *,
+        forms: Collection[str] = TENQ_FORMS,
+        lookback_days: int = 7,
+        retain_days: int = 120,
+    ) -> None:
+        self._client = client
+        self.path = path
+        self.forms = frozenset(forms)
+        self.lookback_days = lookback_days
+        self.retain_days = retain_days
+        self._days: set[date] = set()
+        self._entries: Dict[str, FormIndexEntry] = {}  # by accession
+        self._by_cik: Dict[int, list[FormIndexEntry]] = defaultdict(list)
+        self._by_form: Dict[str, list[FormIndexEntry]] = defaultdict(list)
+        self._load()
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        raw = json.loads(self.path.read_text(encoding="utf-8"))
+        self._days = {date.fromisoformat(d) for d in raw.get("days", [])}
+        for cik, form_type, filed, accession, company in raw.get("entries", []):
+            self._add(FormIndexEntry(cik, form_type, date.fromisoformat(filed), accession, company))
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "days": sorted(d.isoformat() for d in self._days),
+            "entries": [
+                [e.cik, e.form_type, e.date_filed.isoformat(), e.accession_number, e.company_name]
+                for e in self._entries.values()
+            ],
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def _add(self, entry: FormIndexEntry) -> bool:
+        if entry.accession_number in self._entries:
+            return False
+        self._entries[entry.accession_number] = entry
+        self._by_cik[entry.cik].append(entry)
+        self._by_form[entry.form_type].append(entry)
+        return True
+
+    def _prune(self, today: date) -> None:
+        cutoff = today - timedelta(days=self.retain_days)
+        self._days = {d for d in self._days if d >= cutoff}
+        kept = [e for e in self._entries.values() if e.date_filed >= cutoff]
+        if len(kept) == len(self._entries):
+            return
+        self._entries = {}
+        self._by_cik = defaultdict(list)
+        self._by_form = defaultdict(list)
+        for e in kept:
+            self._add(e)
+
+    # ------------------------------------------------------------------ #
+    # Fetching
+    # ------------------------------------------------------------------ #
+
+    def _index_url(self, kind: str, day: date, name: str) -> str:
+        qtr = (day.month - 1) // 3 + 1
+        return f"{self._client.sec_base_url}/Archives/edgar/{kind}/" f"{day.year}/QTR{qtr}/{name}"
+
+    def _daily_url(self, day: date) -> str:
+        return self._index_url("daily-index", day, f"master.{day:%Y%m%d}.idx")
+
+    async def fetch_day(self, day: date) -> Optional[list[FormIndexEntry]]:
+        """
+        Entries for one day's master index, or None when SEC has no index
+        for that day (holiday, or not yet published).
+        """
+        try:
+            return await _aparse_master_index(
+                self._client.stream_lines(self._daily_url(day)), self.forms
+            )
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in (403, 404):
+                return None
+            raise
+
+    async def refresh(self, today: Optional[date] = None) -> list[FormIndexEntry]:
+        """
+        Fetch daily indexes not seen yet, from `lookback_days` ago through
+        today. Returns the newly indexed entries.
+        """
+        today = today or date.today()
+        added: list[FormIndexEntry] = []
+        day = today - timedelta(days=self.lookback_days)
+        while day <= today:
+            if day.weekday() < 5 and day not in self._days:
+                entries = await self.fetch_day(day)
+                for e in entries or ():
+                    if self._add(e):
+                        added.append(e)
+                # A day's index is published after it closes, so a missing
+                # recent day is retried; an older one was a holiday.
+                if entries is not None or day < today - timedelta(days=2):
+                    self._days.add(day)
+            day += timedelta(days=1)
+        self._prune(today)
+        self.save()
+        return added
+
+    async def load_quarter(self, year: int, quarter: int) -> list[FormIndexEntry]:
+        """
+        Seed the index from a quarterly full-index master.idx (tens of MB;
+        streamed and filtered line by line). Returns the newly indexed
+        entries; old rows are still subject to `retain_days`.
+        """
+        url = self._index_url("full-index", date(year, 3 * quarter - 2, 1), "master.idx")
+        added = [
+            e
+            for e in await _aparse_master_index(self._client.stream_lines(url), self.forms)
+            if self._add(e)
+        ]
+        self.save()
+        return added
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+
+    def filings_for(self, cik: int, after: Optional[date] = None) -> list[FormIndexEntry]:
+        """
+        Indexed filings for `cik` filed strictly after `after`, newest first.
+        """
+        rows = [e for e in self._by_cik.get(cik, ()) if after is None or e.date_filed > after]
+        rows.sort(key=lambda e: e.date_filed, reverse=True)
+        return rows
+
+    def has_newer(self, cik: int, after: date) -> bool:
+        return any(e.date_filed > after for e in self._by_cik.get(cik, ()))
+
+    def filers(self, form_type: str, on_or_after: date) -> set[int]:
+        """
+        CIKs that filed `form_type` on or after a date.
+        """
+        return {e.cik for e in self._by_form.get(form_type, ()) if e.date_filed >= on_or_after}
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import time
+from typing import Dict, Optional
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: Optional[str]
+    stored_at: float
+
+    def validators(self) -> Dict[str, str]:
+        """
+        Conditional-request headers for revalidating this entry.
+        """
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class HttpCacheStats:
+    fresh_hits: int = 0  # served from disk without a request
+    revalidated: int = 0  # 304 Not Modified, served from disk
+    misses: int = 0  # full body downloaded
+
+
+class HttpCache:
+    """
+    On-disk cache of SEC responses keyed by URL, stored with their
+    validators (ETag / Last-Modified) so later fetches can be conditional.
+
+    Entries younger than `max_age_seconds` are served without any request;
+    older ones are revalidated and a 304 serves the stored body.
+
+    Stored at: data/cache/http/<sha256(url)>.json (+ .body)
+    """
+
+    def __init__(self, root: Path = Path("data/cache/http"), max_age_seconds: float = 0.0) -> None:
+        self.root = root
+        self.max_age_seconds = max_age_seconds
+        self.stats = HttpCacheStats()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / f"{key}.json", self.root / f"{key}.body"
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            return CachedResponse(**json.loads(meta_path.read_text(encoding="utf-8")))
+        except (ValueError, TypeError):
+            return None
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return self.max_age_seconds > 0 and time() - entry.stored_at < self.max_age_seconds
+
+    def read_body(self, url: str) -> bytes:
+        return self._paths(url)[1].read_bytes()
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        *,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content_type: Optional[str],
+    ) -> None:
+        meta_path, body_path = self._paths(url)
+        entry = CachedResponse(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            content_type=content_type,
+            stored_at=time(),
+        )
+        # Body first, then metadata, each via atomic rename: a reader never
+        # sees metadata pointing at a partially written body.
+        _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(asdict(entry)).encode("utf-8"))
+
+    def touch(self, url: str, entry: CachedResponse) -> None:
+        """
+        Record a successful revalidation (restarts the freshness window).
+        """
+        entry.stored_at = time()
+        meta_path, _ = self._paths(url)
+        _atomic_write(meta_path, json.dumps(asdict(entry)).encode("utf-8"))
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
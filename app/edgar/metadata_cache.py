@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import json
+import sqlite3
+import threading
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
+from time import time
 from typing import Dict, Optional
 
 from app.edgar.models import TenQMetadata
@@ -16,6 +19,11 @@ class CachedTenQMetadata:
     filing_date: date
     period_of_report: Optional[date]
     primary_document: str
+    # When SEC last confirmed this is the latest filing (epoch seconds).
+    checked_at: Optional[float] = None
+    # Unknown (None) for rows cached before these were stored.
+    form_type: Optional[str] = None
+    company_name: Optional[str] = None
 
     @classmethod
     def from_tenq(cls, m: TenQMetadata) -> "CachedTenQMetadata":
@@ -25,76 +33,245 @@ class CachedTenQMetadata:
             filing_date=m.filing_date,
             period_of_report=m.period_of_report,
             primary_document=m.primary_document,
+            checked_at=time(),
+            form_type=m.form_type,
+            company_name=m.company_name,
         )
 
+    def to_tenq(self, ticker: str) -> Optional[TenQMetadata]:
+        """
+        Rebuild the full filing metadata without asking SEC; None when the
+        row predates form_type being cached.
+        """
+        if self.form_type is None:
+            return None
+        return TenQMetadata(
+            ticker=ticker.upper(),
+            cik=self.cik,
+            company_name=self.company_name or "",
+            form_type=self.form_type,
+            filing_date=self.filing_date,
+            period_of_report=self.period_of_report,
+            accession_number=self.accession_number,
+            primary_document=self.primary_document,
+        )
+
+    def age_seconds(self) -> float:
+        """
+        Seconds since SEC last confirmed this entry (inf if never).
+        """
+        return time() - self.checked_at if self.checked_at is not None else float("inf")
+
     def matches(self, m: TenQMetadata) -> bool:
         """
         Match only on the fields requested:
         - filed date
         - period end date (period_of_report)
         """
-        return (
-            self.filing_date == m.filing_date
-            and self.period_of_report == m.period_of_report
+        return self.filing_date == m.filing_date and self.period_of_report == m.period_of_report
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS latest_tenq (
+    ticker TEXT PRIMARY KEY,
+    cik TEXT NOT NULL,
+    accession_number TEXT NOT NULL,
+    filing_date TEXT NOT NULL,
+    period_of_report TEXT,
+    primary_document TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    form_type TEXT,
+    company_name TEXT
+)
+"""
+# Columns added after the first release of the table.
+_ADDED_COLUMNS = {"form_type": "TEXT", "company_name": "TEXT"}
+
+
+def _from_row(row: tuple) -> CachedTenQMetadata:
+    cik, accession, filing_date, period, primary_document, updated_at, form_type, company = row
+    return CachedTenQMetadata(
+        cik=cik,
+        accession_number=accession,
+        filing_date=date.fromisoformat(filing_date),
+        period_of_report=date.fromisoformat(period) if period else None,
+        primary_document=primary_document,
+        checked_at=updated_at,
+        form_type=form_type,
+        company_name=company,
+    )
+
+
+class _SqliteStore:
+    """
+    One SQLite (WAL) connection per database file and process, with a
+    read-through dict in front. WAL lets several processes read while one
+    writes; `PRAGMA data_version` changes whenever another connection
+    commits, which is when the in-process layer is dropped.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        existing = {r[1] for r in self._conn.execute("PRAGMA table_info(latest_tenq)")}
+        for column, kind in _ADDED_COLUMNS.items():
+            if column not in existing:
+                try:
+                    self._conn.execute(f"ALTER TABLE latest_tenq ADD COLUMN {column} {kind}")
+                except sqlite3.OperationalError:
+                    pass  # another process added it first
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._memo: Dict[str, Optional[CachedTenQMetadata]] = {}
+        self._data_version = self._version()
+
+    def _version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get(self, key: str) -> Optional[CachedTenQMetadata]:
+        with self._lock:
+            version = self._version()
+            if version != self._data_version:
+                self._memo.clear()
+                self._data_version = version
+            if key in self._memo:
+                return self._memo[key]
+            row = self._conn.execute(
+                "SELECT cik, accession_number, filing_date, period_of_report, primary_document, "
+                "updated_at, form_type, company_name "
+                "FROM latest_tenq WHERE ticker = ?",
+                (key,),
+            ).fetchone()
+            cached = _from_row(row) if row else None
+            self._memo[key] = cached
+            return cached
+
+    def put_many(self, rows: list[tuple[str, CachedTenQMetadata]], *, replace: bool = True) -> None:
+        verb = "INSERT INTO" if replace else "INSERT OR IGNORE INTO"
+        conflict = (
+            " ON CONFLICT(ticker) DO UPDATE SET cik=excluded.cik,"
+            " accession_number=excluded.accession_number, filing_date=excluded.filing_date,"
+            " period_of_report=excluded.period_of_report,"
+            " primary_document=excluded.primary_document, updated_at=excluded.updated_at,"
+            " form_type=excluded.form_type, company_name=excluded.company_name"
+            if replace
+            else ""
         )
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"{verb} latest_tenq (ticker, cik, accession_number, filing_date, "
+                f"period_of_report, primary_document, updated_at, form_type, company_name) "
+                f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)" + conflict,
+                [
+                    (
+                        key,
+                        c.cik,
+                        c.accession_number,
+                        c.filing_date.isoformat(),
+                        c.period_of_report.isoformat() if c.period_of_report else None,
+                        c.primary_document,
+                        c.checked_at if c.checked_at is not None else time(),
+                        c.form_type,
+                        c.company_name,
+                    )
+                    for key, c in rows
+                ],
+            )
+            for key, c in rows:
+                if replace:
+                    self._memo[key] = c
+                else:
+                    self._memo.pop(key, None)
+
+    def touch(self, key: str) -> None:
+        now = time()
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE latest_tenq SET updated_at = ? WHERE ticker = ?", (now, key))
+            cached = self._memo.get(key)
+            if cached is not None:
+                cached.checked_at = now
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[Path, _SqliteStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _store_for(db_path: Path) -> _SqliteStore:
+    key = db_path.resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = _SqliteStore(key)
+        return store
 
 
 class TenQMetadataCache:
     """
-    Disk-backed JSON cache of "latest 10-Q metadata per ticker".
+    Disk-backed cache of "latest 10-Q metadata per ticker".
 
     Used to skip SEC calls entirely when:
       - cached metadata exists AND
       - that accession is already ingested into the vector store.
 
-    Stored at: data/cache/latest_tenq.json
+    Backed by SQLite in WAL mode next to `path` (keyed reads, atomic
+    per-ticker upserts, safe across uvicorn workers). A legacy JSON file at
+    `path` is imported once and renamed to *.migrated.
+
+    Stored at: data/cache/latest_tenq.sqlite3
     """
 
     def __init__(self, path: Path = Path("data/cache/latest_tenq.json")) -> None:
         self.path = path
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-
-    def _load_all(self) -> Dict[str, dict]:
-        if not self.path.exists():
-            return {}
-        return json.loads(self.path.read_text(encoding="utf-8"))
+        self.db_path = path.with_suffix(".sqlite3")
+        self._store = _store_for(self.db_path)
+        if path.suffix == ".json" and path.exists():
+            self._migrate_json()
 
-    def _save_all(self, data: Dict[str, dict]) -> None:
-        self.path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    def _migrate_json(self) -> None:
+        try:
+            data: Dict[str, dict] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        rows = [
+            (
+                ticker.upper(),
+                CachedTenQMetadata(
+                    cik=entry["cik"],
+                    accession_number=entry["accession_number"],
+                    filing_date=date.fromisoformat(entry["filing_date"]),
+                    period_of_report=(
+                        date.fromisoformat(entry["period_of_report"])
+                        if entry.get("period_of_report")
+                        else None
+                    ),
+                    primary_document=entry["primary_document"],
+                    checked_at=0.0,  # never confirmed: stale for the SWR gate
+                ),
+            )
+            for ticker, entry in data.items()
+        ]
+        # Never overwrite rows written since; another worker may race us here.
+        self._store.put_many(rows, replace=False)
+        try:
+            self.path.rename(self.path.with_name(self.path.name + ".migrated"))
+        except OSError:
+            pass
 
     def get_latest(self, ticker: str) -> Optional[CachedTenQMetadata]:
-        data = self._load_all()
-        key = ticker.upper()
-        if key not in data:
-            return None
-
-        entry = data[key]
-        return CachedTenQMetadata(
-            cik=entry["cik"],
-            accession_number=entry["accession_number"],
-            filing_date=date.fromisoformat(entry["filing_date"]),
-            period_of_report=(
-                date.fromisoformat(entry["period_of_report"])
-                if entry.get("period_of_report")
-                else None
-            ),
-            primary_document=entry["primary_document"],
-        )
+        return self._store.get(ticker.upper())
 
     def set_latest(self, ticker: str, meta: TenQMetadata) -> None:
-        data = self._load_all()
-        key = ticker.upper()
-        cached = CachedTenQMetadata.from_tenq(meta)
-
-        data[key] = {
-            "cik": cached.cik,
-            "accession_number": cached.accession_number,
-            "filing_date": cached.filing_date.isoformat(),
-            "period_of_report": (
-                cached.period_of_report.isoformat()
-                if cached.period_of_report
-                else None
-            ),
-            "primary_document": cached.primary_document,
-        }
-        self._save_all(data)
+        self._store.put_many([(ticker.upper(), CachedTenQMetadata.from_tenq(meta))])
+
+    def touch(self, ticker: str) -> None:
+        """
+        Record that SEC was checked and the cached filing is still the latest.
+        """
+        self._store.touch(ticker.upper())
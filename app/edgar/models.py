@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from datetime import date
-from typing import Optional
+from typing import Any, NamedTuple, Optional
 
 from pydantic import BaseModel, Field
 
@@ -13,18 +14,175 @@ class CikResolutionResult(BaseModel):
     company_name: str
 
 
-class CompanySubmissions(BaseModel):
-    cik: str
-    entity_type: Optional[str] = None
-    sic: Optional[str] = None
+TENQ_FORMS = frozenset({"10-Q", "10-Q/A"})
+
+
+class TenQRow(NamedTuple):
+    period_of_report: Optional[date]
+    filing_date: date
+    form_type: str
+    accession_number: str
+    primary_document: str
+
+    @property
+    def sort_key(self) -> date:
+        return self.period_of_report or self.filing_date
+
+
+class SubmissionsFile(BaseModel):
+    """
+    One page of older filings listed under `filings.files`.
+    """
+
     name: str
-    tickers: list[str] = []
-    # Highly simplified view of the SEC submissions JSON:
-    forms: list[str]
-    filing_dates: list[date]
-    accession_numbers: list[str]
-    primary_docs: list[str]
-    periods: list[Optional[date]] = []
+    filing_count: int
+    filing_from: date
+    filing_to: date
+
+
+def _column(block: dict[str, Any], *names: str) -> list[Any]:
+    for name in names:
+        col = block.get(name)
+        if col:
+            return col
+    return []
+
+
+class CompanySubmissions:
+    """
+    Per-CIK view of the SEC submissions JSON, parsed column-wise and lazily:
+    only the `form` column is scanned in full; dates and documents are
+    decoded just for 10-Q / 10-Q/A rows. Those rows are kept sorted by
+    period of report (filing date when missing), so a period lookup is a
+    bisect. Older pages (`history_files`) are merged in on demand via
+    add_filings().
+    """
+
+    __slots__ = (
+        "cik",
+        "name",
+        "entity_type",
+        "sic",
+        "tickers",
+        "history_files",
+        "loaded_files",
+        "_rows",
+        "_keys",
+        "_accessions",
+    )
+
+    def __init__(
+        self,
+        cik: str,
+        name: str,
+        *,
+        entity_type: Optional[str] = None,
+        sic: Optional[str] = None,
+        tickers: Optional[list[str]] = None,
+        history_files: Optional[list[SubmissionsFile]] = None,
+    ) -> None:
+        self.cik = cik
+        self.name = name
+        self.entity_type = entity_type
+        self.sic = sic
+        self.tickers = tickers or []
+        self.history_files = history_files or []
+        self.loaded_files: set[str] = set()
+        self._rows: list[TenQRow] = []
+        self._keys: list[date] = []
+        self._accessions: set[str] = set()
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "CompanySubmissions":
+        filings = data.get("filings", {})
+        subs = cls(
+            cik=str(data["cik"]),
+            name=data["name"],
+            entity_type=data.get("entityType"),
+            sic=data.get("sic"),
+            tickers=list(data.get("tickers", [])),
+            history_files=[
+                SubmissionsFile(
+                    name=f["name"],
+                    filing_count=f.get("filingCount", 0),
+                    filing_from=date.fromisoformat(f["filingFrom"]),
+                    filing_to=date.fromisoformat(f["filingTo"]),
+                )
+                for f in filings.get("files", [])
+            ],
+        )
+        subs.add_filings(filings.get("recent", {}))
+        return subs
+
+    def add_filings(self, block: dict[str, Any]) -> int:
+        """
+        Merge one columnar block (`filings.recent` or a history page).
+        Returns the number of 10-Q rows added.
+        """
+        forms = block.get("form", [])
+        filing_dates = block.get("filingDate", [])
+        accessions = block.get("accessionNumber", [])
+        docs = block.get("primaryDocument", [])
+        # SEC calls the period column reportDate
+        periods = _column(block, "reportDate", "periodOfReport")
+
+        seen = self._accessions
+        new_rows: list[TenQRow] = []
+        for i, form in enumerate(forms):
+            if form not in TENQ_FORMS or accessions[i] in seen:
+                continue
+            raw_period = periods[i] if i < len(periods) else None
+            new_rows.append(
+                TenQRow(
+                    period_of_report=date.fromisoformat(raw_period) if raw_period else None,
+                    filing_date=date.fromisoformat(filing_dates[i]),
+                    form_type=form,
+                    accession_number=accessions[i],
+                    primary_document=docs[i],
+                )
+            )
+            seen.add(accessions[i])
+
+        if new_rows:
+            self._rows = sorted(self._rows + new_rows, key=lambda r: r.sort_key)
+            self._keys = [r.sort_key for r in self._rows]
+        return len(new_rows)
+
+    @property
+    def tenq_rows(self) -> list[TenQRow]:
+        """
+        10-Q / 10-Q/A rows loaded so far, ordered by period of report.
+        """
+        return list(self._rows)
+
+    def latest_tenq(self) -> Optional[TenQRow]:
+        if not self._rows:
+            return None
+        return max(self._rows, key=lambda r: r.filing_date)
+
+    def tenq_for_period(self, period: date) -> Optional[TenQRow]:
+        """
+        The most recently filed row (so an amendment wins) for `period`.
+        """
+        lo = bisect_left(self._keys, period)
+        hi = bisect_right(self._keys, period, lo=lo)
+        matches = [r for r in self._rows[lo:hi] if r.period_of_report == period]
+        return max(matches, key=lambda r: r.filing_date) if matches else None
+
+    def tenq_between(self, start: date, end: date) -> list[TenQRow]:
+        lo = bisect_left(self._keys, start)
+        hi = bisect_right(self._keys, end, lo=lo)
+        return self._rows[lo:hi]
+
+    def pending_files(self, since: Optional[date] = None) -> list[SubmissionsFile]:
+        """
+        History pages not loaded yet that hold filings made on or after `since`.
+        """
+        return [
+            f
+            for f in self.history_files
+            if f.name not in self.loaded_files and (since is None or f.filing_to >= since)
+        ]
 
 
 class TenQMetadata(BaseModel):
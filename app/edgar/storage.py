@@ -1,17 +1,54 @@
 from __future__ import annotations
 
+import gzip
+import io
+import os
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Protocol
+from typing import IO, BinaryIO, ContextManager, Iterator, Protocol, TextIO
+
+_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstd():  # type: ignore[no-untyped-def]
+    try:
+        import zstandard
+    except ImportError as exc:  # pragma: no cover - depends on optional extra
+        raise RuntimeError(
+            "zstd compression needs the 'zstandard' package (pip install '.[zstd]')"
+        ) from exc
+    return zstandard
+
+
+def open_text_file(path: Path) -> TextIO:
+    """
+    Open a stored file as text, transparently decompressing .gz / .zst.
+    """
+    if path.suffix == ".gz":
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", errors="ignore")
+    if path.suffix == ".zst":
+        raw = _zstd().ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.TextIOWrapper(io.BufferedReader(raw), encoding="utf-8", errors="ignore")
+    return open(path, "r", encoding="utf-8", errors="ignore")
 
 
 class StorageBackend(Protocol):
     def write_bytes(self, relative_path: str, data: bytes) -> str: ...
     def exists(self, relative_path: str) -> bool: ...
+    def stored_path(self, relative_path: str) -> str: ...
+    def open_write(self, relative_path: str) -> ContextManager[BinaryIO]: ...
+    def open_text(self, relative_path: str) -> TextIO: ...
 
 
 class LocalFileStorage(StorageBackend):
-    def __init__(self, root: Path) -> None:
+    def __init__(self, root: Path, compression: str = "none") -> None:
         self.root = root
+        if compression not in _SUFFIXES:
+            raise ValueError(f"Unknown compression {compression!r}; use one of {sorted(_SUFFIXES)}")
+        if compression == "zstd":
+            _zstd()
+        self.compression = compression
 
         # ✅ Ensure root exists and is a directory (idempotent)
         if self.root.exists() and not self.root.is_dir():
@@ -35,3 +72,42 @@ class LocalFileStorage(StorageBackend):
 
     def exists(self, relative_path: str) -> bool:
         return (self.root / relative_path).exists()
+
+    def stored_path(self, relative_path: str) -> str:
+        """
+        Relative path a document is stored under with this backend's compression.
+        """
+        return relative_path + _SUFFIXES[self.compression]
+
+    @contextmanager
+    def open_write(self, relative_path: str) -> Iterator[BinaryIO]:
+        """
+        Stream bytes into `relative_path`, compressing according to its
+        suffix (.gz / .zst). Data goes to a temp file in the same directory
+        and is renamed into place only once fully written, so readers never
+        see a partial document; on error the temp file is removed.
+        """
+        path = self.root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.part")
+        raw = open(tmp, "wb")
+        sink: IO[bytes]
+        try:
+            if path.suffix == ".gz":
+                sink = gzip.GzipFile(filename=path.stem, mode="wb", fileobj=raw, compresslevel=6)
+            elif path.suffix == ".zst":
+                sink = _zstd().ZstdCompressor(level=10).stream_writer(raw, closefd=False)
+            else:
+                sink = raw
+            yield sink  # type: ignore[misc]
+            if sink is not raw:
+                sink.close()
+            raw.close()
+            os.replace(tmp, path)
+        except BaseException:
+            raw.close()
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def open_text(self, relative_path: str) -> TextIO:
+        return open_text_file(self.root / relative_path)
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from pydantic import BaseModel
+from app.edgar.models import CompanySubmissions, TenQMetadata, TenQRow
 
-from app.edgar.client import EdgarHttpClient
-from app.edgar.models import CompanySubmissions, TenQMetadata, CikResolutionResult
+if TYPE_CHECKING:
+    from app.edgar.client import EdgarHttpClient
+
+
+def is_amendment_of(amendment: TenQMetadata, original: Any) -> bool:
+    """
+    True when `amendment` is a 10-Q/A for the same company and period as
+    `original` (a TenQMetadata or CachedTenQMetadata).
+    """
+    return (
+        amendment.form_type == "10-Q/A"
+        and amendment.cik == original.cik
+        and amendment.period_of_report is not None
+        and amendment.period_of_report == original.period_of_report
+    )
 
 
 class SubmissionsService:
@@ -14,32 +27,26 @@ class SubmissionsService:
         self._client = client
 
     async def fetch_submissions(self, cik_str: str) -> CompanySubmissions:
+        """
+        Fetch CIK##########.json. Only `filings.recent` is parsed; older
+        pages listed in `filings.files` are fetched by load_history() when
+        a lookup needs them.
+        """
         path = f"submissions/CIK{cik_str}.json"
         data = await self._client.get_json(path, data_host=True)
+        return CompanySubmissions.from_json(data)
 
-        recent = data["filings"]["recent"]
-        forms: list[str] = list(recent["form"])
-        filing_dates: list[date] = [date.fromisoformat(d) for d in recent["filingDate"]]
-        accession_numbers: list[str] = list(recent["accessionNumber"])
-        primary_docs: list[str] = list(recent["primaryDocument"])
-        periods_raw: Iterable[Optional[str]] = recent.get("periodOfReport", [])
-        periods = [
-            date.fromisoformat(p) if p else None
-            for p in periods_raw
-        ]
-
-        return CompanySubmissions(
-            cik=data["cik"],
-            entity_type=data.get("entityType"),
-            sic=data.get("sic"),
-            name=data["name"],
-            tickers=data.get("tickers", []),
-            forms=forms,
-            filing_dates=filing_dates,
-            accession_numbers=accession_numbers,
-            primary_docs=primary_docs,
-            periods=periods,
-        )
+    async def load_history(self, submissions: CompanySubmissions, since: date) -> int:
+        """
+        Fetch and merge the history pages holding filings made on or after
+        `since`. Returns the number of 10-Q rows added.
+        """
+        added = 0
+        for page in submissions.pending_files(since):
+            data = await self._client.get_json(f"submissions/{page.name}", data_host=True)
+            added += submissions.add_filings(data)
+            submissions.loaded_files.add(page.name)
+        return added
 
     def select_latest_10q(
         self,
@@ -49,36 +56,51 @@ class SubmissionsService:
         """
         Filter for 10-Q / 10-Q/A. If target_period is provided,
         prefer that period; otherwise take the most recent filing_date.
+        Only pages loaded so far are searched; see select_10q_for_period.
         """
-        indices = [
-            i
-            for i, form in enumerate(submissions.forms)
-            if form in {"10-Q", "10-Q/A"}
-        ]
-        if not indices:
-            return None
-
-        # naive strategy: sort by filing_date desc, optionally filter by target_period
-        candidates = [
-            (i, submissions.filing_dates[i])
-            for i in indices
-        ]
-
         if target_period:
-            candidates = [c for c in candidates if submissions.periods[c[0]] == target_period]
-            if not candidates:
-                return None
+            row = submissions.tenq_for_period(target_period)
+        else:
+            row = submissions.latest_tenq()
+        return self._to_metadata(submissions, row) if row else None
 
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        idx = candidates[0][0]
+    async def select_10q_for_period(
+        self,
+        submissions: CompanySubmissions,
+        period: date,
+    ) -> Optional[TenQMetadata]:
+        """
+        Like select_latest_10q(target_period=period), loading older history
+        pages first when the period isn't among the recent filings.
+        """
+        found = self.select_latest_10q(submissions, target_period=period)
+        if found is None and await self.load_history(submissions, since=period):
+            found = self.select_latest_10q(submissions, target_period=period)
+        return found
+
+    def select_10qs_between(
+        self,
+        submissions: CompanySubmissions,
+        start: date,
+        end: date,
+    ) -> list[TenQMetadata]:
+        """
+        All 10-Q / 10-Q/A filings whose period of report (or filing date,
+        when the period is missing) falls within [start, end], oldest first.
+        Call load_history(submissions, since=start) first for old ranges.
+        """
+        rows = sorted(submissions.tenq_between(start, end), key=lambda r: r.filing_date)
+        return [self._to_metadata(submissions, r) for r in rows]
 
+    @staticmethod
+    def _to_metadata(submissions: CompanySubmissions, row: TenQRow) -> TenQMetadata:
         return TenQMetadata(
             ticker=submissions.tickers[0] if submissions.tickers else "",
             cik=submissions.cik,
             company_name=submissions.name,
-            form_type=submissions.forms[idx],
-            filing_date=submissions.filing_dates[idx],
-            period_of_report=submissions.periods[idx] if submissions.periods else None,
-            accession_number=submissions.accession_numbers[idx],
-            primary_document=submissions.primary_docs[idx],
+            form_type=row.form_type,
+            filing_date=row.filing_date,
+            period_of_report=row.period_of_report,
+            accession_number=row.accession_number,
+            primary_document=row.primary_document,
         )
@@ -0,0 +1,427 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from pathlib import Path
+from time import monotonic
+from typing import Callable, Optional, Sequence
+
+from app.agents.dependencies import AgentDependencies
+from app.edgar.models import TenQMetadata
+from app.ingestion.pipeline import ingest_parsed, parse_stored_filing
+
+MAX_RECORDED_ERRORS = 50
+
+
+@dataclass(frozen=True)
+class BackfillSpec:
+    tickers: tuple[str, ...]
+    start: date
+    end: date
+    # Only download filings (warms storage); skip parse/embed.
+    download_only: bool = False
+
+    @classmethod
+    def of(
+        cls,
+        tickers: Sequence[str],
+        start: date,
+        end: date,
+        download_only: bool = False,
+    ) -> "BackfillSpec":
+        norm = tuple(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        if not norm:
+            raise ValueError("Backfill needs at least one ticker")
+        if start > end:
+            raise ValueError(f"Backfill start {start} is after end {end}")
+        return cls(tickers=norm, start=start, end=end, download_only=download_only)
+
+    @property
+    def backfill_id(self) -> str:
+        """
+        Stable id for this spec; re-running the same spec resumes from its
+        checkpoint.
+        """
+        key = json.dumps(
+            [sorted(self.tickers), self.start.isoformat(), self.end.isoformat(), self.download_only]
+        )
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass
+class BackfillProgress:
+    tickers_total: int = 0
+    tickers_planned: int = 0
+    tickers_failed: int = 0
+    filings_planned: int = 0
+    filings_skipped: int = 0  # checkpointed or already in the vector store
+    filings_downloaded: int = 0
+    filings_ingested: int = 0
+    filings_completed: int = 0  # ingested, or downloaded when download_only
+    filings_failed: int = 0
+    bytes_stored: int = 0
+    chunks_ingested: int = 0
+    chunks_embedded: int = 0
+    errors: list[str] = field(default_factory=list)
+    started_at: float = field(default_factory=monotonic)
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or monotonic()) - self.started_at
+
+    @property
+    def filings_done(self) -> int:
+        return self.filings_skipped + self.filings_completed + self.filings_failed
+
+    def record_error(self, message: str) -> None:
+        if len(self.errors) < MAX_RECORDED_ERRORS:
+            self.errors.append(message)
+
+    def summary(self) -> dict[str, object]:
+        elapsed = max(self.elapsed, 1e-9)
+        out: dict[str, object] = asdict(self)
+        del out["started_at"], out["finished_at"]
+        out["elapsed_seconds"] = round(self.elapsed, 3)
+        out["filings_per_second"] = round(self.filings_completed / elapsed, 3)
+        out["chunks_per_second"] = round(self.chunks_ingested / elapsed, 3)
+        out["mb_per_second"] = round(self.bytes_stored / elapsed / 1e6, 3)
+        return out
+
+
+class BackfillCheckpoint:
+    """
+    Append-only JSONL log of finished filings, one line per accession.
+    Accessions logged as "ok" are skipped when the backfill is resumed;
+    failures are retried.
+
+    Stored at: data/cache/backfills/<backfill_id>.jsonl
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._done: set[str] = set()
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn final line from an interrupted run
+                if rec.get("status") == "ok":
+                    self._done.add(rec["accession_number"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def for_spec(
+        cls,
+        spec: BackfillSpec,
+        root: Path = Path("data/cache/backfills"),
+    ) -> "BackfillCheckpoint":
+        return cls(root / f"{spec.backfill_id}.jsonl")
+
+    def is_done(self, accession_number: str) -> bool:
+        return accession_number in self._done
+
+    def record(self, ticker: str, accession_number: str, status: str, **extra: object) -> None:
+        rec = {"ticker": ticker, "accession_number": accession_number, "status": status, **extra}
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(rec) + "\n")
+        if status == "ok":
+            self._done.add(accession_number)
+
+
+def _base_accessions(filings: Sequence[TenQMetadata]) -> dict[str, str]:
+    """
+    Map each 10-Q/A in `filings` to the original 10-Q for the same period,
+    so the amendment can reuse the original's vectors.
+    """
+    originals = {
+        m.period_of_report: m.accession_number
+        for m in filings
+        if m.form_type == "10-Q" and m.period_of_report
+    }
+    return {
+        m.accession_number: originals[m.period_of_report]
+        for m in filings
+        if m.form_type == "10-Q/A" and m.period_of_report in originals
+    }
+
+
+async def run_backfill(
+    deps: AgentDependencies,
+    spec: BackfillSpec,
+    *,
+    checkpoint: Optional[BackfillCheckpoint] = None,
+    download_concurrency: int = 4,
+    ingest_workers: int = 2,
+    parse_executor: Optional[Executor] = None,
+    progress: Optional[BackfillProgress] = None,
+    on_progress: Optional[Callable[[BackfillProgress], None]] = None,
+) -> BackfillProgress:
+    """
+    Ingest every 10-Q for `spec.tickers` with a period in [start, end].
+
+    Tickers are planned (CIK + submissions) and filings downloaded
+    concurrently, up to `download_concurrency` at a time; all SEC traffic
+    still goes through the client's shared rate limiter. Downloaded filings
+    feed a bounded queue drained by `ingest_workers` workers that parse
+    (in `parse_executor`, default: a thread) and embed. The queue bound
+    keeps downloads from running far ahead of ingestion.
+
+    A 10-Q/A is queued only once its original has been ingested (or has
+    failed), so unchanged chunks reuse the original's vectors.
+
+    Quarter-over-quarter diffs are not computed here: filings of one ticker
+    are ingested concurrently, so the prior quarter may not be stored yet.
+    """
+    checkpoint = checkpoint or BackfillCheckpoint.for_spec(spec)
+    progress = progress or BackfillProgress()
+    progress.tickers_total = len(spec.tickers)
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(download_concurrency)
+    queue: asyncio.Queue[Optional[tuple[TenQMetadata, str, Optional[str]]]] = asyncio.Queue(
+        maxsize=max(1, ingest_workers) * 2
+    )
+    # Set once the original 10-Q is stored, or won't be; amendments wait on it.
+    bases_settled: dict[str, asyncio.Event] = {}
+
+    def report() -> None:
+        if on_progress is not None:
+            on_progress(progress)
+
+    def settle(accession_number: str) -> None:
+        event = bases_settled.get(accession_number)
+        if event is not None:
+            event.set()
+
+    def fail(meta: TenQMetadata, stage: str, exc: Exception) -> None:
+        settle(meta.accession_number)
+        progress.filings_failed += 1
+        progress.record_error(f"{meta.ticker} {meta.accession_number} {stage}: {exc!r}")
+        checkpoint.record(
+            meta.ticker, meta.accession_number, "failed", stage=stage, error=repr(exc)
+        )
+        report()
+
+    async def download(meta: TenQMetadata, base_accession: Optional[str]) -> None:
+        try:
+            async with sem:
+                rel_path = await deps.filing_downloader.download_primary_html(meta)
+        except Exception as exc:
+            fail(meta, "download", exc)
+            return
+        progress.filings_downloaded += 1
+        progress.bytes_stored += (Path("data") / rel_path).stat().st_size
+        if spec.download_only:
+            progress.filings_completed += 1
+            checkpoint.record(meta.ticker, meta.accession_number, "ok", path=rel_path)
+            report()
+            return
+        if base_accession is not None:
+            await bases_settled[base_accession].wait()
+        await queue.put((meta, rel_path, base_accession))
+
+    async def plan(ticker: str) -> None:
+        try:
+            async with sem:
+                cik_info = await deps.cik_resolver.resolve(ticker)
+                subs = await deps.submissions.fetch_submissions(cik_info.cik_str)
+                await deps.submissions.load_history(subs, since=spec.start)
+        except Exception as exc:
+            progress.tickers_failed += 1
+            progress.record_error(f"{ticker} plan: {exc!r}")
+            report()
+            return
+
+        filings = [
+            m.model_copy(update={"ticker": ticker})
+            for m in deps.submissions.select_10qs_between(subs, spec.start, spec.end)
+        ]
+        bases = _base_accessions(filings)
+        progress.tickers_planned += 1
+        progress.filings_planned += len(filings)
+
+        done: set[str] = set()
+        for meta in filings:
+            if checkpoint.is_done(meta.accession_number) or (
+                not spec.download_only
+                and await deps.vector_store.has_accession(ticker, meta.accession_number)
+            ):
+                done.add(meta.accession_number)
+        # Ingesting an amendment deletes its original, which must not come back.
+        if not spec.download_only:
+            done.update(base for acc, base in bases.items() if acc in done)
+        pending: list[TenQMetadata] = []
+        for meta in filings:
+            if meta.accession_number in done:
+                progress.filings_skipped += 1
+            else:
+                pending.append(meta)
+        pending_accessions = {m.accession_number for m in pending}
+        for base in set(bases.values()):
+            bases_settled[base] = event = asyncio.Event()
+            if base not in pending_accessions:
+                event.set()
+        report()
+        await asyncio.gather(*(download(m, bases.get(m.accession_number)) for m in pending))
+
+    async def ingest_worker() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            meta, rel_path, base_accession = item
+            try:
+                chunks = await loop.run_in_executor(
+                    parse_executor,
+                    parse_stored_filing,
+                    deps.tenq_parser,
+                    Path("data") / rel_path,
+                    meta,
+                )
+                stats = await ingest_parsed(deps, chunks, meta, base_accession=base_accession)
+            except Exception as exc:
+                fail(meta, "ingest", exc)
+                continue
+            settle(meta.accession_number)
+            progress.filings_ingested += 1
+            progress.filings_completed += 1
+            progress.chunks_ingested += stats.total_chunks
+            progress.chunks_embedded += stats.embedded_chunks
+            checkpoint.record(
+                meta.ticker,
+                meta.accession_number,
+                "ok",
+                chunks=stats.total_chunks,
+                embedded=stats.embedded_chunks,
+            )
+            report()
+
+    workers = [asyncio.create_task(ingest_worker()) for _ in range(max(1, ingest_workers))]
+    try:
+        await asyncio.gather(*(plan(t) for t in spec.tickers))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for w in workers:
+            w.cancel()
+        if deps.boilerplate is not None:
+            deps.boilerplate.flush()
+        progress.finished_at = monotonic()
+    report()
+    return progress
+
+
+@dataclass
+class BackfillRun:
+    """
+    A backfill running in the background of a long-lived process (the API).
+    """
+
+    spec: BackfillSpec
+    progress: BackfillProgress
+    task: "asyncio.Task[BackfillProgress]"
+
+    @classmethod
+    def start(cls, deps: AgentDependencies, spec: BackfillSpec, **kwargs: object) -> "BackfillRun":
+        progress = BackfillProgress()
+        task = asyncio.create_task(run_backfill(deps, spec, progress=progress, **kwargs))  # type: ignore[arg-type]
+        return cls(spec=spec, progress=progress, task=task)
+
+    @property
+    def status(self) -> str:
+        if not self.task.done():
+            return "running"
+        if self.task.cancelled():
+            return "cancelled"
+        return "failed" if self.task.exception() is not None else "completed"
+
+    @property
+    def error(self) -> Optional[str]:
+        if self.task.done() and not self.task.cancelled() and self.task.exception() is not None:
+            return repr(self.task.exception())
+        return None
+
+
+# ---------------------------------------------------------------------- #
+# CLI: python -m app.ingestion.backfill --tickers AAPL,MSFT --start ... --end ...
+# ---------------------------------------------------------------------- #
+
+
+def _read_tickers(args: argparse.Namespace) -> list[str]:
+    tickers: list[str] = []
+    if args.tickers:
+        tickers.extend(args.tickers.split(","))
+    if args.tickers_file:
+        for line in Path(args.tickers_file).read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                tickers.append(line)
+    return tickers
+
+
+def _print_progress(p: BackfillProgress) -> None:
+    sys.stderr.write(
+        f"\r[{p.elapsed:7.1f}s] tickers {p.tickers_planned}/{p.tickers_total}  "
+        f"filings {p.filings_done}/{p.filings_planned} "
+        f"(downloaded {p.filings_downloaded}, ingested {p.filings_ingested}, "
+        f"skipped {p.filings_skipped}, failed {p.filings_failed})  "
+        f"chunks {p.chunks_ingested}"
+    )
+    sys.stderr.flush()
+
+
+async def _main(argv: Optional[Sequence[str]] = None) -> int:
+    from app.agents.orchestrator import build_default_deps, close_default_deps
+    from app.config.settings import get_settings
+
+    settings = get_settings()
+    ap = argparse.ArgumentParser(description="Backfill historical 10-Q filings.")
+    ap.add_argument("--tickers", help="comma-separated tickers")
+    ap.add_argument("--tickers-file", help="file with one ticker per line (# comments allowed)")
+    ap.add_argument("--start", required=True, type=date.fromisoformat, help="YYYY-MM-DD")
+    ap.add_argument("--end", default=date.today(), type=date.fromisoformat, help="YYYY-MM-DD")
+    ap.add_argument(
+        "--download-concurrency", type=int, default=settings.backfill_download_concurrency
+    )
+    ap.add_argument("--ingest-workers", type=int, default=settings.backfill_ingest_workers)
+    ap.add_argument(
+        "--parse-processes",
+        type=int,
+        default=0,
+        help="parse in a process pool of this size (0 = worker threads)",
+    )
+    ap.add_argument("--download-only", action="store_true", help="only download filings")
+    args = ap.parse_args(argv)
+
+    spec = BackfillSpec.of(_read_tickers(args), args.start, args.end, args.download_only)
+    executor = ProcessPoolExecutor(args.parse_processes) if args.parse_processes > 0 else None
+    deps = await build_default_deps()
+    try:
+        progress = await run_backfill(
+            deps,
+            spec,
+            download_concurrency=args.download_concurrency,
+            ingest_workers=args.ingest_workers,
+            parse_executor=executor,
+            on_progress=_print_progress,
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        await close_default_deps()
+
+    sys.stderr.write("\n")
+    print(json.dumps({"backfill_id": spec.backfill_id, **progress.summary()}, indent=2))
+    return 1 if progress.filings_failed or progress.tickers_failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(_main()))
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal, Optional, Sequence
+
+from app.ingestion.minhash import LshIndex, MinHasher, Signature, estimate_jaccard
+from app.parsing.chunk_table import ChunkTable
+from app.parsing.models import TenQChunk
+
+BoilerplateMode = Literal["off", "tag", "drop"]
+
+_FORMAT_VERSION = 2
+
+
+@dataclass
+class _Entry:
+    sig: Signature
+    # (cik, accession) of the first filing per company this text (or a
+    # near-duplicate) appeared in; capped.
+    filings: list[tuple[str, str]] = field(default_factory=list)
+
+    def ciks(self) -> set[str]:
+        return {cik for cik, _ in self.filings}
+
+
+@dataclass
+class BoilerplateReport:
+    accession_number: str
+    total_chunks: int
+    boilerplate_chunks: int
+    mode: BoilerplateMode
+
+    @property
+    def suppression_rate(self) -> float:
+        return self.boilerplate_chunks / self.total_chunks if self.total_chunks else 0.0
+
+
+class BoilerplateDetector:
+    """
+    Corpus-level near-duplicate detector for 10-Q boilerplate (cover pages,
+    forward-looking statement legends, signatures, exhibit indexes).
+
+    Every ingested chunk's MinHash signature goes into an LSH index. A chunk
+    is boilerplate when near-duplicates (estimated Jaccard >= `similarity`)
+    were already seen in filings of at least `min_filings` other companies:
+    a company's own risk factors and MD&A paragraphs recur every quarter
+    and are not boilerplate. Repeated text
+    collapses onto one entry, so the index grows with distinct text, not
+    with chunk count. Persisted at: data/cache/boilerplate.json, every
+    `save_every` filings and on flush() (end of a backfill, shutdown),
+    since each save rewrites the whole index.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = Path("data/cache/boilerplate.json"),
+        *,
+        mode: BoilerplateMode = "drop",
+        min_filings: int = 3,
+        similarity: float = 0.8,
+        num_perm: int = 32,
+        bands: int = 8,
+        max_entries: int = 50_000,
+        save_every: int = 20,
+    ) -> None:
+        self.path = path
+        self.mode = mode
+        self.min_filings = min_filings
+        self.similarity = similarity
+        self.max_entries = max_entries
+        self.save_every = save_every
+        self._unsaved = 0
+        self._hasher = MinHasher(num_perm=num_perm)
+        self._bands = bands
+        self._entries: list[_Entry] = []
+        self._lsh: LshIndex[int] = LshIndex(num_perm, bands=bands)
+        self.seen_chunks = 0
+        self.suppressed_chunks = 0
+        self._load()
+
+    @property
+    def suppression_rate(self) -> float:
+        return self.suppressed_chunks / self.seen_chunks if self.seen_chunks else 0.0
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        raw = json.loads(self.path.read_text(encoding="utf-8"))
+        if raw.get("version") != _FORMAT_VERSION:
+            # Older files counted filings rather than companies; rebuilt as
+            # filings are ingested.
+            return
+        for e in raw.get("entries", []):
+            sig = tuple(int(h, 16) for h in e["sig"])
+            self._add_entry(_Entry(sig=sig, filings=[(cik, acc) for cik, acc in e["filings"]]))
+
+    def flush(self) -> None:
+        """Save filings classified since the last save, if any."""
+        if self._unsaved:
+            self.save()
+
+    def save(self) -> None:
+        self._unsaved = 0
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        entries = [
+            {"sig": [format(h, "x") for h in e.sig], "filings": e.filings} for e in self._entries
+        ]
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"version": _FORMAT_VERSION, "entries": entries}), encoding="utf-8"
+        )
+        tmp.replace(self.path)
+
+    def _add_entry(self, entry: _Entry) -> int:
+        idx = len(self._entries)
+        self._entries.append(entry)
+        self._lsh.add(idx, entry.sig)
+        return idx
+
+    def _evict_singletons(self) -> None:
+        """
+        Drop entries seen for a single company (oldest first) once over
+        capacity, then rebuild the LSH index.
+        """
+        overflow = len(self._entries) - self.max_entries
+        if overflow <= 0:
+            return
+        kept: list[_Entry] = []
+        for e in self._entries:
+            if overflow > 0 and len(e.filings) <= 1:
+                overflow -= 1
+                continue
+            kept.append(e)
+        self._entries = []
+        self._lsh = LshIndex(self._hasher.num_perm, bands=self._bands)
+        for e in kept:
+            self._add_entry(e)
+
+    # ------------------------------------------------------------------ #
+    # Detection
+    # ------------------------------------------------------------------ #
+
+    def _match(self, sig: Signature) -> Optional[_Entry]:
+        best: Optional[_Entry] = None
+        best_sim = 0.0
+        for idx in self._lsh.query(sig):
+            entry = self._entries[idx]
+            sim = estimate_jaccard(sig, entry.sig)
+            if sim >= self.similarity and sim > best_sim:
+                best, best_sim = entry, sim
+        return best
+
+    def _is_boilerplate(self, entry: _Entry, cik: str) -> bool:
+        return len(entry.ciks() - {cik}) >= self.min_filings
+
+    def flag(self, texts: Sequence[str], cik: str) -> list[bool]:
+        """
+        Whether each text counts as boilerplate for company `cik` now,
+        without recording anything (e.g. for chunks stored earlier).
+        """
+        flags: list[bool] = []
+        for text in texts:
+            entry = self._match(self._hasher.signature(text))
+            flags.append(entry is not None and self._is_boilerplate(entry, cik))
+        return flags
+
+    def classify(self, texts: Sequence[str], accession_number: str, cik: str) -> list[bool]:
+        """
+        Flag each text as boilerplate and record this filing's chunks in the
+        corpus index. Only other companies' filings count, each company once.
+        """
+        flags: list[bool] = []
+        for text in texts:
+            sig = self._hasher.signature(text)
+            entry = self._match(sig)
+            if entry is None:
+                self._add_entry(_Entry(sig=sig, filings=[(cik, accession_number)]))
+                flags.append(False)
+                continue
+            ciks = entry.ciks()
+            flags.append(self._is_boilerplate(entry, cik))
+            if cik not in ciks and len(ciks) <= self.min_filings:
+                entry.filings.append((cik, accession_number))
+
+        self._evict_singletons()
+        return flags
+
+    def apply(
+        self,
+        chunks: Sequence[TenQChunk],
+        accession_number: str,
+        cik: str,
+    ) -> tuple[Sequence[TenQChunk], BoilerplateReport]:
+        """
+        Classify `chunks` and, per `mode`, drop boilerplate (before it is
+        embedded) or tag it via TenQChunk.is_boilerplate.
+        """
+        if self.mode == "off":
+            return chunks, BoilerplateReport(accession_number, len(chunks), 0, self.mode)
+
+        if isinstance(chunks, ChunkTable):
+            texts: Sequence[str] = list(chunks.texts())
+        else:
+            texts = [c.text for c in chunks]
+        flags = self.classify(texts, accession_number, cik)
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+        n_boiler = sum(flags)
+        self.seen_chunks += len(flags)
+        self.suppressed_chunks += n_boiler
+        report = BoilerplateReport(accession_number, len(flags), n_boiler, self.mode)
+        if not n_boiler:
+            return chunks, report
+
+        if self.mode == "drop":
+            keep = [i for i, f in enumerate(flags) if not f]
+            if isinstance(chunks, ChunkTable):
+                return chunks.select(keep), report
+            return [chunks[i] for i in keep], report
+
+        # tag
+        if isinstance(chunks, ChunkTable):
+            for i, f in enumerate(flags):
+                if f:
+                    chunks.mark_boilerplate(i)
+            return chunks, report
+        for chunk, f in zip(chunks, flags):
+            chunk.is_boilerplate = f
+        return chunks, report
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Optional, Sequence
+
+from app.ingestion.fingerprints import text_fingerprint
+from app.ingestion.minhash import LshIndex, MinHasher, Signature, estimate_jaccard
+from app.parsing.models import TenQChunk
+
+
+class ChunkChange(str, Enum):
+    NEW = "new"
+    CHANGED = "changed"
+    REMOVED = "removed"
+
+
+@dataclass
+class ChunkDiffEntry:
+    change: ChunkChange
+    section_name: str
+    section_item: Optional[str]
+    chunk_index: int
+    text: str
+    # For CHANGED: the best-matching prior chunk and its estimated Jaccard.
+    prior_chunk_index: Optional[int] = None
+    similarity: Optional[float] = None
+
+
+@dataclass
+class FilingDiff:
+    """
+    Chunk-level changes between a filing and the prior quarter's filing.
+    Unchanged chunks are only counted, not stored.
+    """
+
+    ticker: str
+    accession_number: str
+    prior_accession_number: str
+    entries: list[ChunkDiffEntry] = field(default_factory=list)
+    unchanged_count: int = 0
+
+    def of(self, change: ChunkChange) -> list[ChunkDiffEntry]:
+        return [e for e in self.entries if e.change == change]
+
+    @property
+    def changed_sections(self) -> list[str]:
+        return list(dict.fromkeys(e.section_name for e in self.entries))
+
+
+def _section_key(chunk: TenQChunk) -> str:
+    if chunk.section_item:
+        return chunk.section_item.strip().upper()
+    return chunk.section_name.strip().lower()
+
+
+def diff_filings(
+    ticker: str,
+    accession_number: str,
+    current: Sequence[TenQChunk],
+    prior_accession_number: str,
+    prior: Sequence[TenQChunk],
+    *,
+    hasher: Optional[MinHasher] = None,
+    same_threshold: float = 1.0,
+    related_threshold: float = 0.3,
+) -> FilingDiff:
+    """
+    Align chunks of `current` with `prior` section by section (Item number,
+    else section name) and classify them:
+
+      * identical text, or estimated Jaccard >= same_threshold -> unchanged
+      * best prior match >= related_threshold                 -> changed
+      * otherwise                                             -> new
+      * prior chunks no current chunk matched                 -> removed
+
+    same_threshold defaults to 1.0 because a reworded figure ("$3.1bn" ->
+    "$3.4bn") barely moves Jaccard but is exactly what the agent needs.
+
+    Candidates come from an LSH index per section, so alignment cost grows
+    with the number of near matches rather than with |current| x |prior|.
+    """
+    hasher = hasher or MinHasher()
+    diff = FilingDiff(
+        ticker=ticker.upper(),
+        accession_number=accession_number,
+        prior_accession_number=prior_accession_number,
+    )
+
+    # Index the prior filing per section.
+    prior_sigs: list[Signature] = []
+    prior_fps: dict[tuple[str, str], list[int]] = {}
+    prior_lsh: dict[str, LshIndex[int]] = {}
+    for j, chunk in enumerate(prior):
+        key = _section_key(chunk)
+        sig = hasher.signature(chunk.text)
+        prior_sigs.append(sig)
+        prior_fps.setdefault((key, text_fingerprint(chunk.text)), []).append(j)
+        lsh = prior_lsh.get(key)
+        if lsh is None:
+            lsh = prior_lsh[key] = LshIndex(hasher.num_perm, bands=_bands_for(hasher.num_perm))
+        lsh.add(j, sig)
+
+    matched: set[int] = set()
+    for chunk in current:
+        key = _section_key(chunk)
+        exact = prior_fps.get((key, text_fingerprint(chunk.text)))
+        if exact:
+            matched.update(exact)
+            diff.unchanged_count += 1
+            continue
+
+        sig = hasher.signature(chunk.text)
+        best_j: Optional[int] = None
+        best_sim = 0.0
+        lsh = prior_lsh.get(key)
+        if lsh is not None:
+            for j in lsh.query(sig):
+                sim = estimate_jaccard(sig, prior_sigs[j])
+                if sim > best_sim:
+                    best_j, best_sim = j, sim
+
+        if best_j is not None and best_sim >= same_threshold:
+            matched.add(best_j)
+            diff.unchanged_count += 1
+        elif best_j is not None and best_sim >= related_threshold:
+            matched.add(best_j)
+            diff.entries.append(
+                ChunkDiffEntry(
+                    change=ChunkChange.CHANGED,
+                    section_name=chunk.section_name,
+                    section_item=chunk.section_item,
+                    chunk_index=chunk.chunk_index,
+                    text=chunk.text,
+                    prior_chunk_index=prior[best_j].chunk_index,
+                    similarity=round(best_sim, 4),
+                )
+            )
+        else:
+            diff.entries.append(
+                ChunkDiffEntry(
+                    change=ChunkChange.NEW,
+                    section_name=chunk.section_name,
+                    section_item=chunk.section_item,
+                    chunk_index=chunk.chunk_index,
+                    text=chunk.text,
+                )
+            )
+
+    for j, chunk in enumerate(prior):
+        if j not in matched:
+            diff.entries.append(
+                ChunkDiffEntry(
+                    change=ChunkChange.REMOVED,
+                    section_name=chunk.section_name,
+                    section_item=chunk.section_item,
+                    chunk_index=chunk.chunk_index,
+                    text=chunk.text,
+                )
+            )
+
+    return diff
+
+
+def _bands_for(num_perm: int) -> int:
+    # rows of 2 put the LSH candidate threshold well below related_threshold
+    return max(1, num_perm // 2)
+
+
+class ChunkDiffIndex:
+    """
+    Disk-backed store of FilingDiff per (prior, current) accession pair,
+    looked up by the pair or by the current accession.
+
+    Stored at: data/cache/diffs/<TICKER>/<prior>__<current>.json
+    """
+
+    def __init__(self, root: Path = Path("data/cache/diffs")) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _pair_path(self, ticker: str, prior: str, current: str) -> Path:
+        return self.root / ticker.upper() / f"{prior}__{current}.json"
+
+    def put(self, diff: FilingDiff) -> None:
+        path = self._pair_path(diff.ticker, diff.prior_accession_number, diff.accession_number)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(asdict(diff)), encoding="utf-8")
+
+    def get(self, ticker: str, prior: str, current: str) -> Optional[FilingDiff]:
+        path = self._pair_path(ticker, prior, current)
+        if not path.exists():
+            return None
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        entries = [
+            ChunkDiffEntry(**{**e, "change": ChunkChange(e["change"])}) for e in raw.pop("entries")
+        ]
+        return FilingDiff(entries=entries, **raw)
+
+    def get_for(self, ticker: str, accession_number: str) -> Optional[FilingDiff]:
+        """
+        The diff of filing `accession_number` against its prior quarter (the
+        most recently written one, if it was diffed against several).
+        """
+        paths = list((self.root / ticker.upper()).glob(f"*__{accession_number}.json"))
+        if not paths:
+            return None
+        newest = max(paths, key=lambda p: p.stat().st_mtime_ns)
+        prior = newest.name[: -len(f"__{accession_number}.json")]
+        return self.get(ticker, prior, accession_number)
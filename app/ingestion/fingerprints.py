@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Optional
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapse whitespace so reflowed but otherwise identical text hashes equal.
+    """
+    return _WS_RE.sub(" ", text).strip()
+
+
+def text_fingerprint(text: str) -> str:
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def chunk_fingerprint(section_item: Optional[str], section_name: str, text: str) -> str:
+    """
+    Stable identity of a chunk's content within its section. Accession and
+    chunk position are deliberately excluded so unchanged chunks match
+    across an original filing and its amendment even if they shift.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update((section_item or "").encode("utf-8"))
+    h.update(b"\x1f")
+    h.update(section_name.strip().lower().encode("utf-8"))
+    h.update(b"\x1f")
+    h.update(normalize_text(text).encode("utf-8"))
+    return h.hexdigest()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from typing import Generic, Hashable, Iterable, TypeVar
+
+from app.ingestion.fingerprints import normalize_text
+
+_MAX64 = (1 << 64) - 1
+Signature = tuple[int, ...]
+K = TypeVar("K", bound=Hashable)
+
+
+def _h64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles using one-permutation hashing:
+    each shingle is hashed once and routed to one of `num_perm` bins, so
+    cost is linear in the number of shingles rather than shingles x perms.
+    Empty bins are filled from the next non-empty bin (rotation
+    densification). Hashes are content-derived, so signatures are stable
+    across processes and can be persisted.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_words: int = 5) -> None:
+        if num_perm <= 0 or shingle_words <= 0:
+            raise ValueError("num_perm and shingle_words must be positive")
+        self.num_perm = num_perm
+        self.shingle_words = shingle_words
+
+    def shingles(self, text: str) -> set[int]:
+        words = normalize_text(text).lower().split()
+        k = self.shingle_words
+        if len(words) <= k:
+            return {_h64(" ".join(words).encode("utf-8"))} if words else set()
+        return {_h64(" ".join(words[i : i + k]).encode("utf-8")) for i in range(len(words) - k + 1)}
+
+    def signature(self, text: str) -> Signature:
+        n = self.num_perm
+        bins = [_MAX64] * n
+        for h in self.shingles(text):
+            b = h % n
+            v = h // n
+            if v < bins[b]:
+                bins[b] = v
+        if all(v == _MAX64 for v in bins):
+            return tuple(bins)
+        # densify: borrow from the next non-empty bin, offset by distance
+        out = list(bins)
+        for i in range(n):
+            if bins[i] != _MAX64:
+                continue
+            j = 1
+            while bins[(i + j) % n] == _MAX64:
+                j += 1
+            out[i] = (bins[(i + j) % n] + j) & _MAX64
+        return tuple(out)
+
+
+def estimate_jaccard(a: Signature, b: Signature) -> float:
+    if len(a) != len(b):
+        raise ValueError("signatures must have the same length")
+    if not a:
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class LshIndex(Generic[K]):
+    """
+    Banded LSH over MinHash signatures. Items whose signatures agree on
+    every row of at least one band become candidates; with `bands` bands of
+    `rows` rows the match probability crosses 50% near
+    Jaccard ~ (1 / bands) ** (1 / rows).
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: list[dict[Signature, set[K]]] = [defaultdict(set) for _ in range(bands)]
+
+    def _band_keys(self, sig: Signature) -> Iterable[tuple[int, Signature]]:
+        r = self.rows
+        for b in range(self.bands):
+            yield b, sig[b * r : (b + 1) * r]
+
+    def add(self, key: K, sig: Signature) -> None:
+        for b, band in self._band_keys(sig):
+            self._buckets[b][band].add(key)
+
+    def query(self, sig: Signature) -> set[K]:
+        out: set[K] = set()
+        for b, band in self._band_keys(sig):
+            hits = self._buckets[b].get(band)
+            if hits:
+                out |= hits
+        return out
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Collection, Iterable, Literal, Optional, Sequence
+
+from app.agents.dependencies import AgentDependencies
+from app.edgar.metadata_cache import TenQMetadataCache
+from app.edgar.models import TenQMetadata
+from app.edgar.storage import open_text_file
+from app.edgar.submissions import is_amendment_of
+from app.ingestion.boilerplate import BoilerplateReport
+from app.ingestion.diff_index import FilingDiff, diff_filings
+from app.ingestion.fingerprints import chunk_fingerprint
+from app.observability.metrics import EMBEDDED_CHUNKS
+from app.observability.tracing import span
+from app.parsing.models import TenQChunk
+
+if TYPE_CHECKING:
+    from app.parsing.tenq_parser import TenQParser
+
+# on_event(name, data): optional progress hook (see the streaming summaries
+# endpoint). Called synchronously, so it must not block.
+ProgressCallback = Callable[[str, dict[str, Any]], None]
+
+# Per-stage refresh controls, in pipeline order. Stages not named reuse
+# what is cached: SEC metadata, the stored document, vectors of unchanged
+# chunks, the agents' last result.
+RefreshStage = Literal["metadata", "download", "parse", "embed", "agents"]
+REFRESH_STAGES: tuple[RefreshStage, ...] = ("metadata", "download", "parse", "embed", "agents")
+# Any of these re-ingests the filing.
+INGEST_STAGES = frozenset({"download", "parse", "embed"})
+
+
+def refresh_stages(refresh: Iterable[str] = (), *, force_refresh: bool = False) -> frozenset[str]:
+    """
+    Normalize refresh controls; `force_refresh` means every stage.
+    """
+    if force_refresh:
+        return frozenset(REFRESH_STAGES)
+    stages = frozenset(s.lower() for s in refresh)
+    unknown = stages.difference(REFRESH_STAGES)
+    if unknown:
+        raise ValueError(f"Unknown refresh stage(s) {sorted(unknown)}; use {list(REFRESH_STAGES)}")
+    return stages
+
+
+def _stage(on_event: Optional[ProgressCallback], stage: str, started: float, **data: Any) -> None:
+    if on_event is not None:
+        on_event("stage", {"stage": stage, "seconds": round(monotonic() - started, 3), **data})
+
+
+@dataclass
+class IngestionStats:
+    accession_number: str
+    total_chunks: int = 0
+    embedded_chunks: int = 0
+    reused_chunks: int = 0
+    base_accession: Optional[str] = None
+    changed_sections: list[str] = field(default_factory=list)
+    prior_diff: Optional[FilingDiff] = None
+    boilerplate: Optional[BoilerplateReport] = None
+
+
+async def embed_and_upsert(
+    deps: AgentDependencies,
+    chunks: Sequence[TenQChunk],
+    meta: TenQMetadata,
+    *,
+    base_accession: Optional[str] = None,
+) -> IngestionStats:
+    """
+    Embed and upsert `chunks` for `meta`, replacing whatever is stored
+    for its accession. When `base_accession` (the original 10-Q an
+    amendment replaces, or the filing itself when re-parsing) is already
+    stored, chunks whose fingerprint matches a stored chunk reuse its
+    vector; only changed or new chunks are sent to the embedding service.
+    An amendment supersedes its original: once it is stored, the original
+    accession's chunks are deleted so retrieval doesn't see them twice.
+    """
+    stats = IngestionStats(
+        accession_number=meta.accession_number,
+        total_chunks=len(chunks),
+        base_accession=base_accession,
+    )
+
+    reusable: dict[str, list[float]] = {}
+    if base_accession:
+        stored = await deps.vector_store.get_accession_chunks(meta.ticker, base_accession)
+        for old, emb in stored:
+            fp = chunk_fingerprint(old.section_item, old.section_name, old.text)
+            reusable[fp] = emb
+
+    vectors: dict[int, list[float]] = {}
+    missing: list[int] = []
+    changed_sections: dict[str, None] = {}
+    for i, chunk in enumerate(chunks):
+        vector = reusable.get(chunk_fingerprint(chunk.section_item, chunk.section_name, chunk.text))
+        if vector is None:
+            missing.append(i)
+            changed_sections[chunk.section_name] = None
+        else:
+            vectors[i] = vector
+
+    if missing:
+        with span("embed_many", chunks=len(missing)):
+            fresh = await deps.embeddings.embed_many([chunks[i].text for i in missing])
+        vectors.update(zip(missing, fresh, strict=True))
+    embeddings = [vectors[i] for i in range(len(chunks))]
+    EMBEDDED_CHUNKS.inc(len(missing), result="embedded")
+    EMBEDDED_CHUNKS.inc(len(chunks) - len(missing), result="reused")
+
+    with span("upsert", chunks=len(chunks)):
+        if await deps.vector_store.has_accession(meta.ticker, meta.accession_number):
+            await deps.vector_store.delete_accession(meta.ticker, meta.accession_number)
+        await deps.vector_store.upsert_chunks(chunks, embeddings)
+        if base_accession and base_accession != meta.accession_number:
+            await deps.vector_store.delete_accession(meta.ticker, base_accession)
+
+    stats.embedded_chunks = len(missing)
+    stats.reused_chunks = len(chunks) - len(missing)
+    stats.changed_sections = list(changed_sections)
+    return stats
+
+
+async def diff_against_prior(
+    deps: AgentDependencies,
+    chunks: Sequence[TenQChunk],
+    meta: TenQMetadata,
+    prior_accession: str,
+) -> Optional[FilingDiff]:
+    """
+    Diff a freshly parsed filing against the prior quarter's stored chunks
+    and persist the result in the diff index. Returns None when there is no
+    diff index or the prior filing isn't stored.
+
+    Boilerplate is left out on both sides. The prior filing was filtered
+    against a smaller corpus, so its stored chunks are re-checked against
+    the detector's current state; otherwise text kept last quarter and
+    dropped this quarter would show up as removed.
+    """
+    if deps.diff_index is None:
+        return None
+    stored = await deps.vector_store.get_accession_chunks(meta.ticker, prior_accession)
+    if not stored:
+        return None
+    prior = [chunk for chunk, _ in stored]
+    if deps.boilerplate is not None and deps.boilerplate.mode != "off":
+        flags = deps.boilerplate.flag([c.text for c in prior], meta.cik)
+        prior = [c for c, boilerplate in zip(prior, flags) if not boilerplate]
+        # Tag mode keeps flagged chunks in the filing; drop mode removed them.
+        chunks = [c for c in chunks if not c.is_boilerplate]
+    diff = diff_filings(meta.ticker, meta.accession_number, chunks, prior_accession, prior)
+    deps.diff_index.put(diff)
+    return diff
+
+
+def parse_stored_filing(parser: TenQParser, path: Path, meta: TenQMetadata) -> Sequence[TenQChunk]:
+    """
+    Parse a downloaded filing from local storage. A plain function so it can
+    be shipped to a worker thread or process.
+    """
+    with open_text_file(path) as stream:
+        return parser.parse_stream(stream, meta)
+
+
+async def ingest_parsed(
+    deps: AgentDependencies,
+    chunks: Sequence[TenQChunk],
+    meta: TenQMetadata,
+    *,
+    base_accession: Optional[str] = None,
+    prior_accession: Optional[str] = None,
+    on_event: Optional[ProgressCallback] = None,
+) -> IngestionStats:
+    """
+    Boilerplate-filter, embed and upsert already parsed chunks, then diff
+    against the prior quarter when `prior_accession` is given.
+    """
+    # Boilerplate is dropped (or tagged) before it costs an embedding call.
+    report: Optional[BoilerplateReport] = None
+    if deps.boilerplate is not None:
+        started = monotonic()
+        with span("boilerplate"):
+            chunks, report = deps.boilerplate.apply(chunks, meta.accession_number, meta.cik)
+        _stage(on_event, "boilerplate", started, chunks=len(chunks))
+
+    started = monotonic()
+    with span("embed", chunks=len(chunks)) as embed_span:
+        stats = await embed_and_upsert(deps, chunks, meta, base_accession=base_accession)
+        embed_span.set(embedded=stats.embedded_chunks)
+    stats.boilerplate = report
+    _stage(on_event, "embed", started, chunks=stats.total_chunks, embedded=stats.embedded_chunks)
+    if prior_accession and prior_accession != meta.accession_number:
+        started = monotonic()
+        with span("diff"):
+            stats.prior_diff = await diff_against_prior(deps, chunks, meta, prior_accession)
+        _stage(on_event, "diff", started)
+    return stats
+
+
+async def ingest_tenq(
+    deps: AgentDependencies,
+    meta: TenQMetadata,
+    *,
+    base_accession: Optional[str] = None,
+    prior_accession: Optional[str] = None,
+    redownload: bool = False,
+    on_event: Optional[ProgressCallback] = None,
+) -> IngestionStats:
+    """
+    Download, parse, embed and upsert one 10-Q.
+
+    `base_accession` enables vector reuse for amendments; `prior_accession`
+    (the previous quarter's filing) enables the quarter-over-quarter diff.
+    A stored document is reused unless `redownload`.
+    `on_event` receives a "stage" event with the timing of each step.
+    """
+    started = monotonic()
+    with span("download", accession_number=meta.accession_number):
+        if redownload:
+            rel_path = await deps.filing_downloader.download_primary_html(meta, force=True)
+        else:
+            rel_path = await deps.filing_downloader.download_primary_html(meta)
+    _stage(on_event, "download", started)
+    started = monotonic()
+    with span("parse", accession_number=meta.accession_number) as parse_span:
+        chunks = parse_stored_filing(deps.tenq_parser, Path("data") / rel_path, meta)
+        parse_span.set(chunks=len(chunks))
+    _stage(on_event, "parse", started, chunks=len(chunks))
+    return await ingest_parsed(
+        deps,
+        chunks,
+        meta,
+        base_accession=base_accession,
+        prior_accession=prior_accession,
+        on_event=on_event,
+    )
+
+
+def _at_least_as_recent(meta: TenQMetadata, latest: Any) -> bool:
+    # Period first, then filing date, so an amendment counts as newer.
+    return (meta.period_of_report or date.min, meta.filing_date) >= (
+        latest.period_of_report or date.min,
+        latest.filing_date,
+    )
+
+
+async def refresh_latest_tenq(
+    deps: AgentDependencies,
+    ticker: str,
+    cache: TenQMetadataCache,
+    *,
+    filing_period: Optional[date] = None,
+    force_refresh: bool = False,
+    refresh: Collection[str] = (),
+    on_event: Optional[ProgressCallback] = None,
+) -> tuple[TenQMetadata, Optional[IngestionStats]]:
+    """
+    Ask SEC for the ticker's latest (or `filing_period`) 10-Q and ingest it
+    unless the cached metadata already matches and it is in the vector
+    store. Returns the metadata and, when ingestion ran, its stats.
+
+    `refresh` names stages to redo (see REFRESH_STAGES): download, parse
+    or embed re-ingest the filing even if it is stored, and without
+    "metadata" the cached filing metadata is used instead of asking SEC.
+    `force_refresh` redoes every stage. A `filing_period` older than the
+    cached latest filing is ingested without becoming the latest.
+    """
+    ticker_norm = ticker.upper()
+    stages = refresh_stages(refresh, force_refresh=force_refresh)
+    reingest = bool(stages & INGEST_STAGES)
+    cached_latest = cache.get_latest(ticker_norm)
+    tenq_meta: Optional[TenQMetadata] = None
+    if (
+        reingest
+        and "metadata" not in stages
+        and cached_latest
+        and (filing_period is None or filing_period == cached_latest.period_of_report)
+    ):
+        tenq_meta = cached_latest.to_tenq(ticker_norm)
+
+    if tenq_meta is None:
+        started = monotonic()
+
+        # Resolve ticker -> CIK (may hit SEC if resolver TTL expired)
+        with span("cik_lookup"):
+            cik_info = await deps.cik_resolver.resolve(ticker_norm)
+
+        with span("submissions_fetch", cik=cik_info.cik_str):
+            # Fetch submissions (SEC call)
+            subs = await deps.submissions.fetch_submissions(cik_info.cik_str)
+
+            # Select latest 10-Q
+            tenq_meta = deps.submissions.select_latest_10q(subs, target_period=filing_period)
+            if tenq_meta is None and filing_period is not None:
+                # Older quarters live in paginated history; fetched only now.
+                tenq_meta = await deps.submissions.select_10q_for_period(subs, filing_period)
+        if tenq_meta is None:
+            raise RuntimeError(f"No 10-Q found for ticker {ticker_norm}")
+        _stage(on_event, "sec_check", started, accession_number=tenq_meta.accession_number)
+
+    # -------- Stage B: compare metadata to decide re-ingest --------
+    # A requested past period is not the cached latest; being stored is enough.
+    unchanged = cached_latest is not None and cached_latest.matches(tenq_meta)
+    if not reingest and (unchanged or filing_period is not None):
+        already_ingested = await deps.vector_store.has_accession(
+            ticker_norm, tenq_meta.accession_number
+        )
+        if already_ingested:
+            # Skip download/parse/embed
+            if unchanged:
+                cache.touch(ticker_norm)
+            if on_event is not None:
+                on_event("ingest", {"status": "unchanged"})
+            return tenq_meta, None
+
+    # -------- Ingest because it's new or missing --------
+    # An amendment (10-Q/A) for the cached period is diffed against the
+    # original accession so only changed chunks are re-embedded.
+    # A filing for a later period is diffed against the cached (prior
+    # quarter) accession to power changed_since_prior.
+    base_accession = None
+    prior_accession = None
+    if cached_latest and cached_latest.accession_number != tenq_meta.accession_number:
+        if is_amendment_of(tenq_meta, cached_latest):
+            base_accession = cached_latest.accession_number
+        elif (
+            cached_latest.period_of_report
+            and tenq_meta.period_of_report
+            and cached_latest.period_of_report < tenq_meta.period_of_report
+        ):
+            prior_accession = cached_latest.accession_number
+    if "embed" in stages:
+        base_accession = None
+    elif base_accession is None and await deps.vector_store.has_accession(
+        ticker_norm, tenq_meta.accession_number
+    ):
+        # Re-download / re-parse of a stored filing: unchanged chunks keep
+        # their vectors.
+        base_accession = tenq_meta.accession_number
+
+    stats = await ingest_tenq(
+        deps,
+        tenq_meta,
+        base_accession=base_accession,
+        prior_accession=prior_accession,
+        redownload="download" in stages,
+        on_event=on_event,
+    )
+
+    # Update cache to new "latest", unless an older period was requested
+    if (
+        filing_period is None
+        or cached_latest is None
+        or _at_least_as_recent(tenq_meta, cached_latest)
+    ):
+        cache.set_latest(ticker_norm, tenq_meta)
+    return tenq_meta, stats
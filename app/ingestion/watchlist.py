@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional, Sequence
+
+from app.agents.dependencies import AgentDependencies
+from app.edgar.metadata_cache import TenQMetadataCache
+from app.ingestion.pipeline import refresh_latest_tenq
+
+
+@dataclass
+class WatchlistReport:
+    indexed_filings: int = 0  # new form-index entries from this refresh
+    up_to_date: list[str] = field(default_factory=list)
+    refreshed: list[str] = field(default_factory=list)  # new 10-Q ingested
+    unchanged: list[str] = field(default_factory=list)  # checked with SEC, nothing new
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+async def refresh_watchlist(
+    deps: AgentDependencies,
+    tickers: Sequence[str],
+    *,
+    cache: Optional[TenQMetadataCache] = None,
+    today: Optional[date] = None,
+    concurrency: int = 4,
+) -> WatchlistReport:
+    """
+    Bring the latest-10-Q cache up to date for a watchlist using the EDGAR
+    daily form index: one index fetch per new business day, then a
+    submissions call + ingestion only for tickers whose CIK shows a 10-Q
+    filed after the cached one (and for tickers not cached yet).
+    """
+    if deps.form_index is None:
+        raise RuntimeError("refresh_watchlist needs deps.form_index")
+    cache = cache or TenQMetadataCache()
+    report = WatchlistReport()
+    report.indexed_filings = len(await deps.form_index.refresh(today))
+
+    stale: list[str] = []
+    for ticker in dict.fromkeys(t.strip().upper() for t in tickers if t.strip()):
+        cached = cache.get_latest(ticker)
+        if cached is not None and not deps.form_index.has_newer(
+            int(cached.cik), cached.filing_date
+        ):
+            report.up_to_date.append(ticker)
+        else:
+            stale.append(ticker)
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def refresh(ticker: str) -> None:
+        try:
+            async with sem:
+                _, stats = await refresh_latest_tenq(deps, ticker, cache)
+        except Exception as exc:
+            report.failed[ticker] = repr(exc)
+            return
+        (report.refreshed if stats is not None else report.unchanged).append(ticker)
+
+    await asyncio.gather(*(refresh(t) for t in stale))
+    return report
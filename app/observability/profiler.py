@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Optional
+
+# Leaf frames of threads that are parked rather than working: the event
+# loop waiting in select, pool threads waiting for work. Counted as idle
+# instead of cluttering the flamegraph.
+_IDLE_LEAVES = {
+    # uvloop's loop is C: with no Python callback running, Runner.run is the leaf.
+    ("asyncio.runners", "Runner.run"),
+    ("selectors", "EpollSelector.select"),
+    ("selectors", "_PollLikeSelector.select"),
+    ("selectors", "KqueueSelector.select"),
+    ("selectors", "SelectSelector.select"),
+    ("threading", "Condition.wait"),
+    ("threading", "Thread._wait_for_tstate_lock"),
+    ("concurrent.futures.thread", "_worker"),
+}
+
+_session: ContextVar[Optional["ProfileSession"]] = ContextVar("sec10q_profile", default=None)
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class ProfileSession:
+    """
+    Stack samples collected while one request (or any other block) runs,
+    plus the tags it is filed under (ticker, accession_number, ...).
+    """
+
+    def __init__(self, tags: dict[str, Any]) -> None:
+        self.tags = dict(tags)
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.idle = 0
+        self.started_at = time.time()
+        self.seconds = 0.0
+        self._started = time.perf_counter()
+
+    def tag(self, **tags: Any) -> None:
+        self.tags.update({k: v for k, v in tags.items() if v is not None})
+
+    def folded(self) -> str:
+        """
+        Brendan Gregg's folded-stack format ("root;caller;callee count"),
+        readable by flamegraph.pl, speedscope and inferno.
+        """
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+class SamplingProfiler:
+    """
+    Low-overhead wall-clock sampler: while at least one session is open, a
+    daemon thread reads every other thread's Python stack every
+    `interval_seconds` (sys._current_frames) and adds it to each open
+    session. That covers the event loop and any parse / embed worker
+    threads; code in worker *processes* is not visible. Nothing runs while
+    no session is open.
+
+    Stacks are process-wide: a request's profile also shows whatever
+    concurrent requests were doing on the same loop.
+    """
+
+    def __init__(self, interval_seconds: float = 0.01) -> None:
+        self.interval_seconds = interval_seconds
+        self._sessions: list[ProfileSession] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._labels: dict[CodeType, str] = {}
+
+    def start(self, **tags: Any) -> ProfileSession:
+        session = ProfileSession(tags)
+        with self._lock:
+            self._sessions.append(session)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sec10q-profiler", daemon=True
+                )
+                self._thread.start()
+        return session
+
+    def stop(self, session: ProfileSession) -> ProfileSession:
+        session.seconds = time.perf_counter() - session._started
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        return session
+
+    def _label(self, frame: FrameType) -> str:
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            module = frame.f_globals.get("__name__", "?")
+            label = self._labels[code] = f"{module}:{code.co_qualname}".replace(";", ",")
+        return label
+
+    def _sample(self) -> tuple[list[str], int]:
+        me = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks: list[str] = []
+        idle = 0
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            leaf = frame.f_code
+            if (frame.f_globals.get("__name__"), leaf.co_qualname) in _IDLE_LEAVES:
+                idle += 1
+                continue
+            labels: list[str] = []
+            current: Optional[FrameType] = frame
+            while current is not None:
+                labels.append(self._label(current))
+                current = current.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            stacks.append(";".join(reversed(labels)))
+        return stacks, idle
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                sessions = list(self._sessions)
+                if not sessions:
+                    self._thread = None
+                    return
+            stacks, idle = self._sample()
+            for session in sessions:
+                session.samples += 1
+                session.idle += idle
+                session.stacks.update(stacks)
+            time.sleep(self.interval_seconds)
+
+
+def current_session() -> Optional[ProfileSession]:
+    return _session.get()
+
+
+def activate(session: Optional[ProfileSession]) -> Any:
+    """
+    Make `session` the one tag_profile() reaches from this context (and
+    tasks started from it). Returns a token for deactivate().
+    """
+    return _session.set(session)
+
+
+def deactivate(token: Any) -> None:
+    _session.reset(token)
+
+
+def tag_profile(**tags: Any) -> None:
+    """
+    Tag the profile of the current request, if it is being profiled.
+    """
+    session = _session.get()
+    if session is not None:
+        session.tag(**tags)
+
+
+def write_profile(session: ProfileSession, directory: Path, *, max_files: int = 0) -> Path:
+    """
+    Write `session` as <time>-<ticker>-<accession>-<request id>.folded
+    plus a .json sidecar with its tags and sample counts; with `max_files`,
+    the oldest profiles beyond that many are removed.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.fromtimestamp(session.started_at, timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    parts = [
+        stamp,
+        str(session.tags.get("ticker") or "na"),
+        str(session.tags.get("accession_number") or "na"),
+        str(session.tags.get("request_id") or "na"),
+    ]
+    stem = _UNSAFE.sub("_", "-".join(parts))
+    path = directory / f"{stem}.folded"
+    path.write_text(session.folded(), encoding="utf-8")
+    meta = {
+        "tags": session.tags,
+        "started_at": session.started_at,
+        "seconds": round(session.seconds, 3),
+        "samples": session.samples,
+        "idle_thread_samples": session.idle,
+    }
+    path.with_suffix(".json").write_text(json.dumps(meta, default=str, indent=2), encoding="utf-8")
+
+    if max_files > 0:
+        profiles = sorted(directory.glob("*.folded"))
+        for old in profiles[: max(0, len(profiles) - max_files)]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".json").unlink(missing_ok=True)
+    return path
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Iterator, Optional
+
+import structlog
+
+from app.observability.metrics import STAGE_ERRORS, STAGE_SECONDS
+
+logger = structlog.get_logger("sec10q")
+
+# Stage -> total seconds for the current API request (see request_timings).
+_timings: ContextVar[Optional[dict[str, float]]] = ContextVar("sec10q_timings", default=None)
+_current: ContextVar[Optional["Span"]] = ContextVar("sec10q_span", default=None)
+
+
+def configure_logging(level: str = "info", fmt: str = "json") -> None:
+    """
+    structlog with contextvars (request_id, ticker, ...) merged into every
+    line; JSON lines for log shipping, or fmt="console" locally.
+    """
+    renderer: Any = (
+        structlog.dev.ConsoleRenderer() if fmt == "console" else structlog.processors.JSONRenderer()
+    )
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.processors.format_exc_info,
+            renderer,
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(level.upper())),
+        logger_factory=structlog.PrintLoggerFactory(),
+        # False so the app can reconfigure after module-level loggers were used.
+        cache_logger_on_first_use=False,
+    )
+
+
+if not structlog.is_configured():
+    # Until the app configures it from settings: info level, so span lines
+    # (debug) don't flood CLI tools and tests.
+    configure_logging()
+
+
+@contextmanager
+def request_timings() -> Iterator[dict[str, float]]:
+    """
+    Collect the total seconds per span name for everything run inside the
+    block, including tasks it starts (they inherit the context).
+    """
+    timings: dict[str, float] = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+class Span:
+    def __init__(self, name: str, fields: dict[str, Any], parent: Optional["Span"]) -> None:
+        self.name = name
+        self.fields = fields
+        self.parent = parent
+        self.started = perf_counter()
+        self.seconds = 0.0
+
+    def set(self, **fields: Any) -> None:
+        """
+        Attach more fields (e.g. a chunk count known only at the end).
+        """
+        self.fields.update(fields)
+
+
+@contextmanager
+def span(name: str, **fields: Any) -> Iterator[Span]:
+    """
+    Time a pipeline stage: observed in sec10q_stage_duration_seconds (and
+    sec10q_stage_errors_total when it raises), added to the request's
+    timings and logged at debug level with its parent span and `fields`.
+    """
+    current = Span(name, fields, _current.get())
+    token = _current.set(current)
+    error: Optional[Exception] = None
+    try:
+        yield current
+    except Exception as exc:
+        error = exc
+        raise
+    finally:
+        _current.reset(token)
+        current.seconds = perf_counter() - current.started
+        STAGE_SECONDS.observe(current.seconds, stage=name)
+        timings = _timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + current.seconds
+        if error is not None:
+            STAGE_ERRORS.inc(stage=name)
+        logger.debug(
+            "span",
+            span=name,
+            parent=current.parent.name if current.parent else None,
+            duration_ms=round(current.seconds * 1000, 2),
+            error=repr(error) if error is not None else None,
+            **current.fields,
+        )
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterator, Optional, Sequence, overload
+
+from app.edgar.models import TenQMetadata
+from app.parsing.chunking import ChunkSpan
+from app.parsing.models import TenQChunk, TenQSection
+
+
+class ChunkTable(Sequence[TenQChunk]):
+    """
+    Compact, column-oriented chunk storage for one filing.
+
+    Holds a single metadata row and each section's text once; chunks are
+    parallel int arrays (section id, chunk index, start, end) pointing into
+    those texts. `TenQChunk` objects and chunk strings are only materialized
+    on access, so per-chunk overhead is a few bytes and overlapping chunk
+    text is never duplicated.
+    """
+
+    __slots__ = (
+        "metadata",
+        "_section_names",
+        "_section_items",
+        "_section_texts",
+        "_section_ids",
+        "_chunk_indexes",
+        "_starts",
+        "_ends",
+        "_flags",
+    )
+
+    def __init__(self, metadata: TenQMetadata) -> None:
+        self.metadata = metadata
+        self._section_names: list[str] = []
+        self._section_items: list[Optional[str]] = []
+        self._section_texts: list[str] = []
+        self._section_ids = array("I")
+        self._chunk_indexes = array("I")
+        self._starts = array("Q")
+        self._ends = array("Q")
+        self._flags = bytearray()  # 1 = boilerplate
+
+    def add_section(self, section: TenQSection, spans: Sequence[ChunkSpan]) -> None:
+        section_id = len(self._section_texts)
+        self._section_names.append(section.name)
+        self._section_items.append(section.item_number)
+        self._section_texts.append(section.text)
+        for idx, span in enumerate(spans):
+            self._section_ids.append(section_id)
+            self._chunk_indexes.append(idx)
+            self._starts.append(span.start)
+            self._ends.append(span.end)
+            self._flags.append(0)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @overload
+    def __getitem__(self, i: int) -> TenQChunk: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[TenQChunk]: ...
+
+    def __getitem__(self, i: int | slice) -> TenQChunk | list[TenQChunk]:
+        if isinstance(i, slice):
+            return [self._chunk(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("chunk index out of range")
+        return self._chunk(i)
+
+    def __iter__(self) -> Iterator[TenQChunk]:
+        for i in range(len(self)):
+            yield self._chunk(i)
+
+    def _chunk(self, i: int) -> TenQChunk:
+        sid = self._section_ids[i]
+        return TenQChunk(
+            section_name=self._section_names[sid],
+            section_item=self._section_items[sid],
+            chunk_index=self._chunk_indexes[i],
+            text=self.text(i),
+            metadata=self.metadata,
+            is_boilerplate=bool(self._flags[i]),
+        )
+
+    # Column accessors: read one field without building a TenQChunk.
+
+    def text(self, i: int, max_chars: Optional[int] = None) -> str:
+        start = self._starts[i]
+        end = self._ends[i]
+        if max_chars is not None:
+            end = min(end, start + max_chars)
+        return self._section_texts[self._section_ids[i]][start:end]
+
+    def texts(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self.text(i)
+
+    def section_name(self, i: int) -> str:
+        return self._section_names[self._section_ids[i]]
+
+    def section_item(self, i: int) -> Optional[str]:
+        return self._section_items[self._section_ids[i]]
+
+    def chunk_index(self, i: int) -> int:
+        return self._chunk_indexes[i]
+
+    def is_boilerplate(self, i: int) -> bool:
+        return bool(self._flags[i])
+
+    def mark_boilerplate(self, i: int) -> None:
+        self._flags[i] = 1
+
+    def select(self, indices: Sequence[int]) -> ChunkTable:
+        """
+        New table with only the given rows; section texts are shared, not copied.
+        """
+        out = ChunkTable(self.metadata)
+        out._section_names = self._section_names
+        out._section_items = self._section_items
+        out._section_texts = self._section_texts
+        for i in indices:
+            out._section_ids.append(self._section_ids[i])
+            out._chunk_indexes.append(self._chunk_indexes[i])
+            out._starts.append(self._starts[i])
+            out._ends.append(self._ends[i])
+            out._flags.append(self._flags[i])
+        return out
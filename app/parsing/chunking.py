@@ -1,9 +1,172 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import math
+from dataclasses import dataclass
+from typing import List
 
 from app.parsing.models import TenQSection, TenQChunk
 
+# Rough chars-per-token ratio for English filing prose (OpenAI tokenizers land ~4).
+CHARS_PER_TOKEN = 4.0
+
+# Sentence terminators paired with how far past the match the sentence ends.
+# Blank lines (paragraph breaks) also end a sentence.
+_SENTENCE_BREAKS: tuple[tuple[str, int], ...] = (
+    (". ", 1),
+    ("? ", 1),
+    ("! ", 1),
+    (".\n", 1),
+    ("?\n", 1),
+    ("!\n", 1),
+    ("\n\n", 0),
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate from character length; avoids a tokenizer dependency.
+    """
+    return span_tokens(0, len(text))
+
+
+def span_tokens(start: int, end: int) -> int:
+    if end <= start:
+        return 0
+    return math.ceil((end - start) / CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkSpan:
+    """
+    A chunk as (start, end) offsets into its section text. No text is copied
+    until `text_of` is called.
+    """
+
+    start: int
+    end: int
+    tokens: int
+
+    def text_of(self, source: str) -> str:
+        return source[self.start : self.end]
+
+
+# Sentence ends are looked for in this many trailing chars of the budget
+# first; only a window with no boundary there is searched in full.
+_TAIL_CHARS = 512
+
+
+def _last_sentence_end(text: str, start: int, limit: int) -> int:
+    """
+    Offset just past the last sentence terminator in text[start:limit], or -1.
+    """
+    lo = max(start, limit - _TAIL_CHARS)
+    while True:
+        best = -1
+        for pattern, shift in _SENTENCE_BREAKS:
+            pos = text.rfind(pattern, lo, limit)
+            if pos > start and pos + shift > best:
+                best = pos + shift
+        if best != -1 or lo == start:
+            return best
+        lo = start
+
+
+def _first_sentence_start(text: str, lo: int, hi: int) -> int:
+    """
+    Offset of the first sentence that begins inside text[lo:hi], or -1.
+    """
+    best = -1
+    for pattern, shift in _SENTENCE_BREAKS:
+        pos = text.find(pattern, lo, hi)
+        if pos != -1 and (best == -1 or pos + shift < best):
+            best = pos + shift
+    return best
+
+
+def _skip_ws(text: str, pos: int, end: int) -> int:
+    while pos < end and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _rstrip_ws(text: str, start: int, end: int) -> int:
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def token_chunk_spans(
+    text: str,
+    max_tokens: int = 512,
+    overlap_tokens: int = 64,
+) -> List[ChunkSpan]:
+    """
+    Cut `text` into spans of at most ~max_tokens estimated tokens, breaking
+    at the last sentence boundary inside the budget. Each new span restarts
+    at the first sentence boundary within the trailing overlap_tokens of the
+    previous one. Boundary search is done with str.find/rfind over offsets,
+    so the cost is per chunk rather than per sentence or per character.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError("overlap_tokens must be >= 0 and < max_tokens")
+
+    budget = max(1, int(max_tokens * CHARS_PER_TOKEN))
+    overlap = int(overlap_tokens * CHARS_PER_TOKEN)
+    n = len(text)
+
+    spans: list[ChunkSpan] = []
+    start = _skip_ws(text, 0, n)
+    while start < n:
+        limit = start + budget
+        if limit >= n:
+            end = _rstrip_ws(text, start, n)
+            spans.append(ChunkSpan(start, end, span_tokens(start, end)))
+            break
+
+        cut = _last_sentence_end(text, start, limit)
+        if cut == -1:
+            # No sentence boundary within budget (e.g. a flattened table):
+            # fall back to the last line break or space, then a hard split.
+            cut = max(text.rfind("\n", start + 1, limit), text.rfind(" ", start + 1, limit))
+            if cut == -1:
+                cut = limit
+        end = _rstrip_ws(text, start, cut)
+        spans.append(ChunkSpan(start, end, span_tokens(start, end)))
+
+        nxt = cut
+        if overlap:
+            lo = max(cut - overlap, start + 1)
+            sentence_start = _first_sentence_start(text, lo, cut)
+            if sentence_start != -1:
+                nxt = sentence_start
+        start = _skip_ws(text, nxt, n)
+
+    return spans
+
+
+def token_chunker(
+    section: TenQSection,
+    max_tokens: int = 512,
+    overlap_tokens: int = 64,
+) -> List[TenQChunk]:
+    """
+    Token-budgeted, sentence-aligned chunking over section offsets.
+    Strings are sliced once per emitted chunk; nothing is concatenated.
+    """
+    text = section.text
+    return [
+        TenQChunk(
+            section_name=section.name,
+            section_item=section.item_number,
+            chunk_index=idx,
+            text=span.text_of(text),
+            metadata=section.metadata,
+        )
+        for idx, span in enumerate(token_chunk_spans(text, max_tokens, overlap_tokens))
+    ]
+
 
 def simple_paragraph_chunker(
     section: TenQSection,
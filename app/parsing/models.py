@@ -6,7 +6,7 @@ from typing import Optional
 from app.edgar.models import TenQMetadata
 
 
-@dataclass
+@dataclass(slots=True)
 class TenQSection:
     name: str
     item_number: Optional[str]
@@ -15,10 +15,12 @@ class TenQSection:
     metadata: TenQMetadata
 
 
-@dataclass
+@dataclass(slots=True)
 class TenQChunk:
     section_name: str
     section_item: Optional[str]
     chunk_index: int
     text: str
     metadata: TenQMetadata
+    # Set by ingestion when near-duplicates recur across many filings.
+    is_boilerplate: bool = False
@@ -1,14 +1,13 @@
 from __future__ import annotations
 
 import re
-from typing import List
-
-from bs4 import BeautifulSoup  # add beautifulsoup4 to deps
+from html.parser import HTMLParser
+from typing import Callable, Iterable, Iterator, Sequence, TextIO
 
 from app.edgar.models import TenQMetadata
-from app.parsing.chunking import simple_paragraph_chunker
-from app.parsing.models import TenQSection, TenQChunk
-
+from app.parsing.chunk_table import ChunkTable
+from app.parsing.chunking import ChunkSpan, token_chunk_spans
+from app.parsing.models import TenQSection
 
 ITEM_HEADING_RE = re.compile(r"item\s+(\d+[A-Z]?)\.\s*(.+)", re.IGNORECASE)
 
@@ -18,39 +17,68 @@ class TenQParser:
     Parse 10-Q HTML into logical sections and chunks.
 
     v1 implementation uses heading heuristics only; you can refine this over time.
+    Chunking is pluggable: `span_chunker` maps section text to chunk offsets
+    (default: the token-budgeted sentence chunker). Chunks come back as a
+    compact ChunkTable that materializes TenQChunk objects on access.
     """
 
-    def parse_html(self, html: str, metadata: TenQMetadata) -> List[TenQChunk]:
+    def __init__(
+        self,
+        span_chunker: Callable[[str], Sequence[ChunkSpan]] = token_chunk_spans,
+    ) -> None:
+        self._span_chunker = span_chunker
+
+    def parse_html(self, html: str, metadata: TenQMetadata) -> ChunkTable:
+        from bs4 import BeautifulSoup  # deferred: only this fallback path needs it
+
         soup = BeautifulSoup(html, "html.parser")
 
         # convert to plaintext but keep some structure
         text = soup.get_text(separator="\n")
-        lines = [l.strip() for l in text.splitlines()]
-
-        sections: list[TenQSection] = []
+        return self._build_table(text.splitlines(), metadata)
+
+    def parse_stream(
+        self,
+        stream: TextIO,
+        metadata: TenQMetadata,
+        chunk_size: int = 1 << 16,
+    ) -> ChunkTable:
+        """
+        Like parse_html, but reads the document incrementally from a text
+        stream with a SAX-style extractor instead of building a DOM, so peak
+        memory is one read buffer plus the extracted section text.
+        """
+        return self._build_table(iter_html_text_lines(stream, chunk_size), metadata)
+
+    def _build_table(self, raw_lines: Iterable[str], metadata: TenQMetadata) -> ChunkTable:
+        table = ChunkTable(metadata)
         current_lines: list[str] = []
         current_name = "Unknown"
         current_item: str | None = None
         order_index = 0
 
-        for line in lines:
+        def flush() -> None:
+            nonlocal order_index, current_lines
+            section = TenQSection(
+                name=current_name,
+                item_number=current_item,
+                order_index=order_index,
+                text="\n".join(current_lines),
+                metadata=metadata,
+            )
+            table.add_section(section, self._span_chunker(section.text))
+            order_index += 1
+            current_lines = []
+
+        for raw in raw_lines:
+            line = raw.strip()
             if not line:
                 continue
             m = ITEM_HEADING_RE.match(line)
             if m:
                 # flush previous
                 if current_lines:
-                    sections.append(
-                        TenQSection(
-                            name=current_name,
-                            item_number=current_item,
-                            order_index=order_index,
-                            text="\n".join(current_lines),
-                            metadata=metadata,
-                        )
-                    )
-                    order_index += 1
-                    current_lines = []
+                    flush()
 
                 current_item = m.group(1)
                 current_name = m.group(2)
@@ -58,18 +86,65 @@ class TenQParser:
                 current_lines.append(line)
 
         if current_lines:
-            sections.append(
-                TenQSection(
-                    name=current_name,
-                    item_number=current_item,
-                    order_index=order_index,
-                    text="\n".join(current_lines),
-                    metadata=metadata,
-                )
-            )
+            flush()
+
+        return table
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Collects text nodes (skipping script/style), mirroring
+    BeautifulSoup.get_text(separator="\n"). HTMLParser may deliver one
+    text node in several pieces across feed() calls, so pieces are
+    buffered until the next tag closes the node.
+    """
+
+    _SKIP = {"script", "style", "template"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.nodes: list[str] = []
+        self._pending: list[str] = []
+        self._skip_depth = 0
+
+    def _end_node(self) -> None:
+        if self._pending:
+            self.nodes.append("".join(self._pending))
+            self._pending = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._end_node()
+        if tag in self._SKIP:
+            self._skip_depth += 1
 
-        chunks: list[TenQChunk] = []
-        for section in sections:
-            chunks.extend(simple_paragraph_chunker(section))
+    def handle_endtag(self, tag: str) -> None:
+        self._end_node()
+        if tag in self._SKIP and self._skip_depth:
+            self._skip_depth -= 1
 
-        return chunks
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._pending.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._end_node()
+
+
+def iter_html_text_lines(stream: TextIO, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """
+    Yield text lines of an HTML document read from `stream` in chunks.
+    """
+    extractor = _TextExtractor()
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        extractor.feed(block)
+        if extractor.nodes:
+            nodes, extractor.nodes = extractor.nodes, []
+            for node in nodes:
+                yield from node.splitlines()
+    extractor.close()
+    for node in extractor.nodes:
+        yield from node.splitlines()
@@ -33,9 +33,15 @@ class VectorStore(Protocol):
         ticker: str | None = None,
         cik: str | None = None,
         section_name: str | None = None,
+        accession_number: str | None = None,
+        exclude_boilerplate: bool = False,
     ) -> list[ScoredChunk]:
         """
         Vector similarity search with optional metadata filters.
+        `accession_number` restricts results to one filing, since the store
+        also holds prior quarters and backfilled history.
+        `exclude_boilerplate` skips chunks tagged as boilerplate at ingestion
+        (BOILERPLATE_MODE=tag).
         """
         ...
 
@@ -45,3 +51,21 @@ class VectorStore(Protocol):
         Used to gate network calls and ingestion.
         """
         ...
+
+    async def get_accession_chunks(
+        self,
+        ticker: str,
+        accession_number: str,
+    ) -> list[tuple[TenQChunk, list[float]]]:
+        """
+        Return every stored chunk for this ticker + accession with its embedding.
+        Used by incremental re-ingestion to carry unchanged vectors over.
+        """
+        ...
+
+    async def delete_accession(self, ticker: str, accession_number: str) -> None:
+        """
+        Remove every stored chunk for this ticker + accession, so a filing
+        can be re-ingested without duplicating its chunks.
+        """
+        ...
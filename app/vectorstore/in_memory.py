@@ -1,35 +1,100 @@
 from __future__ import annotations
 
+import heapq
 import math
-from dataclasses import dataclass
-from typing import Sequence
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
 
+from app.parsing.chunk_table import ChunkTable
 from app.parsing.models import TenQChunk
 from app.vectorstore.base import ScoredChunk, VectorStore
 
 
-@dataclass
-class _Stored:
-    chunk: TenQChunk
-    embedding: list[float]
+@dataclass(slots=True)
+class _Batch:
+    """
+    One upserted batch for a single accession: the chunks as handed in
+    (a ChunkTable is kept as-is), float32 embedding rows and their norms.
+    """
+
+    chunks: Sequence[TenQChunk]
+    embeddings: list[array]
+    norms: array
+
+    def section_name(self, i: int) -> str:
+        if isinstance(self.chunks, ChunkTable):
+            return self.chunks.section_name(i)
+        return self.chunks[i].section_name
+
+    def is_boilerplate(self, i: int) -> bool:
+        if isinstance(self.chunks, ChunkTable):
+            return self.chunks.is_boilerplate(i)
+        return self.chunks[i].is_boilerplate
+
+
+@dataclass(slots=True)
+class _Group:
+    """
+    All stored batches for one (ticker, accession), sharing one metadata row.
+    """
+
+    metadata: Any
+    batches: list[_Batch] = field(default_factory=list)
+
+
+def _key(md: Any) -> tuple[str, str]:
+    return md.ticker.upper(), md.accession_number
 
 
 class InMemoryVectorStore(VectorStore):
     """
     Simple in-memory vector store for dev & tests.
     NOTE: contents disappear when the process restarts.
+
+    Chunks are grouped per (ticker, accession) so metadata filters are
+    checked once per filing, embeddings are stored as float32 arrays with
+    precomputed norms, and ScoredChunk objects are only built for the top_k.
     """
 
     def __init__(self) -> None:
-        self._data: list[_Stored] = []
+        self._groups: dict[tuple[str, str], _Group] = {}
+
+    def _group_for(self, md: Any) -> _Group:
+        key = _key(md)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group(metadata=md)
+        return group
+
+    @staticmethod
+    def _batch(chunks: Sequence[TenQChunk], embeddings: Sequence[list[float]]) -> _Batch:
+        rows = [array("f", emb) for emb in embeddings]
+        norms = array("d", (math.sqrt(sum(x * x for x in row)) for row in rows))
+        return _Batch(chunks=chunks, embeddings=rows, norms=norms)
 
     async def upsert_chunks(
         self,
         chunks: Sequence[TenQChunk],
         embeddings: list[list[float]],
     ) -> None:
+        if len(chunks) != len(embeddings):
+            raise ValueError("chunks and embeddings must have the same length")
+
+        if isinstance(chunks, ChunkTable):
+            self._group_for(chunks.metadata).batches.append(self._batch(chunks, embeddings))
+            return
+
+        # Plain sequences may mix filings; split them per accession.
+        by_key: dict[tuple[str, str], tuple[list[TenQChunk], list[list[float]]]] = {}
         for chunk, emb in zip(chunks, embeddings, strict=True):
-            self._data.append(_Stored(chunk=chunk, embedding=emb))
+            md = chunk.metadata
+            bucket = by_key.setdefault(_key(md), ([], []))
+            bucket[0].append(chunk)
+            bucket[1].append(emb)
+        for group_chunks, group_embs in by_key.values():
+            group = self._group_for(group_chunks[0].metadata)
+            group.batches.append(self._batch(group_chunks, group_embs))
 
     async def search(
         self,
@@ -39,37 +104,55 @@ class InMemoryVectorStore(VectorStore):
         ticker: str | None = None,
         cik: str | None = None,
         section_name: str | None = None,
+        accession_number: str | None = None,
+        exclude_boilerplate: bool = False,
     ) -> list[ScoredChunk]:
-        def cos(a: list[float], b: list[float]) -> float:
-            dot = sum(x * y for x, y in zip(a, b))
-            na = math.sqrt(sum(x * x for x in a))
-            nb = math.sqrt(sum(y * y for y in b))
-            return dot / (na * nb + 1e-9)
-
-        scored: list[ScoredChunk] = []
-        for stored in self._data:
-            md = stored.chunk.metadata
-            if ticker and md.ticker.upper() != ticker.upper():
+        q = array("f", query_embedding)
+        qn = math.sqrt(sum(x * x for x in q))
+        t = ticker.upper() if ticker else None
+
+        # (score, tiebreak, batch, row) - rows only become chunks for the winners.
+        candidates: list[tuple[float, int, _Batch, int]] = []
+        seq = 0
+        for (group_ticker, group_accession), group in self._groups.items():
+            if t and group_ticker != t:
                 continue
-            if cik and md.cik != cik:
+            if accession_number and group_accession != accession_number:
                 continue
-            if section_name and stored.chunk.section_name != section_name:
+            if cik and group.metadata.cik != cik:
                 continue
+            for batch in group.batches:
+                for i, row in enumerate(batch.embeddings):
+                    if section_name and batch.section_name(i) != section_name:
+                        continue
+                    if exclude_boilerplate and batch.is_boilerplate(i):
+                        continue
+                    dot = sum(x * y for x, y in zip(q, row))
+                    score = dot / (qn * batch.norms[i] + 1e-9)
+                    candidates.append((score, seq, batch, i))
+                    seq += 1
 
-            scored.append(
-                ScoredChunk(
-                    chunk=stored.chunk,
-                    score=cos(query_embedding, stored.embedding),
-                )
-            )
-
-        scored.sort(key=lambda s: s.score, reverse=True)
-        return scored[:top_k]
+        # Ties keep insertion order, matching a stable sort on score.
+        best = heapq.nlargest(top_k, candidates, key=lambda c: (c[0], -c[1]))
+        return [ScoredChunk(chunk=batch.chunks[i], score=score) for score, _, batch, i in best]
 
     async def has_accession(self, ticker: str, accession_number: str) -> bool:
-        t = ticker.upper()
-        for stored in self._data:
-            md = stored.chunk.metadata
-            if md.ticker.upper() == t and md.accession_number == accession_number:
-                return True
-        return False
+        group: Optional[_Group] = self._groups.get((ticker.upper(), accession_number))
+        return group is not None and any(len(b.chunks) for b in group.batches)
+
+    async def get_accession_chunks(
+        self,
+        ticker: str,
+        accession_number: str,
+    ) -> list[tuple[TenQChunk, list[float]]]:
+        group = self._groups.get((ticker.upper(), accession_number))
+        if group is None:
+            return []
+        return [
+            (chunk, row.tolist())
+            for batch in group.batches
+            for chunk, row in zip(batch.chunks, batch.embeddings)
+        ]
+
+    async def delete_accession(self, ticker: str, accession_number: str) -> None:
+        self._groups.pop((ticker.upper(), accession_number), None)
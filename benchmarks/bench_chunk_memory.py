@@ -0,0 +1,125 @@
+"""
+Memory benchmark: per-chunk objects vs ChunkTable for N chunks.
+
+    python -m benchmarks.bench_chunk_memory [--chunks 1000000]
+
+Three layouts over the same synthetic sections (chunks overlap by ~12%):
+  legacy  - dict-backed dataclass per chunk with its own text copy (pre-slots TenQChunk)
+  slots   - slotted TenQChunk per chunk with its own text copy
+  table   - ChunkTable: section text once + parallel offset arrays
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Optional
+
+from app.edgar.models import TenQMetadata
+from app.parsing.chunk_table import ChunkTable
+from app.parsing.chunking import token_chunk_spans
+from app.parsing.models import TenQChunk, TenQSection
+
+
+@dataclass
+class _LegacyChunk:
+    section_name: str
+    section_item: Optional[str]
+    chunk_index: int
+    text: str
+    metadata: TenQMetadata
+
+
+def _metadata() -> TenQMetadata:
+    return TenQMetadata(
+        ticker="BENCH",
+        cik="0000000000",
+        company_name="Bench Corp",
+        form_type="10-Q",
+        filing_date=date(2025, 1, 1),
+        period_of_report=date(2024, 12, 31),
+        accession_number="0000000000-25-000000",
+        primary_document="bench.htm",
+    )
+
+
+def _sections(n_chunks: int, max_tokens: int, md: TenQMetadata) -> list[tuple[TenQSection, list]]:
+    # ~64 chunks per section; sentences of ~60 chars.
+    sentence = "Net sales increased compared to the prior year quarter. "
+    per_section = 64
+    text = sentence * (per_section * max_tokens * 4 // len(sentence))
+    spans = token_chunk_spans(text, max_tokens=max_tokens, overlap_tokens=max_tokens // 8)
+    out = []
+    made = 0
+    order = 0
+    while made < n_chunks:
+        take = spans[: n_chunks - made]
+        # distinct string objects per section, like real filings
+        section = TenQSection(
+            name=f"Section {order % 12}",
+            item_number=str(order % 12),
+            order_index=order,
+            text=(text + " ")[:-1],
+            metadata=md,
+        )
+        out.append((section, take))
+        made += len(take)
+        order += 1
+    return out
+
+
+def _measure(build: Callable[[], object]) -> tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, obj
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--chunks", type=int, default=1_000_000)
+    ap.add_argument("--max-tokens", type=int, default=64)
+    args = ap.parse_args()
+
+    md = _metadata()
+    sections = _sections(args.chunks, args.max_tokens, md)
+    section_bytes = sum(len(s.text) for s, _ in sections)
+
+    def build_legacy() -> list[_LegacyChunk]:
+        return [
+            _LegacyChunk(s.name, s.item_number, i, sp.text_of(s.text), md)
+            for s, spans in sections
+            for i, sp in enumerate(spans)
+        ]
+
+    def build_slots() -> list[TenQChunk]:
+        return [
+            TenQChunk(s.name, s.item_number, i, sp.text_of(s.text), md)
+            for s, spans in sections
+            for i, sp in enumerate(spans)
+        ]
+
+    def build_table() -> list[ChunkTable]:
+        # one table per synthetic "filing" of 16 sections
+        tables: list[ChunkTable] = []
+        for k, (s, spans) in enumerate(sections):
+            if k % 16 == 0:
+                tables.append(ChunkTable(md))
+            tables[-1].add_section(s, spans)
+        return tables
+
+    print(f"chunks={args.chunks:,} section_text={section_bytes / 1e6:,.1f} MB (shared input)")
+    print(f"{'layout':>8} {'MB':>10} {'bytes/chunk':>12}")
+    for name, build in (("legacy", build_legacy), ("slots", build_slots), ("table", build_table)):
+        used, obj = _measure(build)
+        print(f"{name:>8} {used / 1e6:>10.1f} {used / args.chunks:>12.1f}")
+        del obj
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Throughput benchmark: simple_paragraph_chunker vs token_chunker on large
+synthetic MD&A sections.
+
+    python -m benchmarks.bench_chunking [--mb 1 5 20] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import time
+from datetime import date
+from typing import Callable, List
+
+from app.edgar.models import TenQMetadata
+from app.parsing.chunking import estimate_tokens, simple_paragraph_chunker, token_chunker
+from app.parsing.models import TenQChunk, TenQSection
+
+_WORDS = (
+    "revenue net sales increased decreased compared quarter prior year primarily due "
+    "higher lower demand services products gross margin operating expenses foreign "
+    "currency exchange rates liquidity capital resources cash equivalents marketable "
+    "securities repurchase program dividends supply chain inflation interest"
+).split()
+
+
+# "paras": blank-line separated paragraphs; "parser": TenQParser-shaped text.
+_SHAPES = (("paras", "\n\n"), ("parser", "\n"))
+
+
+def make_mdna_text(target_chars: int, seed: int = 7, sep: str = "\n\n") -> str:
+    """
+    Random MD&A-like prose. sep="\n" mimics TenQParser output, which joins
+    non-empty lines with single newlines.
+    """
+    rnd = random.Random(seed)
+    paragraphs: list[str] = []
+    size = 0
+    while size < target_chars:
+        sentences = []
+        for _ in range(rnd.randint(3, 8)):
+            words = rnd.choices(_WORDS, k=rnd.randint(8, 30))
+            sentences.append(" ".join(words).capitalize() + ".")
+        para = " ".join(sentences)
+        paragraphs.append(para)
+        size += len(para) + 2
+    return sep.join(paragraphs)
+
+
+def _metadata() -> TenQMetadata:
+    return TenQMetadata(
+        ticker="BENCH",
+        cik="0000000000",
+        company_name="Bench Corp",
+        form_type="10-Q",
+        filing_date=date(2025, 1, 1),
+        period_of_report=date(2024, 12, 31),
+        accession_number="0000000000-25-000000",
+        primary_document="bench.htm",
+    )
+
+
+def _time(fn: Callable[[TenQSection], List[TenQChunk]], section: TenQSection, repeat: int):
+    best = float("inf")
+    chunks: list[TenQChunk] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        chunks = fn(section)
+        best = min(best, time.perf_counter() - t0)
+    return best, chunks
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--mb", type=float, nargs="+", default=[1.0, 5.0, 20.0])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    md = _metadata()
+    print(
+        f"{'shape':>8} {'size_mb':>8} {'chunker':>24} {'seconds':>9} {'MB/s':>8} "
+        f"{'chunks':>8} {'max_tok':>8}"
+    )
+    for (shape, sep), mb in itertools.product(_SHAPES, args.mb):
+        text = make_mdna_text(int(mb * 1_000_000), sep=sep)
+        section = TenQSection(
+            name="Management's Discussion and Analysis",
+            item_number="2",
+            order_index=0,
+            text=text,
+            metadata=md,
+        )
+        for name, fn in (
+            ("simple_paragraph_chunker", simple_paragraph_chunker),
+            ("token_chunker", token_chunker),
+        ):
+            secs, chunks = _time(fn, section, args.repeat)
+            max_tok = max(estimate_tokens(c.text) for c in chunks)
+            print(
+                f"{shape:>8} {mb:>8.1f} {name:>24} {secs:>9.4f} {mb / secs:>8.1f} "
+                f"{len(chunks):>8} {max_tok:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Local HTTP stand-in for SEC EDGAR, serving recorded (or synthetic) files
+under the same paths as www.sec.gov and data.sec.gov, so the whole
+pipeline can run offline against it.
+
+    python -m benchmarks.edgar_stub generate --root data/edgar_stub \\
+        [--companies 20] [--filing-kb 400]
+    python -m benchmarks.edgar_stub record --root data/edgar_stub \\
+        --tickers AAPL MSFT   (needs SEC access)
+    python -m benchmarks.edgar_stub serve --root data/edgar_stub [--port 8800] [--latency-ms 50]
+
+Point the app at it with SEC_BASE_URL / SEC_DATA_BASE_URL=http://127.0.0.1:8800.
+
+Layout of --root (one directory for both hosts; their paths don't collide):
+    files/company_tickers.json
+    submissions/CIK##########.json
+    Archives/edgar/data/<cik>/<accession without dashes>/<primary document>
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Sequence
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse
+
+_WORDS = (
+    "revenue net sales increased decreased compared quarter prior year primarily due "
+    "higher lower demand services products gross margin operating expenses foreign "
+    "currency exchange rates liquidity capital resources cash equivalents marketable "
+    "securities repurchase program dividends supply chain inflation interest"
+).split()
+
+_ITEMS = (
+    ("1", "Financial Statements"),
+    ("2", "Management's Discussion and Analysis of Financial Condition and Results of Operations"),
+    ("3", "Quantitative and Qualitative Disclosures About Market Risk"),
+    ("4", "Controls and Procedures"),
+    ("1A", "Risk Factors"),
+)
+
+
+def build_app(root: Path, latency_seconds: float = 0.0) -> FastAPI:
+    """
+    Static file server over `root`; every response waits `latency_seconds`
+    first, to mimic SEC round-trip times.
+    """
+    root = root.resolve()
+    app = FastAPI(title="EDGAR stub")
+
+    @app.get("/{path:path}")
+    async def serve(path: str, request: Request) -> FileResponse:
+        if latency_seconds > 0:
+            await asyncio.sleep(latency_seconds)
+        target = (root / path).resolve()
+        if not target.is_relative_to(root) or not target.is_file():
+            raise HTTPException(status_code=404)
+        media_type = "application/json" if target.suffix == ".json" else None
+        return FileResponse(target, media_type=media_type)
+
+    return app
+
+
+# --------------------------------------------------------------------------- #
+# Synthetic fixtures
+# --------------------------------------------------------------------------- #
+
+
+def _paragraphs(rnd: random.Random, target_chars: int) -> list[str]:
+    out: list[str] = []
+    size = 0
+    while size < target_chars:
+        sentences = [
+            " ".join(rnd.choices(_WORDS, k=rnd.randint(8, 30))).capitalize() + "."
+            for _ in range(rnd.randint(3, 8))
+        ]
+        para = " ".join(sentences)
+        out.append(para)
+        size += len(para)
+    return out
+
+
+def make_filing_html(rnd: random.Random, company: str, target_chars: int) -> str:
+    per_item = target_chars // len(_ITEMS)
+    body = [f"<p><b>{company}</b> Form 10-Q</p>"]
+    for number, title in _ITEMS:
+        body.append(f"<p>Item {number}. {title}</p>")
+        body.extend(f"<p>{p}</p>" for p in _paragraphs(rnd, per_item))
+    return (
+        "<html><head><style>p {margin: 0}</style></head><body>" + "".join(body) + "</body></html>"
+    )
+
+
+def generate(root: Path, companies: int = 20, filing_kb: int = 400, seed: int = 7) -> list[str]:
+    """
+    Write a synthetic EDGAR tree: `companies` tickers (SYN000, SYN001, ...),
+    each with four quarterly 10-Qs. Returns the tickers.
+    """
+    rnd = random.Random(seed)
+    tickers: dict[str, dict[str, object]] = {}
+    (root / "files").mkdir(parents=True, exist_ok=True)
+    (root / "submissions").mkdir(parents=True, exist_ok=True)
+
+    for n in range(companies):
+        ticker = f"SYN{n:03d}"
+        cik = 9_000_000 + n
+        name = f"Synthetic Holdings {n}"
+        tickers[str(n)] = {"cik_str": cik, "ticker": ticker, "title": name}
+
+        recent: dict[str, list[str]] = {
+            k: []
+            for k in ("form", "filingDate", "reportDate", "accessionNumber", "primaryDocument")
+        }
+        period = date(2025, 6, 30)
+        for q in range(4):
+            accession = f"{cik:010d}-25-{q + 1:06d}"
+            document = f"syn{n:03d}-{period:%Y%m%d}.htm"
+            recent["form"].append("10-Q")
+            recent["filingDate"].append((period + timedelta(days=35)).isoformat())
+            recent["reportDate"].append(period.isoformat())
+            recent["accessionNumber"].append(accession)
+            recent["primaryDocument"].append(document)
+
+            doc = root / "Archives/edgar/data" / str(cik) / accession.replace("-", "") / document
+            doc.parent.mkdir(parents=True, exist_ok=True)
+            doc.write_text(make_filing_html(rnd, name, filing_kb * 1024), encoding="utf-8")
+            period = (period.replace(day=1) - timedelta(days=80)).replace(day=28)
+
+        submissions = {
+            "cik": str(cik),
+            "name": name,
+            "tickers": [ticker],
+            "filings": {"recent": recent, "files": []},
+        }
+        (root / "submissions" / f"CIK{cik:010d}.json").write_text(
+            json.dumps(submissions), encoding="utf-8"
+        )
+
+    (root / "files" / "company_tickers.json").write_text(json.dumps(tickers), encoding="utf-8")
+    return [t["ticker"] for t in tickers.values()]  # type: ignore[misc]
+
+
+def fixture_tickers(root: Path) -> list[str]:
+    data = json.loads((root / "files" / "company_tickers.json").read_text(encoding="utf-8"))
+    return [str(e["ticker"]) for e in data.values()]
+
+
+# --------------------------------------------------------------------------- #
+# Recording from SEC
+# --------------------------------------------------------------------------- #
+
+
+async def record(root: Path, tickers: Sequence[str]) -> None:
+    """
+    Copy the real company_tickers.json, submissions and latest 10-Q primary
+    document for `tickers` into `root` (uses SEC_USER_AGENT and rate limits).
+    """
+    from app.edgar.cik_resolver import CikResolver
+    from app.edgar.client import EdgarHttpClient
+    from app.edgar.submissions import SubmissionsService
+
+    client = EdgarHttpClient()
+    try:
+        raw = await client.get_json("files/company_tickers.json")
+        wanted = {t.upper() for t in tickers}
+        kept = {k: v for k, v in raw.items() if str(v["ticker"]).upper() in wanted}
+        (root / "files").mkdir(parents=True, exist_ok=True)
+        (root / "files" / "company_tickers.json").write_text(json.dumps(kept), encoding="utf-8")
+
+        resolver = CikResolver(client, index_path=None)
+        submissions = SubmissionsService(client)
+        for ticker in wanted:
+            info = await resolver.resolve(ticker)
+            data = await client.get_json(f"submissions/CIK{info.cik_str}.json", data_host=True)
+            path = root / "submissions" / f"CIK{info.cik_str}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(data), encoding="utf-8")
+
+            meta = submissions.select_latest_10q(await submissions.fetch_submissions(info.cik_str))
+            if meta is None:
+                continue
+            rel = f"{info.cik_int}/{meta.accession_number.replace('-', '')}/{meta.primary_document}"
+            doc = root / "Archives/edgar/data" / rel
+            doc.parent.mkdir(parents=True, exist_ok=True)
+            with open(doc, "wb") as sink:
+                await client.stream_to(f"{client.sec_base_url}/Archives/edgar/data/{rel}", sink)
+            print(f"recorded {ticker} {meta.accession_number}")
+    finally:
+        await client.aclose()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="write synthetic fixtures")
+    gen.add_argument("--root", type=Path, default=Path("data/edgar_stub"))
+    gen.add_argument("--companies", type=int, default=20)
+    gen.add_argument("--filing-kb", type=int, default=400)
+    gen.add_argument("--seed", type=int, default=7)
+
+    rec = sub.add_parser("record", help="record real EDGAR files (needs network)")
+    rec.add_argument("--root", type=Path, default=Path("data/edgar_stub"))
+    rec.add_argument("--tickers", nargs="+", required=True)
+
+    srv = sub.add_parser("serve", help="serve --root over HTTP")
+    srv.add_argument("--root", type=Path, default=Path("data/edgar_stub"))
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8800)
+    srv.add_argument("--latency-ms", type=float, default=0.0)
+
+    args = ap.parse_args()
+    if args.command == "generate":
+        tickers = generate(args.root, args.companies, args.filing_kb, args.seed)
+        print(f"wrote {len(tickers)} companies to {args.root}")
+    elif args.command == "record":
+        asyncio.run(record(args.root, args.tickers))
+    else:
+        import uvicorn
+
+        uvicorn.run(build_app(args.root, args.latency_ms / 1000), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
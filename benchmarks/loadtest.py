@@ -0,0 +1,270 @@
+"""
+Offline end-to-end load test: the FastAPI app with the fake LLM
+(LLM_MODEL=fake) against the local EDGAR stub, driven at a fixed request
+rate through the streaming summaries endpoint. Reports p50/p95/p99 and
+throughput per stage from the endpoint's own progress events.
+
+    python -m benchmarks.loadtest [--rps 5] [--duration 30] [--companies 20]
+        [--llm-latency-ms 800] [--llm-jitter-ms 400] [--tool-calls retrieve_tenq_chunks]
+        [--edgar-latency-ms 50] [--refresh agents] [--no-agent-cache] [--json out.json]
+
+Everything (stub fixtures, caches, stored filings) lives in --workdir, a
+fresh temp directory by default. Requests are open-loop: one is started
+every 1/rps seconds whether or not earlier ones have finished.
+--url drives an already running app instead (its env must point at the
+stub and the fake LLM).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+from benchmarks.edgar_stub import build_app, fixture_tickers, generate
+
+STAGES = (
+    "ttfb",
+    "sec_check",
+    "download",
+    "parse",
+    "boilerplate",
+    "embed",
+    "diff",
+    "insights",
+    "decision",
+    "total",
+)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of `values` (0 when empty).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+class _Server:
+    """
+    uvicorn in a background thread (own event loop) on a free port.
+    """
+
+    def __init__(self, app: Any) -> None:
+        import uvicorn
+
+        config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="on")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def start(self) -> str:
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+class LoadStats:
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.outcomes: Counter[str] = Counter()
+        self.cache: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+
+    def report(self, wall_seconds: float) -> dict[str, Any]:
+        stages = {
+            stage: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "per_second": round(len(values) / wall_seconds, 2),
+            }
+            for stage in STAGES
+            if (values := self.samples.get(stage))
+        }
+        return {
+            "wall_seconds": round(wall_seconds, 2),
+            "requests": sum(self.outcomes.values()),
+            "outcomes": dict(self.outcomes),
+            "throughput_per_second": round(self.outcomes["ok"] / wall_seconds, 2),
+            "cache": dict(self.cache),
+            "stages": stages,
+            "errors": dict(self.errors.most_common(5)),
+        }
+
+
+async def one_request(
+    client: httpx.AsyncClient,
+    ticker: str,
+    refresh: list[str],
+    stats: LoadStats,
+) -> None:
+    started = time.perf_counter()
+    first: Optional[float] = None
+    event = ""
+    outcome = "error"
+    try:
+        async with client.stream(
+            "POST", "/summaries/10q/stream", json={"ticker": ticker, "refresh": refresh}
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[7:]
+                    if first is None:
+                        first = time.perf_counter() - started
+                elif line.startswith("data: "):
+                    data = json.loads(line[6:])
+                    if event == "stage":
+                        stats.samples[data["stage"]].append(data["seconds"])
+                    elif event == "cache":
+                        stats.cache[data["status"]] += 1
+                    elif event in ("insights", "decision") and "seconds" in data:
+                        stats.samples[event].append(data["seconds"])
+                    elif event == "done":
+                        outcome = "ok"
+                    elif event == "error":
+                        stats.errors[data["error"][:120]] += 1
+    except httpx.HTTPError as exc:
+        stats.errors[repr(exc)[:120]] += 1
+    stats.outcomes[outcome] += 1
+    if outcome == "ok":
+        stats.samples["total"].append(time.perf_counter() - started)
+        if first is not None:
+            stats.samples["ttfb"].append(first)
+
+
+async def drive(
+    url: str,
+    tickers: list[str],
+    *,
+    rps: float,
+    duration: float,
+    refresh: list[str],
+) -> dict[str, Any]:
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+    async with httpx.AsyncClient(base_url=url, timeout=None, limits=limits) as client:
+        tasks: list[asyncio.Task[None]] = []
+        started = time.perf_counter()
+        for i in range(max(1, int(rps * duration))):
+            delay = started + i / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(
+                asyncio.create_task(one_request(client, tickers[i % len(tickers)], refresh, stats))
+            )
+        await asyncio.gather(*tasks)
+        wall = time.perf_counter() - started
+    return stats.report(wall)
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(
+        f"{report['requests']} requests in {report['wall_seconds']}s: {report['outcomes']}, "
+        f"{report['throughput_per_second']}/s; cache {report['cache']}"
+    )
+    print(f"{'stage':>12} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'/s':>7}")
+    for stage, row in report["stages"].items():
+        print(
+            f"{stage:>12} {row['count']:>7} {row['p50_ms']:>9} {row['p95_ms']:>9} "
+            f"{row['p99_ms']:>9} {row['per_second']:>7}"
+        )
+    for error, count in report["errors"].items():
+        print(f"  error x{count}: {error}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    ap.add_argument("--rps", type=float, default=5.0)
+    ap.add_argument("--duration", type=float, default=30.0, help="seconds of request starts")
+    ap.add_argument("--workdir", type=Path, default=None)
+    ap.add_argument(
+        "--fixtures", type=Path, default=None, help="EDGAR stub root (generated if missing)"
+    )
+    ap.add_argument("--companies", type=int, default=20)
+    ap.add_argument("--filing-kb", type=int, default=400)
+    ap.add_argument("--tickers", nargs="*", default=None, help="default: every fixture ticker")
+    ap.add_argument("--edgar-latency-ms", type=float, default=0.0)
+    ap.add_argument("--sec-rps", type=int, default=8, help="the app's SEC rate limit")
+    ap.add_argument("--llm-latency-ms", type=float, default=0.0)
+    ap.add_argument("--llm-jitter-ms", type=float, default=0.0)
+    ap.add_argument("--tool-calls", default=None, help="fake LLM tool-call pattern")
+    ap.add_argument("--refresh", nargs="*", default=[], help="refresh stages for every request")
+    ap.add_argument("--no-agent-cache", action="store_true")
+    ap.add_argument("--url", default=None, help="drive a running app instead")
+    ap.add_argument("--json", type=Path, default=None, help="also write the report here")
+    args = ap.parse_args()
+
+    json_path = args.json.resolve() if args.json else None
+    workdir = (args.workdir or Path(tempfile.mkdtemp(prefix="loadtest-"))).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    fixtures = (args.fixtures or workdir / "edgar_stub").resolve()
+    if not (fixtures / "files" / "company_tickers.json").exists():
+        generate(fixtures, args.companies, args.filing_kb)
+    tickers = args.tickers or fixture_tickers(fixtures)
+
+    stub = _Server(build_app(fixtures, args.edgar_latency_ms / 1000))
+    stub_url = stub.start()
+    app_server: Optional[_Server] = None
+    try:
+        url = args.url
+        if url is None:
+            env = {
+                "SEC_BASE_URL": stub_url,
+                "SEC_DATA_BASE_URL": stub_url,
+                "SEC_MAX_RPS": str(args.sec_rps),
+                "SEC_HTTP2": "false",
+                "LLM_MODEL": "fake",
+                "FAKE_LLM_LATENCY_SECONDS": str(args.llm_latency_ms / 1000),
+                "FAKE_LLM_JITTER_SECONDS": str(args.llm_jitter_ms / 1000),
+                "AGENT_CACHE_ENABLED": str(not args.no_agent_cache).lower(),
+            }
+            if args.tool_calls is not None:
+                env["FAKE_LLM_TOOL_CALLS"] = args.tool_calls
+            os.environ.update(env)
+            os.environ.setdefault("SEC_USER_AGENT", "loadtest loadtest@example.com")
+            os.environ.setdefault("OPENAI_API_KEY", "offline")
+            # Caches and stored filings are written relative to the cwd.
+            os.chdir(workdir)
+            from app.api.main import app
+
+            app_server = _Server(app)
+            url = app_server.start()
+
+        print(f"workdir {workdir}; EDGAR stub {stub_url}; app {url}; {len(tickers)} tickers")
+        report = asyncio.run(
+            drive(url, tickers, rps=args.rps, duration=args.duration, refresh=args.refresh)
+        )
+    finally:
+        if app_server is not None:
+            app_server.stop()
+        stub.stop()
+
+    print_report(report)
+    if json_path:
+        json_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,586 @@
+"""
+Pipeline benchmark suite over the 10-Q corpus in benchmarks/corpus: times
+parsing, chunking, embedding, the in-memory vector store and the metadata
+cache per document, appends the results to a JSON history, and compares
+two runs from it.
+
+    python -m benchmarks.suite run [--repeat 7] [--label NAME] [--docs small large]
+    python -m benchmarks.suite compare [--baseline -2] [--candidate -1] [--threshold 0.2]
+    python -m benchmarks.suite record --tickers AAPL MSFT   (needs SEC access)
+    python -m benchmarks.suite synthesize   (rewrites the synthetic corpus documents)
+    python -m benchmarks.suite imports [--repeat 5]   (cold import times against IMPORT_BUDGETS)
+
+Every stage is sampled --repeat times (each sample long enough to time
+reliably) and the best per-call time is kept; the median is recorded too.
+`compare` exits with status 1 when a stage present in both runs is more
+than --threshold slower than the baseline; stages faster than --floor-ms
+in both runs are reported but never fail. --baseline and
+--candidate are history indices (negative counts from the end) or labels.
+
+`run --imports` also records the cold import time of each IMPORT_BUDGETS
+module as an "import[<module>]" stage. `imports` exits with status 1 when
+a module's best cold import exceeds its budget or pulls in one of
+DEFERRED_MODULES, which the app only needs once an agent runs or a filing
+is parsed.
+
+Corpus layout: benchmarks/corpus/manifest.json lists each document
+(name, file, filing metadata, source, size class, synthetic); documents are
+gzipped HTML. Real filings come from `record`; the synthetic stand-ins are
+extras, and `run` warns about every size class without a real filing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import gzip
+import inspect
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Sequence, Union
+
+from app.edgar.metadata_cache import TenQMetadataCache
+from app.edgar.models import TenQMetadata
+from app.parsing.chunking import ChunkSpan, simple_paragraph_chunker, token_chunk_spans
+from app.parsing.models import TenQSection
+from app.parsing.tenq_parser import TenQParser
+from app.vectorstore.embeddings import EmbeddingService
+from app.vectorstore.in_memory import InMemoryVectorStore
+from benchmarks.edgar_stub import make_filing_html
+
+CORPUS = Path(__file__).parent / "corpus"
+HISTORY = Path(__file__).parent / "history.json"
+
+# name -> target characters of the synthetic stand-ins (see `synthesize`).
+_SYNTHETIC_SIZES = {"small": 40_000, "medium": 200_000, "large": 800_000}
+# Size class -> upper bound in characters of the filing HTML (last: no bound).
+SIZE_CLASSES = {"small": 100_000, "medium": 400_000, "large": None}
+
+_QUERIES = 20
+_HAS_ACCESSION_CALLS = 1_000
+_CACHE_TICKERS = 200
+
+# Cold-import budgets in seconds (best of --repeat fresh interpreters),
+# about twice what the modules take on a development machine.
+IMPORT_BUDGETS = {
+    "app.api.main": 2.0,
+    "app.ingestion.backfill": 1.5,
+}
+DEFERRED_MODULES = ("pydantic_ai", "openai", "bs4", "httpx")
+_ROOT = Path(__file__).resolve().parent.parent
+_IMPORT_PROBE = (
+    "import json, sys, time\n"
+    "t0 = time.perf_counter()\n"
+    "import {module}\n"
+    "seconds = time.perf_counter() - t0\n"
+    "print(json.dumps({{'seconds': seconds, 'modules': sorted(sys.modules)}}))\n"
+)
+
+
+@dataclass
+class CorpusDoc:
+    name: str
+    html: str
+    metadata: TenQMetadata
+    size_class: str
+    synthetic: bool
+
+
+def size_class(chars: int) -> str:
+    for name, bound in SIZE_CLASSES.items():
+        if bound is None or chars < bound:
+            return name
+    raise AssertionError("the last size class has no bound")
+
+
+def missing_real_size_classes(docs: Sequence[CorpusDoc]) -> list[str]:
+    """Size classes with no real filing among docs, in SIZE_CLASSES order."""
+    real = {d.size_class for d in docs if not d.synthetic}
+    return [name for name in SIZE_CLASSES if name not in real]
+
+
+def load_corpus(corpus: Path = CORPUS, names: Optional[Sequence[str]] = None) -> list[CorpusDoc]:
+    manifest = json.loads((corpus / "manifest.json").read_text(encoding="utf-8"))
+    docs: list[CorpusDoc] = []
+    for entry in manifest["documents"]:
+        if names and entry["name"] not in names:
+            continue
+        with gzip.open(corpus / entry["file"], "rt", encoding="utf-8") as f:
+            html = f.read()
+        docs.append(
+            CorpusDoc(
+                name=entry["name"],
+                html=html,
+                metadata=TenQMetadata.model_validate(entry["metadata"]),
+                size_class=entry.get("size_class") or size_class(len(html)),
+                synthetic=entry.get("synthetic", False),
+            )
+        )
+    return docs
+
+
+# --------------------------------------------------------------------------- #
+# Measurement
+# --------------------------------------------------------------------------- #
+
+
+Stage = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+async def _call(fn: Stage, number: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(number):
+        out = fn()
+        if inspect.isawaitable(out):
+            await out
+    return time.perf_counter() - t0
+
+
+async def measure(fn: Stage, repeat: int, min_sample_seconds: float = 0.02) -> dict[str, float]:
+    """
+    Per-call best and median wall time of `fn` (awaited when it returns an
+    awaitable). Like timeit's autorange, each of the `repeat` samples runs
+    `fn` enough times to last `min_sample_seconds`, so fast stages aren't
+    dominated by timer and scheduler noise. GC is off while timing, as in
+    timeit.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        number = 1
+        while (elapsed := await _call(fn, number)) < min_sample_seconds:
+            number *= 2 if elapsed * 4 > min_sample_seconds else 10
+        times = [await _call(fn, number) / number for _ in range(repeat)]
+    finally:
+        gc.enable()
+    return {"best_s": min(times), "median_s": statistics.median(times), "calls": number}
+
+
+def _section_recorder(sections: list[str]) -> Callable[[str], list[ChunkSpan]]:
+    def chunker(text: str) -> list[ChunkSpan]:
+        sections.append(text)
+        return token_chunk_spans(text)
+
+    return chunker
+
+
+async def _bench_doc(doc: CorpusDoc, repeat: int) -> dict[str, dict[str, float]]:
+    parser = TenQParser()
+    table = parser.parse_html(doc.html, doc.metadata)
+
+    texts: list[str] = []
+    TenQParser(span_chunker=_section_recorder(texts)).parse_html(doc.html, doc.metadata)
+    sections = [
+        TenQSection(
+            name=f"section {i}", item_number=None, order_index=i, text=t, metadata=doc.metadata
+        )
+        for i, t in enumerate(texts)
+    ]
+
+    embedder = EmbeddingService("bench")
+    chunk_texts = list(table.texts())
+    embeddings = await embedder.embed_many(chunk_texts)
+
+    store = InMemoryVectorStore()
+    await store.upsert_chunks(table, embeddings)
+    rnd = random.Random(doc.name)
+    queries = [rnd.choice(embeddings) for _ in range(_QUERIES)]
+    ticker, accession = doc.metadata.ticker, doc.metadata.accession_number
+
+    async def upsert() -> None:
+        await InMemoryVectorStore().upsert_chunks(table, embeddings)
+
+    async def search() -> None:
+        for q in queries:
+            await store.search(q, top_k=8, ticker=ticker)
+
+    async def has_accession() -> None:
+        for _ in range(_HAS_ACCESSION_CALLS):
+            await store.has_accession(ticker, accession)
+
+    stages: dict[str, Stage] = {
+        "parse_html": lambda: parser.parse_html(doc.html, doc.metadata),
+        "simple_paragraph_chunker": lambda: [simple_paragraph_chunker(s) for s in sections],
+        "embed_many": lambda: embedder.embed_many(chunk_texts),
+        "upsert_chunks": upsert,
+        "search": search,
+        "has_accession": has_accession,
+    }
+    return {name: await measure(fn, repeat) for name, fn in stages.items()}
+
+
+async def _bench_metadata_cache(doc: CorpusDoc, repeat: int) -> dict[str, dict[str, float]]:
+    tickers = [f"B{i:04d}" for i in range(_CACHE_TICKERS)]
+    with tempfile.TemporaryDirectory(prefix="bench-cache-") as tmp:
+        cache = TenQMetadataCache(Path(tmp) / "latest_tenq.json")
+
+        def write() -> None:
+            for t in tickers:
+                cache.set_latest(t, doc.metadata)
+
+        def read() -> None:
+            for t in tickers:
+                cache.get_latest(t)
+
+        return {
+            "metadata_cache.set_latest": await measure(write, repeat),
+            "metadata_cache.get_latest": await measure(read, repeat),
+        }
+
+
+async def run_suite(docs: Sequence[CorpusDoc], repeat: int = 7) -> dict[str, dict[str, float]]:
+    """
+    Results keyed "<stage>[<document>]", plus the metadata cache stages
+    (not per document).
+    """
+    results: dict[str, dict[str, float]] = {}
+    for doc in docs:
+        for stage, row in (await _bench_doc(doc, repeat)).items():
+            results[f"{stage}[{doc.name}]"] = row
+    if docs:
+        results.update(await _bench_metadata_cache(docs[0], repeat))
+    return results
+
+
+def _import_once(module: str) -> tuple[float, set[str]]:
+    # Credentials are dropped so the import cannot depend on them.
+    env = {k: v for k, v in os.environ.items() if k not in ("OPENAI_API_KEY", "SEC_USER_AGENT")}
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=_ROOT,
+        env=env,
+    )
+    data = json.loads(out.stdout.strip().splitlines()[-1])
+    return data["seconds"], set(data["modules"])
+
+
+def measure_import(module: str, repeat: int = 5) -> dict[str, Any]:
+    """
+    Best and median time to import `module` in a fresh interpreter, and
+    which of DEFERRED_MODULES it loaded.
+    """
+    times: list[float] = []
+    loaded: set[str] = set()
+    for _ in range(repeat):
+        seconds, modules = _import_once(module)
+        times.append(seconds)
+        loaded |= modules
+    return {
+        "best_s": min(times),
+        "median_s": statistics.median(times),
+        "calls": 1,
+        "deferred_loaded": sorted(m for m in DEFERRED_MODULES if m in loaded),
+    }
+
+
+# --------------------------------------------------------------------------- #
+# History and comparison
+# --------------------------------------------------------------------------- #
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def append_history(path: Path, entry: dict[str, Any]) -> None:
+    history = load_history(path)
+    history.append(entry)
+    path.write_text(json.dumps(history, indent=2) + "\n", encoding="utf-8")
+
+
+def select_run(history: list[dict[str, Any]], ref: str) -> dict[str, Any]:
+    """
+    A history entry by index ("-1", "0", ...) or, failing that, the latest
+    one with that label.
+    """
+    try:
+        return history[int(ref)]
+    except ValueError:
+        pass
+    except IndexError:
+        raise SystemExit(f"history has {len(history)} runs; no run {ref}") from None
+    for entry in reversed(history):
+        if entry.get("label") == ref:
+            return entry
+    raise SystemExit(f"no run labelled {ref!r} in the history")
+
+
+def compare_runs(
+    baseline: dict[str, dict[str, float]],
+    candidate: dict[str, dict[str, float]],
+    *,
+    threshold: float,
+    floor_seconds: float = 0.0,
+) -> list[dict[str, Any]]:
+    """
+    One row per stage in both runs: best times, their ratio and whether it
+    counts as a regression (ratio above 1 + threshold, unless both times
+    are under `floor_seconds`).
+    """
+    rows: list[dict[str, Any]] = []
+    for stage, base in baseline.items():
+        cand = candidate.get(stage)
+        if cand is None:
+            continue
+        before, after = base["best_s"], cand["best_s"]
+        ratio = after / before if before > 0 else float("inf")
+        noise = before < floor_seconds and after < floor_seconds
+        rows.append(
+            {
+                "stage": stage,
+                "baseline_s": before,
+                "candidate_s": after,
+                "ratio": ratio,
+                "regressed": ratio > 1 + threshold and not noise,
+            }
+        )
+    return rows
+
+
+def print_results(results: dict[str, dict[str, float]]) -> None:
+    print(f"{'stage':<38} {'best ms':>10} {'median ms':>10}")
+    for stage, row in results.items():
+        print(f"{stage:<38} {row['best_s'] * 1000:>10.3f} {row['median_s'] * 1000:>10.3f}")
+
+
+def print_comparison(rows: list[dict[str, Any]]) -> None:
+    print(f"{'stage':<38} {'base ms':>10} {'new ms':>10} {'change':>8}")
+    for row in rows:
+        change = f"{(row['ratio'] - 1) * 100:+.1f}%"
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(
+            f"{row['stage']:<38} {row['baseline_s'] * 1000:>10.3f} "
+            f"{row['candidate_s'] * 1000:>10.3f} {change:>8}{flag}"
+        )
+
+
+# --------------------------------------------------------------------------- #
+# Corpus maintenance
+# --------------------------------------------------------------------------- #
+
+
+def _write_manifest(corpus: Path, entries: list[dict[str, Any]]) -> None:
+    path = corpus / "manifest.json"
+    existing = json.loads(path.read_text(encoding="utf-8"))["documents"] if path.exists() else []
+    names = {e["name"] for e in entries}
+    documents = [e for e in existing if e["name"] not in names] + entries
+    path.write_text(json.dumps({"documents": documents}, indent=2) + "\n", encoding="utf-8")
+
+
+def _write_doc(corpus: Path, name: str, html: bytes) -> str:
+    file = f"{name}.htm.gz"
+    # mtime=0 keeps regenerated files byte-identical.
+    with gzip.GzipFile(corpus / file, "wb", mtime=0) as f:
+        f.write(html)
+    return file
+
+
+def synthesize(corpus: Path = CORPUS, seed: int = 7) -> None:
+    """
+    Deterministic stand-in filings at _SYNTHETIC_SIZES, in the shape the
+    EDGAR stub serves.
+    """
+    corpus.mkdir(parents=True, exist_ok=True)
+    entries = []
+    for n, (name, chars) in enumerate(_SYNTHETIC_SIZES.items()):
+        company = f"Synthetic Holdings {name}"
+        html = make_filing_html(random.Random(f"{seed}:{name}"), company, chars)
+        metadata = TenQMetadata(
+            ticker=f"SYN{n:03d}",
+            cik=f"{9_000_000 + n:010d}",
+            company_name=company,
+            form_type="10-Q",
+            filing_date=date(2025, 8, 4),
+            period_of_report=date(2025, 6, 30),
+            accession_number=f"{9_000_000 + n:010d}-25-000001",
+            primary_document=f"syn-{name}.htm",
+        )
+        entries.append(
+            {
+                "name": name,
+                "file": _write_doc(corpus, name, html.encode("utf-8")),
+                "metadata": metadata.model_dump(mode="json"),
+                "source": f"synthetic (benchmarks.edgar_stub.make_filing_html, {chars} chars)",
+                "size_class": size_class(len(html)),
+                "synthetic": True,
+            }
+        )
+    _write_manifest(corpus, entries)
+
+
+async def record(corpus: Path, tickers: Sequence[str]) -> None:
+    """
+    Add the latest real 10-Q of each ticker to the corpus, named after the
+    ticker and classed by size (uses SEC_USER_AGENT and rate limits). Pick
+    tickers so every SIZE_CLASSES entry gets at least one real filing.
+    """
+    from app.edgar.cik_resolver import CikResolver
+    from app.edgar.client import EdgarHttpClient
+    from app.edgar.submissions import SubmissionsService
+
+    client = EdgarHttpClient()
+    corpus.mkdir(parents=True, exist_ok=True)
+    entries = []
+    try:
+        resolver = CikResolver(client, index_path=None)
+        submissions = SubmissionsService(client)
+        for ticker in tickers:
+            info = await resolver.resolve(ticker)
+            meta = submissions.select_latest_10q(await submissions.fetch_submissions(info.cik_str))
+            if meta is None:
+                print(f"no 10-Q for {ticker}")
+                continue
+            rel = f"{info.cik_int}/{meta.accession_number.replace('-', '')}/{meta.primary_document}"
+            url = f"{client.sec_base_url}/Archives/edgar/data/{rel}"
+            with tempfile.TemporaryFile() as sink:
+                await client.stream_to(url, sink)
+                sink.seek(0)
+                html = sink.read()
+            name = ticker.lower()
+            entries.append(
+                {
+                    "name": name,
+                    "file": _write_doc(corpus, name, html),
+                    "metadata": meta.model_dump(mode="json"),
+                    "source": url,
+                    "size_class": size_class(len(html.decode("utf-8", "replace"))),
+                    "synthetic": False,
+                }
+            )
+            print(
+                f"recorded {ticker} {meta.accession_number} "
+                f"({len(html) // 1024} KiB, {entries[-1]['size_class']})"
+            )
+    finally:
+        await client.aclose()
+    _write_manifest(corpus, entries)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    ap.add_argument("--corpus", type=Path, default=CORPUS)
+    ap.add_argument("--history", type=Path, default=HISTORY)
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="benchmark every stage and append to the history")
+    run.add_argument("--repeat", type=int, default=7)
+    run.add_argument("--label", default=None)
+    run.add_argument("--docs", nargs="*", default=None, help="corpus documents (default: all)")
+    run.add_argument("--imports", action="store_true", help="also time cold imports")
+
+    cmp_ = sub.add_parser("compare", help="fail when a stage regressed")
+    cmp_.add_argument("--baseline", default="-2")
+    cmp_.add_argument("--candidate", default="-1")
+    cmp_.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    cmp_.add_argument("--floor-ms", type=float, default=0.05)
+
+    rec = sub.add_parser("record", help="add real 10-Qs to the corpus (needs network)")
+    rec.add_argument("--tickers", nargs="+", required=True)
+
+    syn = sub.add_parser("synthesize", help="rewrite the synthetic corpus documents")
+    syn.add_argument("--seed", type=int, default=7)
+
+    imp = sub.add_parser("imports", help="fail when a cold import is over budget")
+    imp.add_argument("--repeat", type=int, default=5)
+
+    args = ap.parse_args()
+    if args.command == "run":
+        docs = load_corpus(args.corpus, args.docs)
+        missing = missing_real_size_classes(docs)
+        if missing:
+            print(
+                f"warning: no real filing for size class(es) {', '.join(missing)}; "
+                "those only have synthetic stand-ins (add some with `record`)",
+                file=sys.stderr,
+            )
+        results = asyncio.run(run_suite(docs, args.repeat))
+        if args.imports:
+            for module in IMPORT_BUDGETS:
+                row = measure_import(module, args.repeat)
+                del row["deferred_loaded"]
+                results[f"import[{module}]"] = row
+        print_results(results)
+        append_history(
+            args.history,
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "label": args.label,
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "repeat": args.repeat,
+                "synthetic_only": missing,
+                "results": results,
+            },
+        )
+    elif args.command == "compare":
+        history = load_history(args.history)
+        baseline = select_run(history, args.baseline)
+        candidate = select_run(history, args.candidate)
+        rows = compare_runs(
+            baseline["results"],
+            candidate["results"],
+            threshold=args.threshold,
+            floor_seconds=args.floor_ms / 1000,
+        )
+        print(
+            f"baseline {baseline.get('label') or baseline['timestamp']} ({baseline.get('commit')}) "
+            f"vs {candidate.get('label') or candidate['timestamp']} ({candidate.get('commit')})"
+        )
+        print_comparison(rows)
+        regressed = [r["stage"] for r in rows if r["regressed"]]
+        if regressed:
+            print(f"{len(regressed)} stage(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+    elif args.command == "imports":
+        failed = False
+        for module, budget in IMPORT_BUDGETS.items():
+            row = measure_import(module, args.repeat)
+            over = row["best_s"] > budget or bool(row["deferred_loaded"])
+            failed |= over
+            print(
+                f"{module:<28} {row['best_s'] * 1000:8.1f} ms  budget {budget * 1000:6.0f} ms"
+                f"  {', '.join(row['deferred_loaded']) or '-':<20} {'OVER' if over else 'ok'}"
+            )
+        if failed:
+            sys.exit(1)
+    elif args.command == "record":
+        asyncio.run(record(args.corpus, args.tickers))
+    else:
+        synthesize(args.corpus, args.seed)
+
+
+if __name__ == "__main__":
+    main()
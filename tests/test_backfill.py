@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.edgar.models import CikResolutionResult, CompanySubmissions, TenQMetadata
+from app.edgar.submissions import SubmissionsService
+from app.ingestion.backfill import BackfillCheckpoint, BackfillSpec, run_backfill
+from app.parsing.tenq_parser import TenQParser
+from app.vectorstore.in_memory import InMemoryVectorStore
+
+SUBMISSIONS_JSON = {
+    "cik": "320193",
+    "name": "Apple Inc.",
+    "tickers": ["AAPL"],
+    "filings": {
+        "recent": {
+            "form": ["10-Q", "10-K", "10-Q", "10-Q/A", "10-Q"],
+            "filingDate": ["2025-08-01", "2024-11-01", "2024-08-02", "2024-09-01", "2023-08-04"],
+            "accessionNumber": ["ACC-25Q3", "ACC-10K", "ACC-24Q3", "ACC-24Q3A", "ACC-23Q3"],
+            "primaryDocument": ["q.htm", "k.htm", "q.htm", "qa.htm", "q.htm"],
+            "reportDate": ["2025-06-28", "2024-09-28", "2024-06-29", "2024-06-29", "2023-07-01"],
+        },
+        "files": [],
+    },
+}
+
+
+class FakeResolver:
+    async def resolve(self, ticker: str) -> CikResolutionResult:
+        return CikResolutionResult(
+            ticker=ticker, cik_str="0000320193", cik_int=320193, company_name="Apple Inc."
+        )
+
+
+class FakeSubmissions(SubmissionsService):
+    def __init__(self) -> None:
+        super().__init__(client=None)  # type: ignore[arg-type]
+
+    async def fetch_submissions(self, cik_str: str) -> CompanySubmissions:
+        return CompanySubmissions.from_json(SUBMISSIONS_JSON)
+
+
+class FakeDownloader:
+    def __init__(self, fail: set[str] = frozenset()) -> None:
+        self.fail = set(fail)
+        self.downloaded: list[str] = []
+
+    async def download_primary_html(self, meta: TenQMetadata) -> str:
+        if meta.accession_number in self.fail:
+            raise RuntimeError("boom")
+        self.downloaded.append(meta.accession_number)
+        rel = f"filings/{meta.ticker}/{meta.accession_number}.htm"
+        path = Path("data") / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            f"<p>Item 2. MD&A</p><p>Quarter {meta.accession_number} revenue grew.</p>",
+            encoding="utf-8",
+        )
+        return rel
+
+
+class AmendmentDownloader(FakeDownloader):
+    """
+    The 10-Q/A repeats its original word for word; the original downloads
+    last, so without ordering the amendment would be ingested first.
+    """
+
+    async def download_primary_html(self, meta: TenQMetadata) -> str:
+        if meta.accession_number == "ACC-24Q3":
+            await asyncio.sleep(0.05)
+        rel = f"filings/{meta.ticker}/{meta.accession_number}.htm"
+        path = Path("data") / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            f"<p>Item 2. MD&A</p><p>Quarter ending {meta.period_of_report} revenue grew.</p>",
+            encoding="utf-8",
+        )
+        self.downloaded.append(meta.accession_number)
+        return rel
+
+
+class CountingEmbeddings:
+    def __init__(self) -> None:
+        self.embedded: list[str] = []
+
+    async def embed_many(self, texts):
+        texts = list(texts)
+        self.embedded.extend(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def make_deps(downloader: FakeDownloader) -> SimpleNamespace:
+    return SimpleNamespace(
+        cik_resolver=FakeResolver(),
+        submissions=FakeSubmissions(),
+        filing_downloader=downloader,
+        tenq_parser=TenQParser(),
+        embeddings=CountingEmbeddings(),
+        vector_store=InMemoryVectorStore(),
+        boilerplate=None,
+        diff_index=None,
+    )
+
+
+def test_select_10qs_between_filters_range_and_forms() -> None:
+    selected = FakeSubmissions().select_10qs_between(
+        CompanySubmissions.from_json(SUBMISSIONS_JSON), date(2024, 1, 1), date(2025, 12, 31)
+    )
+    assert [m.accession_number for m in selected] == ["ACC-24Q3", "ACC-24Q3A", "ACC-25Q3"]
+
+
+@pytest.mark.asyncio
+async def test_backfill_ingests_range_and_resumes_from_checkpoint(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    spec = BackfillSpec.of(["aapl", "AAPL"], date(2024, 1, 1), date(2025, 12, 31))
+    assert spec.tickers == ("AAPL",)
+
+    downloader = FakeDownloader(fail={"ACC-25Q3"})
+    deps = make_deps(downloader)
+    snapshots: list[int] = []
+    progress = await run_backfill(
+        deps,
+        spec,
+        checkpoint=BackfillCheckpoint.for_spec(spec, root=tmp_path / "ckpt"),
+        on_progress=lambda p: snapshots.append(p.filings_done),
+    )
+
+    assert progress.filings_planned == 3
+    assert progress.filings_ingested == 2
+    assert progress.filings_failed == 1
+    assert "ACC-25Q3 download" in progress.errors[0]
+    assert progress.chunks_ingested == 2
+    assert snapshots[-1] == 3
+    assert await deps.vector_store.has_accession("AAPL", "ACC-24Q3A")
+
+    # Resume with a fresh process (empty vector store): only the failure is retried.
+    downloader = FakeDownloader()
+    deps = make_deps(downloader)
+    progress = await run_backfill(
+        deps,
+        spec,
+        checkpoint=BackfillCheckpoint.for_spec(spec, root=tmp_path / "ckpt"),
+    )
+    assert downloader.downloaded == ["ACC-25Q3"]
+    assert progress.filings_skipped == 2
+    assert progress.filings_ingested == 1
+    assert progress.summary()["filings_per_second"] > 0
+
+
+@pytest.mark.asyncio
+async def test_backfill_download_only_skips_ingestion(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    spec = BackfillSpec.of(["AAPL"], date(2023, 1, 1), date(2023, 12, 31), download_only=True)
+    deps = make_deps(FakeDownloader())
+    progress = await run_backfill(
+        deps,
+        spec,
+        checkpoint=BackfillCheckpoint.for_spec(spec, root=tmp_path / "ckpt"),
+    )
+
+    assert progress.filings_downloaded == progress.filings_completed == 1
+    assert progress.bytes_stored > 0
+    assert deps.embeddings.embedded == []
+
+
+@pytest.mark.asyncio
+async def test_backfill_ingests_amendments_after_their_original(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    spec = BackfillSpec.of(["AAPL"], date(2024, 1, 1), date(2024, 12, 31))
+    downloader = AmendmentDownloader()
+    deps = make_deps(downloader)
+    checkpoint = BackfillCheckpoint.for_spec(spec, root=tmp_path / "ckpt")
+
+    progress = await run_backfill(deps, spec, checkpoint=checkpoint, ingest_workers=2)
+
+    assert downloader.downloaded == ["ACC-24Q3A", "ACC-24Q3"]
+    assert progress.filings_ingested == 2
+    records = {
+        rec["accession_number"]: rec
+        for rec in map(json.loads, checkpoint.path.read_text().splitlines())
+    }
+    assert records["ACC-24Q3"]["embedded"] == records["ACC-24Q3"]["chunks"] > 0
+    # Every chunk of the amendment reused the original's vectors.
+    assert records["ACC-24Q3A"]["embedded"] == 0
+    # ...and replaced the original, which a rerun doesn't bring back.
+    assert not await deps.vector_store.has_accession("AAPL", "ACC-24Q3")
+    downloader.downloaded.clear()
+    progress = await run_backfill(
+        deps, spec, checkpoint=BackfillCheckpoint.for_spec(spec, root=tmp_path / "fresh")
+    )
+    assert downloader.downloaded == []
+    assert progress.filings_skipped == 2
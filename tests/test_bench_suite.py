@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.suite import (
+    compare_runs,
+    load_corpus,
+    missing_real_size_classes,
+    run_suite,
+    select_run,
+)
+
+
+def test_compare_runs_flags_slowdowns_past_threshold_above_floor() -> None:
+    baseline = {
+        "parse_html[small]": {"best_s": 0.010},
+        "search[small]": {"best_s": 0.010},
+        "has_accession[small]": {"best_s": 0.00001},
+        "gone": {"best_s": 0.010},
+    }
+    candidate = {
+        "parse_html[small]": {"best_s": 0.0114},
+        "search[small]": {"best_s": 0.0125},
+        "has_accession[small]": {"best_s": 0.00004},
+    }
+
+    rows = compare_runs(baseline, candidate, threshold=0.2, floor_seconds=0.0001)
+
+    assert [(r["stage"], r["regressed"]) for r in rows] == [
+        ("parse_html[small]", False),
+        ("search[small]", True),
+        ("has_accession[small]", False),  # 4x slower, but under the noise floor
+    ]
+
+
+def test_select_run_by_index_or_latest_label() -> None:
+    history = [{"label": "main"}, {"label": "pr"}, {"label": "main", "n": 3}]
+
+    assert select_run(history, "-2") == {"label": "pr"}
+    assert select_run(history, "main") == {"label": "main", "n": 3}
+    with pytest.raises(SystemExit):
+        select_run(history, "nope")
+
+
+@pytest.mark.asyncio
+async def test_suite_times_every_stage_on_the_checked_in_corpus() -> None:
+    docs = load_corpus(names=["small"])
+
+    results = await run_suite(docs, repeat=1)
+
+    assert set(results) == {
+        "parse_html[small]",
+        "simple_paragraph_chunker[small]",
+        "embed_many[small]",
+        "upsert_chunks[small]",
+        "search[small]",
+        "has_accession[small]",
+        "metadata_cache.set_latest",
+        "metadata_cache.get_latest",
+    }
+    assert all(row["best_s"] > 0 for row in results.values())
+
+
+def test_corpus_reports_size_classes_without_a_real_filing() -> None:
+    docs = [d for d in load_corpus() if d.synthetic]
+
+    assert {d.name: d.size_class for d in docs} == {
+        "small": "small",
+        "medium": "medium",
+        "large": "large",
+    }
+    assert missing_real_size_classes(docs) == ["small", "medium", "large"]
+    docs[1].synthetic = False
+    assert missing_real_size_classes(docs) == ["small", "large"]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.ingestion.boilerplate import BoilerplateDetector
+from app.parsing.chunk_table import ChunkTable
+from app.parsing.chunking import ChunkSpan
+from app.parsing.models import TenQChunk, TenQSection
+from app.vectorstore.in_memory import InMemoryVectorStore
+
+LEGEND = (
+    "This Quarterly Report on Form 10-Q contains forward-looking statements within the "
+    "meaning of the Private Securities Litigation Reform Act of 1995 that involve risks "
+    "and uncertainties. Actual results may differ materially from those anticipated."
+)
+
+
+def md_obj(accession: str, cik: str = "0000320193"):
+    return SimpleNamespace(
+        ticker="AAPL",
+        cik=cik,
+        accession_number=accession,
+        filing_date="2025-10-31",
+        period_of_report="2025-09-27",
+    )
+
+
+def filing_chunks(accession: str, unique: str, cik: str = "0000320193") -> list[TenQChunk]:
+    md = md_obj(accession, cik)
+    return [
+        TenQChunk("Cover", None, 0, LEGEND, md),
+        TenQChunk("MD&A", "2", 0, f"{unique} " * 40, md),
+    ]
+
+
+def test_detector_drops_text_recurring_across_companies(tmp_path: Path) -> None:
+    path = tmp_path / "boilerplate.json"
+    detector = BoilerplateDetector(path, mode="drop", min_filings=2)
+
+    for i in range(2):
+        chunks = filing_chunks(f"ACC-{i}", f"topic{i}", f"CIK-{i}")
+        kept, report = detector.apply(chunks, f"ACC-{i}", f"CIK-{i}")
+        assert len(kept) == 2
+        assert report.boilerplate_chunks == 0
+
+    kept, report = detector.apply(filing_chunks("ACC-2", "topic2", "CIK-2"), "ACC-2", "CIK-2")
+    assert [c.section_name for c in kept] == ["MD&A"]
+    assert report.boilerplate_chunks == 1
+    assert report.suppression_rate == 0.5
+    assert detector.suppression_rate == 1 / 6
+
+    # state survives a restart once flushed
+    assert not path.exists()
+    detector.flush()
+    reloaded = BoilerplateDetector(path, mode="tag", min_filings=2)
+    tagged, _ = reloaded.apply(filing_chunks("ACC-3", "topic3", "CIK-3"), "ACC-3", "CIK-3")
+    assert [c.is_boilerplate for c in tagged] == [True, False]
+
+
+def test_detector_keeps_a_companys_own_recurring_text(tmp_path: Path) -> None:
+    detector = BoilerplateDetector(tmp_path / "b.json", mode="drop", min_filings=3)
+    risk_factor = "Our supply chain depends on a single contract manufacturer in Asia. " * 6
+
+    for i in range(4):
+        md = md_obj(f"ACC-{i}")
+        chunks = [TenQChunk("Risk Factors", "1A", 0, risk_factor, md)]
+        kept, report = detector.apply(chunks, f"ACC-{i}", md.cik)
+        assert len(kept) == 1
+        assert report.boilerplate_chunks == 0
+
+
+def test_detector_selects_rows_of_chunk_tables(tmp_path: Path) -> None:
+    detector = BoilerplateDetector(tmp_path / "b.json", mode="drop", min_filings=1)
+
+    def table(accession: str) -> ChunkTable:
+        text = LEGEND + " " + "unique " * 30 + accession
+        t = ChunkTable(md_obj(accession))
+        t.add_section(
+            TenQSection("Cover", None, 0, text, md_obj(accession)),
+            [ChunkSpan(0, len(LEGEND), 0), ChunkSpan(len(LEGEND) + 1, len(text), 0)],
+        )
+        return t
+
+    detector.apply(table("ACC-0"), "ACC-0", "CIK-0")
+    kept, report = detector.apply(table("ACC-1"), "ACC-1", "CIK-1")
+
+    assert isinstance(kept, ChunkTable)
+    assert report.boilerplate_chunks == 1
+    assert len(kept) == 1 and kept[0].chunk_index == 1
+
+
+@pytest.mark.asyncio
+async def test_tagged_boilerplate_is_skipped_by_retrieval(tmp_path: Path) -> None:
+    detector = BoilerplateDetector(tmp_path / "b.json", mode="tag", min_filings=1)
+    store = InMemoryVectorStore()
+    for i in range(2):
+        chunks, _ = detector.apply(
+            filing_chunks(f"ACC-{i}", f"topic{i}", f"CIK-{i}"), f"ACC-{i}", f"CIK-{i}"
+        )
+        await store.upsert_chunks(chunks, [[1.0, 0.0] for _ in chunks])
+
+    everything = await store.search([1.0, 0.0], top_k=10)
+    assert sum(r.chunk.is_boilerplate for r in everything) == 1
+    kept = await store.search([1.0, 0.0], top_k=10, exclude_boilerplate=True)
+    assert len(kept) == 3
+    assert not any(r.chunk.is_boilerplate for r in kept)
+
+
+def test_detector_saves_in_batches(tmp_path: Path) -> None:
+    path = tmp_path / "boilerplate.json"
+    detector = BoilerplateDetector(path, mode="drop", min_filings=2, save_every=2)
+
+    detector.apply(filing_chunks("ACC-0", "topic0", "CIK-0"), "ACC-0", "CIK-0")
+    assert not path.exists()
+    detector.apply(filing_chunks("ACC-1", "topic1", "CIK-1"), "ACC-1", "CIK-1")
+    assert path.exists()
+    saved = path.stat().st_mtime_ns
+
+    detector.flush()  # nothing new since the batch was saved
+    assert path.stat().st_mtime_ns == saved
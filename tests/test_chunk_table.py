@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.parsing.chunk_table import ChunkTable
+from app.parsing.chunking import token_chunk_spans
+from app.parsing.models import TenQSection
+from app.vectorstore.in_memory import InMemoryVectorStore
+
+
+def md_obj(ticker: str, cik: str, accession: str):
+    return SimpleNamespace(
+        ticker=ticker,
+        cik=cik,
+        accession_number=accession,
+        filing_date="2025-10-31",
+        period_of_report="2025-09-27",
+    )
+
+
+def _table(md) -> ChunkTable:
+    table = ChunkTable(md)
+    for order, (name, item) in enumerate([("MD&A", "2"), ("Risk Factors", "1A")]):
+        text = " ".join(f"{name} sentence {i}." for i in range(40))
+        section = TenQSection(
+            name=name, item_number=item, order_index=order, text=text, metadata=md
+        )
+        table.add_section(section, token_chunk_spans(text, max_tokens=32, overlap_tokens=8))
+    return table
+
+
+def test_chunk_table_materializes_chunks_on_access() -> None:
+    md = md_obj("AAPL", "0000320193", "ACC-1")
+    table = _table(md)
+
+    chunks = list(table)
+    assert len(chunks) == len(table) > 2
+    assert {c.section_name for c in chunks} == {"MD&A", "Risk Factors"}
+    assert all(c.metadata is md for c in chunks)
+
+    first = table[0]
+    assert first.chunk_index == 0
+    assert first.text == table.text(0)
+    assert table.text(0, max_chars=5) == first.text[:5]
+    assert table[-1].section_name == "Risk Factors"
+    assert [c.text for c in table[1:3]] == [c.text for c in chunks[1:3]]
+
+    with pytest.raises(IndexError):
+        table[len(table)]
+
+
+@pytest.mark.asyncio
+async def test_vectorstore_accepts_chunk_tables() -> None:
+    store = InMemoryVectorStore()
+    table = _table(md_obj("AAPL", "0000320193", "ACC-1"))
+    embeddings = [[1.0, 0.0] if i == 3 else [0.0, 1.0] for i in range(len(table))]
+
+    await store.upsert_chunks(table, embeddings)
+
+    assert await store.has_accession("aapl", "ACC-1") is True
+    results = await store.search([1.0, 0.0], top_k=2)
+    assert len(results) == 2
+    assert results[0].chunk.text == table.text(3)
+
+    risk = await store.search([1.0, 0.0], top_k=100, section_name="Risk Factors")
+    assert risk and all(r.chunk.section_name == "Risk Factors" for r in risk)
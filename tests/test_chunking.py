@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.parsing.chunking import (
+    estimate_tokens,
+    token_chunk_spans,
+    token_chunker,
+)
+from app.parsing.models import TenQSection
+
+
+def md_obj(ticker: str, cik: str, accession: str):
+    return SimpleNamespace(
+        ticker=ticker,
+        cik=cik,
+        accession_number=accession,
+        filing_date="2025-10-31",
+        period_of_report="2025-09-27",
+    )
+
+
+def _sentences(n: int) -> str:
+    return "\n".join(f"Revenue grew in segment number {i} during the quarter." for i in range(n))
+
+
+def test_token_chunk_spans_respect_budget_and_sentence_boundaries() -> None:
+    text = _sentences(200)
+    spans = token_chunk_spans(text, max_tokens=64, overlap_tokens=16)
+
+    assert len(spans) > 1
+    for span in spans:
+        assert span.tokens <= 64
+        chunk = span.text_of(text)
+        assert chunk.startswith("Revenue")
+        assert chunk.endswith(".")
+
+    # consecutive spans overlap but always make progress
+    for prev, cur in zip(spans, spans[1:]):
+        assert prev.start < cur.start <= prev.end
+    assert spans[-1].end == len(text)
+
+
+def test_token_chunk_spans_without_overlap_tile_the_text() -> None:
+    text = _sentences(50)
+    spans = token_chunk_spans(text, max_tokens=40, overlap_tokens=0)
+
+    for prev, cur in zip(spans, spans[1:]):
+        assert cur.start > prev.end
+
+
+def test_token_chunk_spans_hard_splits_long_runs() -> None:
+    text = "x" * 1_000
+    spans = token_chunk_spans(text, max_tokens=50, overlap_tokens=10)
+
+    assert all(s.tokens <= 50 for s in spans)
+    assert "".join(s.text_of(text) for s in spans) == text
+
+
+@pytest.mark.parametrize("max_tokens,overlap", [(0, 0), (10, 10), (10, -1)])
+def test_token_chunk_spans_rejects_bad_budgets(max_tokens: int, overlap: int) -> None:
+    with pytest.raises(ValueError):
+        token_chunk_spans("abc.", max_tokens=max_tokens, overlap_tokens=overlap)
+
+
+def test_token_chunker_builds_indexed_chunks() -> None:
+    section = TenQSection(
+        name="MD&A",
+        item_number="2",
+        order_index=0,
+        text=_sentences(100),
+        metadata=md_obj("AAPL", "0000320193", "ACC-1"),
+    )
+
+    chunks = token_chunker(section, max_tokens=128, overlap_tokens=32)
+
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+    assert all(c.section_name == "MD&A" and c.section_item == "2" for c in chunks)
+    assert all(estimate_tokens(c.text) <= 128 for c in chunks)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.edgar.cik_index import CikIndex, build_index_bytes
+from app.edgar.cik_resolver import CikResolver
+
+TICKERS = {
+    "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    "1": {"cik_str": 789019, "ticker": "MSFT", "title": "MICROSOFT CORP"},
+    "2": {"cik_str": 1045810, "ticker": "NVDA", "title": "NVIDIA CORP"},
+    "3": {"cik_str": 1418091, "ticker": "APLD", "title": "Applied Digital Corp."},
+    "4": {"cik_str": 6951, "ticker": "AMAT", "title": "APPLIED MATERIALS INC /DE"},
+    "5": {"cik_str": 1652044, "ticker": "GOOGL", "title": "Alphabet Inc."},
+    "6": {"cik_str": 1652044, "ticker": "GOOG", "title": "Alphabet Inc."},
+}
+
+
+class FakeClient:
+    def __init__(self, payload: dict) -> None:
+        self.payload = payload
+        self.calls = 0
+        self.gate: asyncio.Event | None = None
+
+    async def get_json(self, path: str, data_host: bool = False):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return self.payload
+
+
+def test_binary_index_lookup_and_prefix_search() -> None:
+    index = CikIndex(
+        build_index_bytes(
+            ((e["ticker"], e["cik_str"], e["title"]) for e in TICKERS.values()), fetched_at=1.0
+        )
+    )
+    assert len(index) == 7
+    assert index.lookup("aapl").cik_str == "0000320193"
+    assert index.lookup("GOOG").company_name == "Alphabet Inc."
+    assert index.lookup("ZZZZ") is None
+    assert [r.ticker for r in index.ticker_prefix("goo")] == ["GOOG", "GOOGL"]
+    assert [r.ticker for r in index.name_prefix("appl")] == ["AAPL", "APLD", "AMAT"]
+    assert index.name_prefix("applied m")[0].ticker == "AMAT"
+
+
+@pytest.mark.asyncio
+async def test_resolver_persists_index_for_warm_start(tmp_path: Path) -> None:
+    path = tmp_path / "cik_index.bin"
+    client = FakeClient(TICKERS)
+    resolver = CikResolver(client, index_path=path)  # type: ignore[arg-type]
+
+    results = await asyncio.gather(*(resolver.resolve("MSFT") for _ in range(10)))
+    assert {r.cik_int for r in results} == {789019}
+    assert client.calls == 1
+    assert path.exists()
+
+    cold = FakeClient(TICKERS)
+    restarted = CikResolver(cold, index_path=path)  # type: ignore[arg-type]
+    assert (await restarted.resolve("nvda")).cik_int == 1045810
+    assert cold.calls == 0
+
+    batch = await restarted.resolve_many(["aapl", "nope"])
+    assert batch["AAPL"].cik_int == 320193 and batch["NOPE"] is None
+    assert [r.ticker for r in await restarted.search("app", limit=3)] == ["AAPL", "APLD", "AMAT"]
+    with pytest.raises(KeyError):
+        await restarted.resolve("NOPE")
+
+
+@pytest.mark.asyncio
+async def test_stale_index_is_served_while_refreshing_in_background(tmp_path: Path) -> None:
+    path = tmp_path / "cik_index.bin"
+    await CikResolver(FakeClient(TICKERS), index_path=path).refresh()  # type: ignore[arg-type]
+
+    updated = dict(TICKERS, **{"7": {"cik_str": 1, "ticker": "NEWCO", "title": "New Co"}})
+    client = FakeClient(updated)
+    client.gate = asyncio.Event()
+    resolver = CikResolver(client, index_path=path)  # type: ignore[arg-type]
+    resolver._index.fetched_at = 0.0  # pretend the TTL expired
+
+    # Readers are not blocked by the in-flight refresh.
+    assert (await asyncio.wait_for(resolver.resolve("AAPL"), 1)).cik_int == 320193
+    assert (await resolver.resolve_many(["NEWCO"]))["NEWCO"] is None
+    assert client.calls == 1
+
+    client.gate.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert (await resolver.resolve("NEWCO")).cik_int == 1
+    assert client.calls == 1
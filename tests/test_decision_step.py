@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents import orchestrator as orch
+from app.agents.models import (
+    CompanyProfile,
+    DecisionOutput,
+    DecisionVerdict,
+    FinancialSummary,
+    GuidanceSummary,
+    LiquiditySummary,
+    LiquidityView,
+    RiskItem,
+    RiskView,
+    TenQInsights,
+)
+from app.agents.result_cache import AgentResultCache
+from app.edgar.models import TenQMetadata
+
+
+def _insights(summary: str = "steady quarter") -> TenQInsights:
+    return TenQInsights(
+        company_profile=CompanyProfile(name="Apple Inc.", ticker="AAPL", cik="0000320193"),
+        filing_metadata=TenQMetadata(
+            ticker="AAPL",
+            cik="0000320193",
+            company_name="Apple Inc.",
+            form_type="10-Q",
+            filing_date=date(2025, 10, 31),
+            period_of_report=date(2025, 9, 27),
+            accession_number="ACC-1",
+            primary_document="doc.htm",
+        ),
+        high_level_summary=summary,
+        financial_summary=FinancialSummary(),
+        risk_summary=[RiskItem(title="FX", description="currency headwinds")],
+        liquidity_and_capital_structure=LiquiditySummary(narrative="ample cash"),
+        guidance_and_outlook=GuidanceSummary(narrative=""),
+    )
+
+
+DECISION = DecisionOutput(
+    decision="hold",
+    confidence=0.6,
+    time_horizon="12m",
+    positives=["services growth"],
+    negatives=[],
+    uncertainties=[],
+    risk_profile="moderate",
+)
+
+
+@pytest.mark.asyncio
+async def test_decision_is_cached_by_insights_hash(tmp_path: Path, monkeypatch) -> None:
+    prompts: list[str] = []
+
+    async def run(prompt, deps):
+        prompts.append(prompt)
+        return SimpleNamespace(output=DECISION)
+
+    monkeypatch.setattr(orch, "decision_agent", SimpleNamespace(run=run))
+    deps = SimpleNamespace(agent_cache=AgentResultCache(tmp_path / "a.sqlite3", model="m1"))
+
+    assert await orch.run_decision(deps, _insights()) == DECISION
+    assert await orch.run_decision(deps, _insights()) == DECISION
+    assert len(prompts) == 1
+    assert _insights().model_dump_json() in prompts[0]
+
+    # different insights, or another model, miss the cache
+    await orch.run_decision(deps, _insights("weaker quarter"))
+    deps.agent_cache = AgentResultCache(tmp_path / "a.sqlite3", model="m2")
+    await orch.run_decision(deps, _insights())
+    assert len(prompts) == 3
+
+
+def test_agent_results_are_keyed_by_decision_mode(tmp_path: Path) -> None:
+    path = tmp_path / "a.sqlite3"
+    with sqlite3.connect(path) as conn:  # a cache from before decision modes
+        conn.execute(
+            "CREATE TABLE agent_results (ticker TEXT, accession_number TEXT, model TEXT, "
+            "insights TEXT, decision TEXT, created_at REAL)"
+        )
+    cache = AgentResultCache(path, model="m1")
+
+    cache.put("AAPL", "ACC-1", "single", _insights(), DECISION)
+
+    assert cache.get("AAPL", "ACC-1", "single") == (_insights(), DECISION)
+    assert cache.get("AAPL", "ACC-1", "split") is None
+
+
+@pytest.mark.asyncio
+async def test_split_mode_runs_sub_analyses_concurrently_and_merges(monkeypatch) -> None:
+    started: list[str] = []
+    all_started = asyncio.Event()
+
+    def agent(name, output):
+        async def run(prompt, deps):
+            started.append(name)
+            if len(started) == 3:
+                all_started.set()
+            # Each agent waits for the others: this only finishes if they overlap.
+            await asyncio.wait_for(all_started.wait(), timeout=1)
+            return SimpleNamespace(output=output)
+
+        return SimpleNamespace(run=run)
+
+    monkeypatch.setattr(orch.get_settings(), "decision_mode", "split")
+    monkeypatch.setattr(
+        orch,
+        "verdict_agent",
+        agent(
+            "verdict",
+            DecisionVerdict(
+                decision="buy", confidence=0.7, time_horizon="6m", positives=["margin"]
+            ),
+        ),
+    )
+    monkeypatch.setattr(
+        orch,
+        "risk_agent",
+        agent(
+            "risk",
+            RiskView(negatives=["FX"], uncertainties=["tariffs"], risk_profile="Moderate."),
+        ),
+    )
+    monkeypatch.setattr(
+        orch,
+        "liquidity_agent",
+        agent(
+            "liquidity",
+            LiquidityView(negatives=["FX"], uncertainties=["buybacks"], assessment="Strong."),
+        ),
+    )
+
+    decision = await orch.run_decision(SimpleNamespace(agent_cache=None), _insights())
+
+    assert sorted(started) == ["liquidity", "risk", "verdict"]
+    assert decision.decision == "buy" and decision.positives == ["margin"]
+    assert decision.negatives == ["FX"]
+    assert decision.uncertainties == ["tariffs", "buybacks"]
+    assert decision.risk_profile == "Moderate. Liquidity: Strong."
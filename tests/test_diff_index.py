@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.agents.insights_agent import retrieve_changed_chunks
+from app.ingestion.boilerplate import BoilerplateDetector
+from app.ingestion.diff_index import ChunkChange, ChunkDiffIndex, diff_filings
+from app.ingestion.minhash import MinHasher, estimate_jaccard
+from app.ingestion.pipeline import ingest_parsed
+from app.parsing.models import TenQChunk
+from app.vectorstore.in_memory import InMemoryVectorStore
+
+
+def md_obj(ticker: str, cik: str, accession: str):
+    return SimpleNamespace(
+        ticker=ticker,
+        cik=cik,
+        accession_number=accession,
+        filing_date="2025-10-31",
+        period_of_report="2025-09-27",
+    )
+
+
+def chunk(item: str, name: str, idx: int, text: str, accession: str) -> TenQChunk:
+    return TenQChunk(
+        section_name=name,
+        section_item=item,
+        chunk_index=idx,
+        text=text,
+        metadata=md_obj("AAPL", "0000320193", accession),
+    )
+
+
+def paragraph(topic: str, n: int = 60) -> str:
+    return " ".join(f"{topic} word{i}" for i in range(n))
+
+
+def test_minhash_similarity_tracks_overlap() -> None:
+    hasher = MinHasher(num_perm=128)
+    base = paragraph("supply")
+    tweaked = base.replace("word10 ", "changed ")
+    other = paragraph("litigation")
+
+    assert estimate_jaccard(hasher.signature(base), hasher.signature(base)) == 1.0
+    assert estimate_jaccard(hasher.signature(base), hasher.signature(tweaked)) > 0.6
+    assert estimate_jaccard(hasher.signature(base), hasher.signature(other)) < 0.2
+
+
+def test_diff_filings_classifies_chunks(tmp_path: Path) -> None:
+    stable = paragraph("liquidity")
+    risk_old = paragraph("tariffs")
+    risk_new = risk_old.replace("word30 tariffs word31", "materially higher tariffs")
+    removed = paragraph("pandemic")
+    added = paragraph("cybersecurity incident")
+
+    prior = [
+        chunk("2", "MD&A", 0, stable, "ACC-Q2"),
+        chunk("1A", "Risk Factors", 0, risk_old, "ACC-Q2"),
+        chunk("1A", "Risk Factors", 1, removed, "ACC-Q2"),
+    ]
+    current = [
+        chunk("2", "MD&A", 0, stable, "ACC-Q3"),
+        chunk("1A", "Risk Factors", 0, risk_new, "ACC-Q3"),
+        chunk("1A", "Risk Factors", 1, added, "ACC-Q3"),
+    ]
+
+    diff = diff_filings("aapl", "ACC-Q3", current, "ACC-Q2", prior)
+
+    assert diff.unchanged_count == 1
+    assert [e.text for e in diff.of(ChunkChange.CHANGED)] == [risk_new]
+    assert [e.text for e in diff.of(ChunkChange.NEW)] == [added]
+    assert [e.text for e in diff.of(ChunkChange.REMOVED)] == [removed]
+    assert diff.changed_sections == ["Risk Factors"]
+
+    index = ChunkDiffIndex(tmp_path / "diffs")
+    index.put(diff)
+    assert index.get_for("AAPL", "ACC-Q3") == diff
+    assert index.get_for("AAPL", "ACC-Q2") is None
+
+
+@pytest.mark.asyncio
+async def test_changed_chunks_come_from_the_analysed_filings_diff(tmp_path: Path) -> None:
+    q2 = [chunk("1A", "Risk Factors", 0, paragraph("tariffs"), "ACC-Q2")]
+    q3 = [chunk("1A", "Risk Factors", 0, paragraph("recall"), "ACC-Q3")]
+    q4 = [chunk("1A", "Risk Factors", 0, paragraph("strike"), "ACC-Q4")]
+    index = ChunkDiffIndex(tmp_path / "diffs")
+    # Backfills may write the later pair first.
+    index.put(diff_filings("AAPL", "ACC-Q4", q4, "ACC-Q3", q3))
+    index.put(diff_filings("AAPL", "ACC-Q3", q3, "ACC-Q2", q2))
+
+    def ctx(accession: str | None) -> SimpleNamespace:
+        return SimpleNamespace(deps=SimpleNamespace(diff_index=index, accession_number=accession))
+
+    q4_new = await retrieve_changed_chunks(ctx("ACC-Q4"), "AAPL", ChunkChange.NEW)
+    assert [e.text for e in q4_new] == [q4[0].text]
+    q3_new = await retrieve_changed_chunks(ctx("ACC-Q3"), "AAPL", ChunkChange.NEW)
+    assert [e.text for e in q3_new] == [q3[0].text]
+    assert await retrieve_changed_chunks(ctx(None), "AAPL") == []
+
+
+class _Embeddings:
+    async def embed_many(self, texts):
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_text_turning_boilerplate_is_not_reported_removed(tmp_path: Path) -> None:
+    legend = paragraph("forward-looking statements")
+    stable = paragraph("liquidity")
+    deps = SimpleNamespace(
+        vector_store=InMemoryVectorStore(),
+        embeddings=_Embeddings(),
+        boilerplate=BoilerplateDetector(None, mode="drop", min_filings=2),
+        diff_index=ChunkDiffIndex(tmp_path / "diffs"),
+    )
+
+    def filing(ticker: str, cik: str, accession: str) -> tuple[list[TenQChunk], Any]:
+        md = md_obj(ticker, cik, accession)
+        texts = [legend, stable] if ticker == "AAPL" else [legend]
+        return [TenQChunk("Cover", None, i, t, md) for i, t in enumerate(texts)], md
+
+    await ingest_parsed(deps, *filing("MSFT", "0000789019", "ACC-M"))
+    prior = await ingest_parsed(deps, *filing("AAPL", "0000320193", "ACC-Q2"))
+    assert prior.boilerplate.boilerplate_chunks == 0
+    # A second other company makes the legend boilerplate for AAPL.
+    await ingest_parsed(deps, *filing("GOOG", "0001652044", "ACC-G"))
+
+    chunks, md = filing("AAPL", "0000320193", "ACC-Q3")
+    stats = await ingest_parsed(deps, chunks, md, prior_accession="ACC-Q2")
+
+    assert stats.boilerplate.boilerplate_chunks == 1
+    assert stats.prior_diff is not None
+    assert stats.prior_diff.entries == []
+    assert stats.prior_diff.unchanged_count == 1
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+
+import httpx
+import pytest
+
+from app.edgar.client import EdgarHttpClient, RateLimiter, parse_retry_after
+from app.edgar.http_cache import HttpCache
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_burst_then_paces() -> None:
+    limiter = RateLimiter(max_rps=20)
+
+    t0 = monotonic()
+    await asyncio.gather(*(limiter.wait() for _ in range(20)))
+    burst_elapsed = monotonic() - t0
+    assert burst_elapsed < 0.05
+
+    t0 = monotonic()
+    await asyncio.gather(*(limiter.wait() for _ in range(4)))
+    assert monotonic() - t0 >= 0.15  # 4 tokens at 20/s
+
+
+def test_rate_limiter_adapts_to_throttling() -> None:
+    limiter = RateLimiter(max_rps=8, min_rps=1)
+    limiter.throttle()
+    limiter.throttle()
+    assert limiter.rate == 2.0
+    limiter.throttle()
+    limiter.throttle()
+    assert limiter.rate == 1.0  # floored at min_rps
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == 8.0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests_out_after_retry_after(monkeypatch) -> None:
+    import app.edgar.client as client_mod
+
+    delays: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr(client_mod, "monotonic", lambda: 100.0)
+    monkeypatch.setattr(client_mod.asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter(max_rps=8)
+    limiter.throttle(3.0)  # rate 8 -> 4/s
+
+    for _ in range(20):
+        await limiter.wait()
+
+    assert delays[0] == pytest.approx(3.25)
+    gaps = [b - a for a, b in zip(delays, delays[1:])]
+    assert gaps == pytest.approx([0.25] * 19)
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_client_retries_429_honouring_retry_after() -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"ok": True})
+
+    limiter = RateLimiter(max_rps=100)
+    client = EdgarHttpClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        rate_limiter=limiter,
+    )
+    try:
+        assert await client.get_json("files/company_tickers.json") == {"ok": True}
+    finally:
+        await client.aclose()
+
+    assert calls == 3
+    assert limiter.rate < 100
+
+
+@pytest.mark.asyncio
+async def test_client_gives_up_after_max_retries() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, headers={"Retry-After": "0"})
+
+    client = EdgarHttpClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        rate_limiter=RateLimiter(max_rps=100),
+    )
+    client._max_retries = 1
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_text("https://www.sec.gov/x")
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_fails_instead_of_waiting_out_a_long_retry_after() -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(429, headers={"Retry-After": "3600"})
+
+    limiter = RateLimiter(max_rps=100)
+    client = EdgarHttpClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        rate_limiter=limiter,
+    )
+    client._max_retry_after = 60.0
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            await asyncio.wait_for(client.get_text("https://www.sec.gov/x"), timeout=5)
+    finally:
+        await client.aclose()
+
+    assert calls == 1
+    assert limiter.rate < 100
+    # Other callers are not blocked for the hour.
+    await asyncio.wait_for(limiter.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_client_revalidates_cached_json_with_conditional_get(tmp_path) -> None:
+    seen_headers: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            json={"cik": "0000320193"},
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Oct 2025 00:00:00 GMT"},
+        )
+
+    cache = HttpCache(tmp_path / "http")
+    client = EdgarHttpClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        rate_limiter=RateLimiter(max_rps=100),
+        http_cache=cache,
+    )
+    try:
+        first = await client.get_json("submissions/CIK0000320193.json", data_host=True)
+        second = await client.get_json("submissions/CIK0000320193.json", data_host=True)
+    finally:
+        await client.aclose()
+
+    assert first == second == {"cik": "0000320193"}
+    assert "If-None-Match" not in seen_headers[0]
+    assert seen_headers[1]["If-None-Match"] == '"v1"'
+    assert seen_headers[1]["If-Modified-Since"] == "Wed, 01 Oct 2025 00:00:00 GMT"
+    assert (cache.stats.misses, cache.stats.revalidated) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_client_serves_fresh_cache_entries_without_request(tmp_path) -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json={"n": calls}, headers={"ETag": '"x"'})
+
+    cache = HttpCache(tmp_path / "http", max_age_seconds=60)
+    client = EdgarHttpClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        rate_limiter=RateLimiter(max_rps=100),
+        http_cache=cache,
+    )
+    try:
+        assert await client.get_json("files/company_tickers.json") == {"n": 1}
+        assert await client.get_json("files/company_tickers.json") == {"n": 1}
+    finally:
+        await client.aclose()
+
+    assert calls == 1
+    assert cache.stats.fresh_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_default_client_pools_per_sec_host() -> None:
+    client = EdgarHttpClient(rate_limiter=RateLimiter(max_rps=100))
+    try:
+        stats = client.pool_stats()
+    finally:
+        await client.aclose()
+
+    assert set(stats) == {"www.sec.gov", "data.sec.gov"}
+    assert all(s == {"requests": 0, "in_flight": 0, "http2": 0} for s in stats.values())
+    assert client.sec_base_url == "https://www.sec.gov"
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_requests_in_flight_until_the_body_is_read() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text="a\nb\n")
+
+    client = EdgarHttpClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        rate_limiter=RateLimiter(max_rps=100),
+    )
+    try:
+        lines = client.stream_lines("https://www.sec.gov/Archives/edgar/full-index/form.idx")
+        assert await lines.__anext__() == "a"
+        assert client.pool_stats()["www.sec.gov"]["in_flight"] == 1
+        assert [line async for line in lines] == ["b"]
+        await client.get_text("https://www.sec.gov/x")
+        stats = client.pool_stats()["www.sec.gov"]
+    finally:
+        await client.aclose()
+
+    assert stats == {"requests": 2, "in_flight": 0, "http2": 0}
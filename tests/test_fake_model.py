@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+from pydantic_ai import Agent
+
+from app.agents.fake_model import FakeLLM, build_model, parse_tool_calls
+from app.agents.insights_agent import build_insights_prompt
+from app.agents.models import DecisionOutput, TenQInsights
+
+
+def test_parse_tool_calls() -> None:
+    assert parse_tool_calls("a, b+c ,") == [["a"], ["b", "c"]]
+    assert parse_tool_calls("") == []
+
+
+def test_build_model_passes_real_model_names_through() -> None:
+    assert build_model("openai:gpt-5") == "openai:gpt-5"
+    assert build_model("fake").model_name == "fake"
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_follows_tool_pattern_and_returns_valid_output() -> None:
+    calls: list[tuple[str, str]] = []
+    agent = Agent(
+        FakeLLM(tool_calls="lookup+missing_tool,lookup+changed", seed=3).model(),
+        output_type=TenQInsights,
+    )
+
+    @agent.tool_plain
+    def lookup(ticker: str, query: str, top_k: int = 5) -> list[str]:
+        calls.append(("lookup", ticker))
+        return []
+
+    @agent.tool_plain
+    def changed(ticker: str) -> list[str]:
+        calls.append(("changed", ticker))
+        return []
+
+    result = await agent.run(build_insights_prompt("MSFT"))
+
+    # tools the agent lacks are skipped; "+" tools go out in one response
+    assert calls == [("lookup", "MSFT"), ("lookup", "MSFT"), ("changed", "MSFT")]
+    assert isinstance(result.output, TenQInsights)
+    assert result.output.company_profile.ticker == "MSFT"
+
+    again = await agent.run(build_insights_prompt("MSFT"))
+    assert again.output == result.output
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_decision_respects_schema_bounds() -> None:
+    agent = Agent(FakeLLM(latency_seconds=0.01).model(), output_type=DecisionOutput)
+    for ticker in ("AAPL", "MSFT", "NVDA"):
+        out = (await agent.run(f'INSIGHTS_JSON:\n{{"ticker": "{ticker}"}}')).output
+        assert 0.0 <= out.confidence <= 1.0
+        assert out.decision in ("buy", "sell", "hold")
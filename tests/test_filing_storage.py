@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import gzip
+import io
+from datetime import date
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.edgar.client import EdgarHttpClient, RateLimiter
+from app.edgar.downloader import FilingDownloader
+from app.edgar.models import TenQMetadata
+from app.edgar.storage import LocalFileStorage, open_text_file
+from app.parsing.tenq_parser import TenQParser
+
+HTML = (
+    "<html><head><style>p {color: red}</style><script>var x = 1;</script></head><body>"
+    "<p>Item 1. Financial Statements</p><p>Revenue was $10 &amp; rising.</p>"
+    "<p>Item 2. Management&#8217;s Discussion</p><div>Liquidity <b>remained</b> strong.</div>"
+    "</body></html>"
+)
+
+
+def _meta() -> TenQMetadata:
+    return TenQMetadata(
+        ticker="AAPL",
+        cik="0000320193",
+        company_name="Apple Inc.",
+        form_type="10-Q",
+        filing_date=date(2025, 10, 31),
+        period_of_report=date(2025, 9, 27),
+        accession_number="0000320193-25-000001",
+        primary_document="doc.htm",
+    )
+
+
+def test_gzip_storage_round_trip(tmp_path: Path) -> None:
+    storage = LocalFileStorage(tmp_path, compression="gzip")
+    rel = storage.stored_path("filings/x/doc.htm")
+    assert rel.endswith(".htm.gz")
+
+    with storage.open_write(rel) as sink:
+        sink.write(b"hello ")
+        sink.write(b"world")
+
+    assert gzip.decompress((tmp_path / rel).read_bytes()) == b"hello world"
+    with storage.open_text(rel) as fh:
+        assert fh.read() == "hello world"
+
+
+def test_open_write_leaves_nothing_on_failure(tmp_path: Path) -> None:
+    storage = LocalFileStorage(tmp_path, compression="gzip")
+    rel = storage.stored_path("filings/x/doc.htm")
+
+    with pytest.raises(RuntimeError):
+        with storage.open_write(rel) as sink:
+            sink.write(b"partial")
+            raise RuntimeError("connection dropped")
+
+    assert not storage.exists(rel)
+    assert list((tmp_path / "filings/x").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_downloader_streams_into_compressed_storage(tmp_path: Path) -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        assert request.url.path.endswith("/320193/000032019325000001/doc.htm")
+        return httpx.Response(200, content=HTML.encode("utf-8"))
+
+    client = EdgarHttpClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        rate_limiter=RateLimiter(max_rps=100),
+    )
+    storage = LocalFileStorage(tmp_path, compression="gzip")
+    downloader = FilingDownloader(client, storage)
+    try:
+        rel = await downloader.download_primary_html(_meta())
+        again = await downloader.download_primary_html(_meta())
+        assert calls == 1
+        forced = await downloader.download_primary_html(_meta(), force=True)
+    finally:
+        await client.aclose()
+
+    assert rel == again == forced and rel.endswith(".gz")
+    assert calls == 2
+    with open_text_file(tmp_path / rel) as fh:
+        assert fh.read() == HTML
+
+
+def test_parse_stream_matches_parse_html() -> None:
+    parser = TenQParser()
+    from_dom = parser.parse_html(HTML, _meta())
+    from_stream = parser.parse_stream(io.StringIO(HTML), _meta(), chunk_size=7)
+
+    assert [c.text for c in from_stream] == [c.text for c in from_dom]
+    assert [c.section_item for c in from_stream] == ["1", "2"]
+    assert "var x" not in " ".join(from_stream.texts())
+    assert "Revenue was $10 & rising." in from_stream.text(0)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.edgar.client import EdgarHttpClient, RateLimiter
+from app.edgar.form_index import FormIndex, parse_master_index
+from app.edgar.metadata_cache import TenQMetadataCache
+from app.edgar.models import TenQMetadata
+from app.ingestion.watchlist import refresh_watchlist
+
+DAILY_IDX = """Description:           Daily Index of EDGAR Dissemination Feed by Company Name
+Last Data Received:    Oct 31, 2025
+Comments:              webmaster@sec.gov
+Anonymous FTP:         ftp://ftp.sec.gov/edgar/
+
+CIK|Company Name|Form Type|Date Filed|File Name
+--------------------------------------------------------------------------------
+320193|Apple Inc.|10-Q|20251031|edgar/data/320193/0000320193-25-000073.txt
+789019|MICROSOFT CORP|8-K|20251031|edgar/data/789019/0000950170-25-000001.txt
+1652044|Alphabet Inc.|10-Q/A|20251031|edgar/data/1652044/0001652044-25-000099.txt
+"""
+
+
+def test_parse_master_index_keeps_requested_forms() -> None:
+    rows = list(parse_master_index(DAILY_IDX.splitlines()))
+    assert [(r.cik, r.form_type, r.accession_number) for r in rows] == [
+        (320193, "10-Q", "0000320193-25-000073"),
+        (1652044, "10-Q/A", "0001652044-25-000099"),
+    ]
+    assert rows[0].date_filed == date(2025, 10, 31)
+    assert len(list(parse_master_index(DAILY_IDX.splitlines(), forms=None))) == 3
+
+
+def _index(tmp_path: Path, requested: list[str]) -> tuple[FormIndex, EdgarHttpClient]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path.rsplit("/", 1)[-1])
+        if request.url.path.endswith("master.20251031.idx"):
+            return httpx.Response(200, text=DAILY_IDX)
+        return httpx.Response(404)
+
+    client = EdgarHttpClient(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        rate_limiter=RateLimiter(max_rps=100),
+    )
+    return FormIndex(client, tmp_path / "form_index.json", lookback_days=7), client
+
+
+@pytest.mark.asyncio
+async def test_form_index_fetches_each_business_day_once(tmp_path: Path) -> None:
+    requested: list[str] = []
+    index, client = _index(tmp_path, requested)
+    try:
+        added = await index.refresh(today=date(2025, 11, 3))  # a Monday
+        assert len(added) == 2
+        # Oct 27-31 and Nov 3; the weekend is skipped
+        assert len(requested) == 6
+
+        assert index.has_newer(320193, date(2025, 8, 1))
+        assert not index.has_newer(320193, date(2025, 10, 31))
+        assert index.filers("10-Q", date(2025, 10, 1)) == {320193}
+
+        requested.clear()
+        await index.refresh(today=date(2025, 11, 3))
+        # only the not-yet-published recent days are retried
+        assert requested == ["master.20251103.idx"]
+    finally:
+        await client.aclose()
+
+    reloaded = FormIndex(client, tmp_path / "form_index.json")
+    assert [e.accession_number for e in reloaded.filings_for(1652044)] == ["0001652044-25-000099"]
+
+
+class FakeFormIndex:
+    def __init__(self, newer_ciks: set[int]) -> None:
+        self.newer_ciks = newer_ciks
+
+    async def refresh(self, today=None):
+        return []
+
+    def has_newer(self, cik: int, after: date) -> bool:
+        return cik in self.newer_ciks
+
+
+@pytest.mark.asyncio
+async def test_refresh_watchlist_only_polls_tickers_with_new_filings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = TenQMetadataCache(tmp_path / "latest.json")
+    for ticker, cik in [("AAPL", "0000320193"), ("MSFT", "0000789019")]:
+        cache.set_latest(
+            ticker,
+            TenQMetadata(
+                ticker=ticker,
+                cik=cik,
+                company_name=ticker,
+                form_type="10-Q",
+                filing_date=date(2025, 8, 1),
+                period_of_report=date(2025, 6, 28),
+                accession_number=f"{ticker}-OLD",
+                primary_document="q.htm",
+            ),
+        )
+
+    polled: list[str] = []
+
+    async def fake_refresh(deps, ticker, cache, **kwargs):
+        polled.append(ticker)
+        return None, SimpleNamespace()
+
+    monkeypatch.setattr("app.ingestion.watchlist.refresh_latest_tenq", fake_refresh)
+    deps = SimpleNamespace(form_index=FakeFormIndex(newer_ciks={320193}))
+
+    report = await refresh_watchlist(deps, ["aapl", "MSFT", "NVDA"], cache=cache)
+
+    assert sorted(polled) == ["AAPL", "NVDA"]  # NVDA isn't cached yet
+    assert report.up_to_date == ["MSFT"]
+    assert sorted(report.refreshed) == ["AAPL", "NVDA"]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import pytest
+
+import app.agents.orchestrator as orch
+from benchmarks.suite import IMPORT_BUDGETS, measure_import
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS))
+def test_cold_import_defers_heavy_modules(module: str) -> None:
+    # Without OPENAI_API_KEY / SEC_USER_AGENT: importing must not read settings.
+    # The time budget itself is checked by `python -m benchmarks.suite imports`.
+    assert measure_import(module, repeat=1)["deferred_loaded"] == []
+
+
+@pytest.mark.asyncio
+async def test_agents_are_built_once_on_first_access() -> None:
+    agent = await orch._agent("insights_agent")
+    assert orch.insights_agent is agent
+    assert await orch._agent("decision_agent") is orch.decision_agent
+    with pytest.raises(AttributeError):
+        orch.no_such_agent
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.edgar.models import TenQMetadata
+from app.edgar.submissions import is_amendment_of
+from app.ingestion.pipeline import embed_and_upsert
+from app.parsing.models import TenQChunk
+from app.vectorstore.in_memory import InMemoryVectorStore
+
+
+def meta(accession: str, form_type: str = "10-Q") -> TenQMetadata:
+    return TenQMetadata(
+        ticker="AAPL",
+        cik="0000320193",
+        company_name="Apple Inc.",
+        form_type=form_type,
+        filing_date=date(2025, 10, 31),
+        period_of_report=date(2025, 9, 27),
+        accession_number=accession,
+        primary_document="doc.htm",
+    )
+
+
+def chunks_for(md: TenQMetadata, texts: dict[str, list[str]]) -> list[TenQChunk]:
+    return [
+        TenQChunk(
+            section_name=name,
+            section_item=None,
+            chunk_index=i,
+            text=text,
+            metadata=md,
+        )
+        for name, section_texts in texts.items()
+        for i, text in enumerate(section_texts)
+    ]
+
+
+class CountingEmbeddings:
+    def __init__(self) -> None:
+        self.embedded: list[str] = []
+
+    async def embed_many(self, texts):
+        texts = list(texts)
+        self.embedded.extend(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_amendment_reuses_vectors_for_unchanged_chunks() -> None:
+    store = InMemoryVectorStore()
+    embeddings = CountingEmbeddings()
+    deps = SimpleNamespace(vector_store=store, embeddings=embeddings)
+
+    original = meta("ACC-1")
+    await embed_and_upsert(
+        deps,
+        chunks_for(original, {"MD&A": ["a", "b"], "Risk Factors": ["r1", "r2"]}),
+        original,
+    )
+    assert len(embeddings.embedded) == 4
+
+    amendment = meta("ACC-1A", form_type="10-Q/A")
+    assert is_amendment_of(amendment, original)
+
+    embeddings.embedded.clear()
+    stats = await embed_and_upsert(
+        deps,
+        # whitespace-only reflow of "a" still matches; "r2" changed
+        chunks_for(amendment, {"MD&A": [" a ", "b"], "Risk Factors": ["r1", "r2 revised"]}),
+        amendment,
+        base_accession="ACC-1",
+    )
+
+    assert embeddings.embedded == ["r2 revised"]
+    assert stats.total_chunks == 4
+    assert stats.reused_chunks == 3
+    assert stats.embedded_chunks == 1
+    assert stats.changed_sections == ["Risk Factors"]
+    assert await store.has_accession("AAPL", "ACC-1A") is True
+    assert len(await store.get_accession_chunks("AAPL", "ACC-1A")) == 4
+    # The amendment supersedes the original: each chunk is stored once.
+    assert await store.has_accession("AAPL", "ACC-1") is False
+    hits = await store.search([1.0, 1.0], top_k=10, ticker="AAPL")
+    assert sorted(h.chunk.text for h in hits) == [" a ", "b", "r1", "r2 revised"]
+
+
+@pytest.mark.asyncio
+async def test_search_filters_by_accession() -> None:
+    store = InMemoryVectorStore()
+    deps = SimpleNamespace(vector_store=store, embeddings=CountingEmbeddings())
+    prior = meta("ACC-0").model_copy(update={"period_of_report": date(2025, 6, 28)})
+    for md in (prior, meta("ACC-1")):
+        await embed_and_upsert(deps, chunks_for(md, {"MD&A": ["revenue grew"]}), md)
+
+    hits = await store.search([1.0, 1.0], top_k=10, ticker="AAPL", accession_number="ACC-1")
+
+    assert [h.chunk.metadata.accession_number for h in hits] == ["ACC-1"]
+
+
+def test_is_amendment_of_requires_same_period() -> None:
+    original = meta("ACC-1")
+    other_period = meta("ACC-2A", form_type="10-Q/A").model_copy(
+        update={"period_of_report": date(2025, 6, 28)}
+    )
+    assert is_amendment_of(other_period, original) is False
+    assert is_amendment_of(meta("ACC-2"), original) is False
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.api.jobs import JobRunner, JobStore, QueueFull
+
+
+@pytest.mark.asyncio
+async def test_job_runner_runs_jobs_and_records_results(tmp_path: Path) -> None:
+    release = asyncio.Event()
+
+    async def handler(payload):
+        await release.wait()
+        if payload["ticker"] == "BAD":
+            raise RuntimeError("No 10-Q found for ticker BAD")
+        return {"ticker": payload["ticker"], "ok": True}
+
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    runner = JobRunner(store, {"summary": handler}, workers=2, max_queue=10)
+    runner.start()
+    try:
+        good = runner.submit("summary", {"ticker": "AAPL"})
+        bad = runner.submit("summary", {"ticker": "BAD"})
+        await asyncio.sleep(0)
+        assert store.get(good).status == "running"
+
+        release.set()
+        for _ in range(50):
+            if store.get(good).finished_at and store.get(bad).finished_at:
+                break
+            await asyncio.sleep(0.01)
+
+        done = store.get(good)
+        assert done.status == "succeeded"
+        assert done.result == {"ticker": "AAPL", "ok": True}
+        assert done.started_at >= done.created_at
+        failed = store.get(bad)
+        assert failed.status == "failed"
+        assert "BAD" in failed.error
+        assert store.get("missing") is None
+    finally:
+        await runner.stop()
+        store.close()
+
+
+@pytest.mark.asyncio
+async def test_job_queue_is_bounded_and_cancelled_on_stop(tmp_path: Path) -> None:
+    async def handler(payload):
+        await asyncio.Event().wait()  # never finishes
+
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    runner = JobRunner(store, {"summary": handler}, workers=1, max_queue=1)
+    runner.start()
+    running = runner.submit("summary", {"ticker": "A"})
+    await asyncio.sleep(0)  # worker picks it up
+    queued = runner.submit("summary", {"ticker": "B"})
+    with pytest.raises(QueueFull):
+        runner.submit("summary", {"ticker": "C"})
+
+    await runner.stop()
+    assert store.get(running).status == "cancelled"
+    assert store.get(queued).status == "cancelled"
+    store.close()
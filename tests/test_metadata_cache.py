@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
@@ -78,3 +81,95 @@ def test_metadata_cache_matches_only_on_dates(tmp_path: Path) -> None:
 
     assert cached.matches(same_dates) is True
     assert cached.matches(diff_dates) is False
+
+
+def _meta(accession: str, filing_date: date) -> TenQMetadata:
+    return TenQMetadata(
+        ticker="AAPL",
+        cik="0000320193",
+        company_name="Apple Inc.",
+        form_type="10-Q",
+        filing_date=filing_date,
+        period_of_report=date(2025, 9, 27),
+        accession_number=accession,
+        primary_document="doc.htm",
+    )
+
+
+def test_metadata_cache_migrates_legacy_json(tmp_path: Path) -> None:
+    legacy = tmp_path / "latest_tenq.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "MSFT": {
+                    "cik": "0000789019",
+                    "accession_number": "ACC-MSFT",
+                    "filing_date": "2025-10-29",
+                    "period_of_report": None,
+                    "primary_document": "msft.htm",
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    cache = TenQMetadataCache(legacy)
+    cached = cache.get_latest("msft")
+    assert cached is not None and cached.accession_number == "ACC-MSFT"
+    assert cached.period_of_report is None
+    assert not legacy.exists()
+    assert (tmp_path / "latest_tenq.json.migrated").exists()
+    assert (tmp_path / "latest_tenq.sqlite3").exists()
+
+
+def test_metadata_cache_sees_writes_from_other_connections(tmp_path: Path) -> None:
+    cache = TenQMetadataCache(tmp_path / "latest_tenq.json")
+    cache.set_latest("AAPL", _meta("ACC-1", date(2025, 7, 31)))
+    assert cache.get_latest("AAPL").accession_number == "ACC-1"  # now memoized
+
+    # another worker process commits through its own connection
+    other = sqlite3.connect(tmp_path / "latest_tenq.sqlite3")
+    with other:
+        other.execute("UPDATE latest_tenq SET accession_number = 'ACC-2' WHERE ticker = 'AAPL'")
+    other.close()
+
+    assert cache.get_latest("AAPL").accession_number == "ACC-2"
+
+
+def test_metadata_cache_concurrent_writers_lose_nothing(tmp_path: Path) -> None:
+    cache = TenQMetadataCache(tmp_path / "latest_tenq.json")
+
+    def write(i: int) -> None:
+        cache.set_latest(f"T{i}", _meta(f"ACC-{i}", date(2025, 10, 31)))
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(write, range(200)))
+
+    fresh = sqlite3.connect(tmp_path / "latest_tenq.sqlite3")
+    assert fresh.execute("SELECT COUNT(*) FROM latest_tenq").fetchone()[0] == 200
+    fresh.close()
+    assert cache.get_latest("t123").accession_number == "ACC-123"
+
+
+def test_metadata_cache_upgrades_old_table_and_rebuilds_metadata(tmp_path: Path) -> None:
+    # a database written before form_type / company_name were stored
+    old = sqlite3.connect(tmp_path / "latest_tenq.sqlite3")
+    with old:
+        old.execute(
+            "CREATE TABLE latest_tenq (ticker TEXT PRIMARY KEY, cik TEXT NOT NULL, "
+            "accession_number TEXT NOT NULL, filing_date TEXT NOT NULL, "
+            "period_of_report TEXT, primary_document TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        old.execute(
+            "INSERT INTO latest_tenq VALUES ('MSFT', '0000789019', 'ACC-0', '2025-07-30', "
+            "'2025-06-30', 'msft.htm', 1.0)"
+        )
+    old.close()
+
+    cache = TenQMetadataCache(tmp_path / "latest_tenq.json")
+    assert cache.get_latest("MSFT").to_tenq("MSFT") is None  # form type unknown
+
+    meta = _meta("ACC-1", date(2025, 10, 31))
+    cache.set_latest("AAPL", meta)
+    rebuilt = cache.get_latest("AAPL").to_tenq("aapl")
+    assert rebuilt == meta
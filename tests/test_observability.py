@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.middleware import RequestContextMiddleware
+from app.observability.metrics import HTTP_REQUEST_SECONDS, STAGE_SECONDS, MetricsRegistry
+from app.observability.tracing import request_timings, span
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    lookups = registry.counter("lookups_total", "Lookups.", ("cache", "result"))
+    latency = registry.histogram("stage_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+
+    lookups.inc(cache="tenq_metadata", result="hit")
+    lookups.inc(2, cache="tenq_metadata", result="hit")
+    latency.observe(0.05, stage="parse")
+    latency.observe(0.5, stage="parse")
+    latency.observe(3.0, stage="parse")
+
+    assert registry.render().splitlines() == [
+        "# HELP lookups_total Lookups.",
+        "# TYPE lookups_total counter",
+        'lookups_total{cache="tenq_metadata",result="hit"} 3',
+        "# HELP stage_seconds Latency.",
+        "# TYPE stage_seconds histogram",
+        'stage_seconds_bucket{stage="parse",le="0.1"} 1',
+        'stage_seconds_bucket{stage="parse",le="1"} 2',
+        'stage_seconds_bucket{stage="parse",le="+Inf"} 3',
+        'stage_seconds_sum{stage="parse"} 3.55',
+        'stage_seconds_count{stage="parse"} 3',
+    ]
+    # Same definition returns the registered metric; a different one is an error.
+    assert registry.counter("lookups_total", "Lookups.", ("cache", "result")) is lookups
+    with pytest.raises(ValueError):
+        registry.histogram("lookups_total", "Lookups.", ("cache",))
+    with pytest.raises(ValueError):
+        lookups.inc(cache="tenq_metadata")
+
+
+def test_spans_feed_histogram_and_request_timings() -> None:
+    before = STAGE_SECONDS.count(stage="test_parse")
+    with request_timings() as timings:
+        with span("test_parse"):
+            pass
+        with pytest.raises(RuntimeError):
+            with span("test_parse"):
+                raise RuntimeError("boom")
+
+    assert STAGE_SECONDS.count(stage="test_parse") == before + 2
+    assert set(timings) == {"test_parse"}
+
+
+@pytest.mark.asyncio
+async def test_middleware_sets_request_id_and_records_route_latency() -> None:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str) -> dict[str, str]:
+        with span("test_lookup"):
+            return {"id": item_id}
+
+    before = HTTP_REQUEST_SECONDS.count(method="GET", route="/items/{item_id}", status="200")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        echoed = await client.get("/items/1", headers={"X-Request-ID": "abc-123"})
+        fresh = await client.get("/items/2", headers={"X-Request-ID": "not valid!"})
+
+    assert echoed.headers["x-request-id"] == "abc-123"
+    assert len(fresh.headers["x-request-id"]) == 32
+    after = HTTP_REQUEST_SECONDS.count(method="GET", route="/items/{item_id}", status="200")
+    assert after == before + 2
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents import orchestrator as orch
+
+
+class FakeResolver:
+    CIKS = {"GOOG": "0001652044", "GOOGL": "0001652044", "AAPL": "0000320193", "FAIL": "0000000001"}
+
+    async def resolve_many(self, tickers):
+        ciks = {t.upper(): self.CIKS.get(t.upper()) for t in tickers}
+        return {t: SimpleNamespace(cik_str=cik) if cik else None for t, cik in ciks.items()}
+
+
+@pytest.mark.asyncio
+async def test_batch_dedupes_by_cik_caps_agents_and_isolates_failures(monkeypatch) -> None:
+    ingested: list[str] = []
+    agent_runs: list[str] = []
+    in_flight = 0
+    peak = 0
+
+    async def fake_ensure(deps, ticker, filing_period=None, *, refresh=()):
+        ingested.append(ticker)
+        if ticker == "FAIL":
+            raise RuntimeError("No 10-Q found for ticker FAIL")
+        return None, None
+
+    async def fake_agents(deps, ticker, *, on_event=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        agent_runs.append(ticker)
+        return SimpleNamespace(ticker=ticker), SimpleNamespace(view="hold")
+
+    monkeypatch.setattr(orch, "ensure_tenq_ingested", fake_ensure)
+    monkeypatch.setattr(orch, "run_agents", fake_agents)
+    deps = SimpleNamespace(cik_resolver=FakeResolver(), agent_cache=None)
+
+    items = [
+        item
+        async for item in orch.summarize_10q_batch(
+            ["goog", "GOOGL", "AAPL", "NOPE", "FAIL", "AAPL"],
+            deps=deps,
+            agent_concurrency=1,
+        )
+    ]
+
+    by_ticker = {i.ticker: i for i in items}
+    assert sorted(by_ticker) == ["AAPL", "FAIL", "GOOG", "GOOGL", "NOPE"]
+    assert items[0].ticker == "NOPE"  # unknown tickers are reported first
+    assert "Unknown ticker" in by_ticker["NOPE"].error
+    assert "FAIL" in by_ticker["FAIL"].error
+    assert by_ticker["GOOGL"].ok and by_ticker["GOOGL"].insights.ticker == "GOOG"
+    assert by_ticker["AAPL"].ok
+
+    # share classes were ingested and analysed once; duplicates collapsed
+    assert sorted(ingested) == ["AAPL", "FAIL", "GOOG"]
+    assert sorted(agent_runs) == ["AAPL", "GOOG"]
+    assert peak == 1
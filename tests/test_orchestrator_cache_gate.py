@@ -7,6 +7,14 @@ from types import SimpleNamespace
 import pytest
 
 from app.agents import orchestrator as orch
+from app.agents.models import (
+    CompanyProfile,
+    DecisionOutput,
+    FinancialSummary,
+    GuidanceSummary,
+    LiquiditySummary,
+    TenQInsights,
+)
 from app.edgar.models import TenQMetadata
 from app.parsing.models import TenQChunk
 from app.vectorstore.in_memory import InMemoryVectorStore
@@ -65,6 +73,9 @@ class FakeParser:
             )
         ]
 
+    def parse_stream(self, stream, tenq_meta: TenQMetadata):
+        return self.parse_html(stream.read(), tenq_meta)
+
 
 class FakeEmbeddings:
     async def embed_many(self, texts: list[str]):
@@ -115,6 +126,7 @@ async def test_orchestrator_skips_sec_when_cached_and_ingested(tmp_path: Path, m
 
     # Patch cache file to tmp_path
     from app.edgar.metadata_cache import TenQMetadataCache
+
     cache_file = tmp_path / "cache.json"
     cache = TenQMetadataCache(cache_file)
     cache.set_latest("AAPL", meta)
@@ -179,12 +191,16 @@ async def test_orchestrator_reingests_when_dates_change(tmp_path: Path, monkeypa
     )
 
     from app.edgar.metadata_cache import TenQMetadataCache
+
     cache_file = tmp_path / "cache.json"
     cache = TenQMetadataCache(cache_file)
     cache.set_latest("AAPL", old_meta)
     monkeypatch.setattr(orch, "TenQMetadataCache", lambda: TenQMetadataCache(cache_file))
 
+    analysed: list[str | None] = []
+
     async def fake_run(*args, **kwargs):
+        analysed.append(kwargs["deps"].accession_number)
         return SimpleNamespace(output=SimpleNamespace(model_dump_json=lambda: "{}"))
 
     monkeypatch.setattr(orch.insights_agent, "run", fake_run)
@@ -195,3 +211,293 @@ async def test_orchestrator_reingests_when_dates_change(tmp_path: Path, monkeypa
     assert fake_subs.fetch_called == 1
     assert fake_dl.download_called == 1
     assert await store.has_accession("AAPL", "ACC-NEW") is True
+    # The agents see the filing just ingested; the shared deps are untouched.
+    assert analysed == ["ACC-NEW", "ACC-NEW"]
+    assert deps.accession_number is None
+
+
+@pytest.mark.asyncio
+async def test_swr_gate_serves_cached_and_revalidates_in_background(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    old_meta = TenQMetadata(
+        ticker="AAPL",
+        cik="0000320193",
+        company_name="Apple Inc.",
+        form_type="10-Q",
+        filing_date=date(2025, 7, 31),
+        period_of_report=date(2025, 6, 28),
+        accession_number="ACC-OLD",
+        primary_document="old.htm",
+    )
+    new_meta = old_meta.model_copy(
+        update={
+            "filing_date": date(2025, 10, 31),
+            "period_of_report": date(2025, 9, 27),
+            "accession_number": "ACC-NEW",
+        }
+    )
+
+    store = InMemoryVectorStore()
+    await store.upsert_chunks(
+        [
+            TenQChunk(
+                section_name="MD&A",
+                section_item="Item 2",
+                chunk_index=0,
+                text="x",
+                metadata=md_obj("AAPL", "0000320193", "ACC-OLD"),
+            )
+        ],
+        [[1.0, 0.0]],
+    )
+    data_file = tmp_path / "data" / "filings" / "AAPL" / "test.htm"
+    data_file.parent.mkdir(parents=True, exist_ok=True)
+    data_file.write_text("<html>stub</html>", encoding="utf-8")
+
+    fake_subs = FakeSubmissions(new_meta)
+    fake_dl = FakeDownloader()
+    deps = orch.AgentDependencies(
+        edgar_client=None,
+        cik_resolver=FakeCikResolver(),
+        submissions=fake_subs,
+        filing_downloader=fake_dl,
+        tenq_parser=FakeParser(),
+        embeddings=FakeEmbeddings(),
+        vector_store=store,
+    )
+
+    from app.edgar.metadata_cache import TenQMetadataCache
+
+    cache_file = tmp_path / "cache.json"
+    TenQMetadataCache(cache_file).set_latest("AAPL", old_meta)
+    monkeypatch.setattr(orch, "TenQMetadataCache", lambda: TenQMetadataCache(cache_file))
+
+    served: list[bool] = []
+
+    async def fake_run(*args, **kwargs):
+        served.append(await store.has_accession("AAPL", "ACC-NEW"))
+        return SimpleNamespace(output=SimpleNamespace(model_dump_json=lambda: "{}"))
+
+    monkeypatch.setattr(orch.insights_agent, "run", fake_run)
+    monkeypatch.setattr(orch.decision_agent, "run", fake_run)
+
+    settings = orch.get_settings()
+    monkeypatch.setattr(settings, "cache_gate_mode", "swr")
+
+    # Fresh: served from cache, SEC untouched.
+    await orch.summarize_10q_for_ticker("AAPL", deps=deps)
+    assert fake_subs.fetch_called == 0
+    assert "AAPL" not in orch._revalidations
+
+    # Stale: still served from the cached filing, re-check runs afterwards.
+    monkeypatch.setattr(settings, "cache_gate_fresh_seconds", 0.0)
+    served.clear()
+    await orch.summarize_10q_for_ticker("AAPL", deps=deps)
+    assert served == [False, False]
+    revalidation = orch._revalidations["AAPL"]
+    await orch.summarize_10q_for_ticker("AAPL", deps=deps)
+    assert orch._revalidations["AAPL"] is revalidation  # single flight
+
+    await revalidation
+    assert fake_subs.fetch_called == 1
+    assert fake_dl.download_called == 1
+    assert await store.has_accession("AAPL", "ACC-NEW") is True
+    assert TenQMetadataCache(cache_file).get_latest("AAPL").accession_number == "ACC-NEW"
+
+
+@pytest.mark.asyncio
+async def test_cache_gate_reports_miss_and_stage_timings(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    meta = TenQMetadata(
+        ticker="AAPL",
+        cik="0000320193",
+        company_name="Apple Inc.",
+        form_type="10-Q",
+        filing_date=date(2025, 10, 31),
+        period_of_report=date(2025, 9, 27),
+        accession_number="ACC-NEW",
+        primary_document="new.htm",
+    )
+    data_file = tmp_path / "data" / "filings" / "AAPL" / "test.htm"
+    data_file.parent.mkdir(parents=True, exist_ok=True)
+    data_file.write_text("<html>stub</html>", encoding="utf-8")
+
+    deps = orch.AgentDependencies(
+        edgar_client=None,
+        cik_resolver=FakeCikResolver(),
+        submissions=FakeSubmissions(meta),
+        filing_downloader=FakeDownloader(),
+        tenq_parser=FakeParser(),
+        embeddings=FakeEmbeddings(),
+        vector_store=InMemoryVectorStore(),
+    )
+
+    from app.edgar.metadata_cache import TenQMetadataCache
+
+    cache_file = tmp_path / "cache.json"
+    monkeypatch.setattr(orch, "TenQMetadataCache", lambda: TenQMetadataCache(cache_file))
+
+    events: list[tuple[str, dict]] = []
+    await orch.ensure_tenq_ingested(deps, "AAPL", on_event=lambda n, d: events.append((n, d)))
+    assert events[0] == ("cache", {"status": "miss"})
+    stages = [d["stage"] for n, d in events if n == "stage"]
+    assert stages == ["sec_check", "download", "parse", "embed"]
+    assert all(d["seconds"] >= 0 for n, d in events if n == "stage")
+
+    events.clear()
+    await orch.ensure_tenq_ingested(deps, "AAPL", on_event=lambda n, d: events.append((n, d)))
+    assert events == [("cache", {"status": "hit", "accession_number": "ACC-NEW"})]
+
+
+@pytest.mark.asyncio
+async def test_per_stage_refresh_reuses_skipped_stages(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    meta = TenQMetadata(
+        ticker="AAPL",
+        cik="0000320193",
+        company_name="Apple Inc.",
+        form_type="10-Q",
+        filing_date=date(2025, 10, 31),
+        period_of_report=date(2025, 9, 27),
+        accession_number="ACC-NEW",
+        primary_document="new.htm",
+    )
+    data_file = tmp_path / "data" / "filings" / "AAPL" / "test.htm"
+    data_file.parent.mkdir(parents=True, exist_ok=True)
+    data_file.write_text("<html>stub</html>", encoding="utf-8")
+
+    class CountingEmbeddings(FakeEmbeddings):
+        embedded = 0
+
+        async def embed_many(self, texts: list[str]):
+            self.embedded += len(texts)
+            return await super().embed_many(texts)
+
+    from app.agents.result_cache import AgentResultCache
+    from app.edgar.metadata_cache import TenQMetadataCache
+
+    subs, dl, emb = FakeSubmissions(meta), FakeDownloader(), CountingEmbeddings()
+    store = InMemoryVectorStore()
+    deps = orch.AgentDependencies(
+        edgar_client=None,
+        cik_resolver=FakeCikResolver(),
+        submissions=subs,
+        filing_downloader=dl,
+        tenq_parser=FakeParser(),
+        embeddings=emb,
+        vector_store=store,
+        agent_cache=AgentResultCache(tmp_path / "agents.sqlite3", model="test"),
+    )
+    cache_file = tmp_path / "cache.json"
+    monkeypatch.setattr(orch, "TenQMetadataCache", lambda: TenQMetadataCache(cache_file))
+
+    agent_runs = 0
+
+    async def fake_agents(deps, ticker, *, accession_number=None, on_event=None):
+        nonlocal agent_runs
+        agent_runs += 1
+        insights = TenQInsights(
+            company_profile=CompanyProfile(name="Apple Inc.", ticker=ticker, cik=meta.cik),
+            filing_metadata=meta,
+            high_level_summary=f"run {agent_runs}",
+            financial_summary=FinancialSummary(),
+            liquidity_and_capital_structure=LiquiditySummary(narrative=""),
+            guidance_and_outlook=GuidanceSummary(narrative=""),
+        )
+        decision = DecisionOutput(
+            decision="hold",
+            confidence=0.5,
+            time_horizon="12m",
+            positives=[],
+            negatives=[],
+            uncertainties=[],
+            risk_profile="medium",
+        )
+        return insights, decision
+
+    monkeypatch.setattr(orch, "run_agents", fake_agents)
+
+    await orch.summarize_10q_for_ticker("AAPL", deps=deps)
+    assert (subs.fetch_called, dl.download_called, emb.embedded, agent_runs) == (1, 1, 1, 1)
+
+    # nothing requested: cache gate + cached agent result
+    insights, _ = await orch.summarize_10q_for_ticker("AAPL", deps=deps)
+    assert (subs.fetch_called, dl.download_called, emb.embedded, agent_runs) == (1, 1, 1, 1)
+    assert insights.high_level_summary == "run 1"
+
+    # re-parse: no SEC call, stored vectors reused, agents re-run
+    await orch.summarize_10q_for_ticker("AAPL", deps=deps, refresh=["parse"])
+    assert (subs.fetch_called, dl.download_called, emb.embedded, agent_runs) == (1, 2, 1, 2)
+    assert len(await store.get_accession_chunks("AAPL", "ACC-NEW")) == 1
+
+    # re-embed: vectors recomputed, chunks replaced rather than duplicated
+    await orch.summarize_10q_for_ticker("AAPL", deps=deps, refresh=["embed"])
+    assert (subs.fetch_called, emb.embedded, agent_runs) == (1, 2, 3)
+    assert len(await store.get_accession_chunks("AAPL", "ACC-NEW")) == 1
+
+    # metadata only: SEC re-checked, unchanged filing is not re-ingested
+    await orch.summarize_10q_for_ticker("AAPL", deps=deps, refresh=["metadata"])
+    assert (subs.fetch_called, dl.download_called, emb.embedded, agent_runs) == (2, 3, 2, 3)
+
+    # agents only
+    await orch.summarize_10q_for_ticker("AAPL", deps=deps, refresh=["agents"])
+    assert (subs.fetch_called, dl.download_called, emb.embedded, agent_runs) == (2, 3, 2, 4)
+
+    with pytest.raises(ValueError):
+        await orch.summarize_10q_for_ticker("AAPL", deps=deps, refresh=["bogus"])
+
+
+@pytest.mark.asyncio
+async def test_past_period_is_analysed_without_moving_latest(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    latest = TenQMetadata(
+        ticker="AAPL",
+        cik="0000320193",
+        company_name="Apple Inc.",
+        form_type="10-Q",
+        filing_date=date(2025, 10, 31),
+        period_of_report=date(2025, 9, 27),
+        accession_number="ACC-NEW",
+        primary_document="new.htm",
+    )
+    older = latest.model_copy(
+        update={
+            "filing_date": date(2025, 8, 1),
+            "period_of_report": date(2025, 6, 28),
+            "accession_number": "ACC-OLD",
+        }
+    )
+    data_file = tmp_path / "data" / "filings" / "AAPL" / "test.htm"
+    data_file.parent.mkdir(parents=True, exist_ok=True)
+    data_file.write_text("<html>stub</html>", encoding="utf-8")
+
+    from app.edgar.metadata_cache import TenQMetadataCache
+
+    cache_file = tmp_path / "cache.json"
+    TenQMetadataCache(cache_file).set_latest("AAPL", latest)
+    monkeypatch.setattr(orch, "TenQMetadataCache", lambda: TenQMetadataCache(cache_file))
+    dl = FakeDownloader()
+    deps = orch.AgentDependencies(
+        edgar_client=None,
+        cik_resolver=FakeCikResolver(),
+        submissions=FakeSubmissions(older),
+        filing_downloader=dl,
+        tenq_parser=FakeParser(),
+        embeddings=FakeEmbeddings(),
+        vector_store=InMemoryVectorStore(),
+    )
+    analysed: list[str | None] = []
+
+    async def fake_agents(deps, ticker, *, accession_number=None, on_event=None):
+        analysed.append(accession_number)
+        return None, None
+
+    monkeypatch.setattr(orch, "run_agents", fake_agents)
+
+    for _ in range(2):
+        await orch.summarize_10q_for_ticker("AAPL", date(2025, 6, 28), deps=deps)
+
+    assert analysed == ["ACC-OLD", "ACC-OLD"]
+    assert dl.download_called == 1  # stored on the first call
+    assert TenQMetadataCache(cache_file).get_latest("AAPL").accession_number == "ACC-NEW"
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents import orchestrator as orch
+
+
+class FakeOutput(SimpleNamespace):
+    def model_dump(self, mode="python"):
+        return dict(vars(self))
+
+    def model_dump_json(self):
+        return str(vars(self))
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_insights_before_decision_agent_runs(monkeypatch) -> None:
+    release_decision = asyncio.Event()
+
+    async def fake_ensure(deps, ticker, filing_period=None, *, refresh=(), on_event=None):
+        on_event("cache", {"status": "miss"})
+        on_event("stage", {"stage": "download", "seconds": 0.0})
+        return None, None
+
+    async def run_insights(prompt, deps):
+        return SimpleNamespace(output=FakeOutput(ticker="AAPL"))
+
+    async def run_decision(prompt, deps):
+        # Blocks until the test has already received the insights event.
+        await release_decision.wait()
+        return SimpleNamespace(output=FakeOutput(view="hold"))
+
+    monkeypatch.setattr(orch, "ensure_tenq_ingested", fake_ensure)
+    monkeypatch.setattr(orch, "insights_agent", SimpleNamespace(run=run_insights))
+    monkeypatch.setattr(orch, "decision_agent", SimpleNamespace(run=run_decision))
+
+    events = []
+    async for name, data in orch.stream_10q_summary("aapl", deps=SimpleNamespace(agent_cache=None)):
+        events.append((name, data))
+        if name == "insights":
+            release_decision.set()
+
+    names = [name for name, _ in events]
+    assert names == ["cache", "stage", "insights", "decision", "done"]
+    assert events[0][1] == {"status": "miss"}
+    assert events[2][1]["insights"] == {"ticker": "AAPL"}
+    assert events[3][1]["decision"] == {"view": "hold"}
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_failure_as_error_event(monkeypatch) -> None:
+    async def fake_ensure(deps, ticker, filing_period=None, *, refresh=(), on_event=None):
+        on_event("cache", {"status": "miss"})
+        raise RuntimeError("No 10-Q found for ticker NOPE")
+
+    monkeypatch.setattr(orch, "ensure_tenq_ingested", fake_ensure)
+
+    deps = SimpleNamespace(agent_cache=None)
+    events = [e async for e in orch.stream_10q_summary("nope", deps=deps)]
+
+    assert [name for name, _ in events] == ["cache", "error"]
+    assert "NOPE" in events[1][1]["error"]
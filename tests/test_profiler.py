@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import app.api.middleware as middleware
+from app.api.middleware import ProfilingMiddleware, RequestContextMiddleware
+from app.observability.profiler import SamplingProfiler, tag_profile, write_profile
+
+
+def _spin(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(200))
+
+
+@pytest.mark.asyncio
+async def test_profiler_samples_loop_and_worker_threads(tmp_path: Path) -> None:
+    profiler = SamplingProfiler(interval_seconds=0.002)
+    session = profiler.start(ticker="AAPL")
+    await asyncio.to_thread(_spin, 0.1)
+    _spin(0.1)
+    profiler.stop(session)
+    session.tag(accession_number="0000320193-25-000001", ignored=None)
+
+    folded = session.folded()
+    worker = [line for line in folded.splitlines() if line.startswith("asyncio_")]
+    assert any(line.split(" ")[0].endswith("test_profiler:_spin") for line in worker)
+    assert "MainThread;" in folded and "test_profiler:_spin" in folded
+    assert session.tags == {"ticker": "AAPL", "accession_number": "0000320193-25-000001"}
+
+    first = write_profile(session, tmp_path, max_files=1)
+    assert "AAPL-0000320193-25-000001" in first.name
+    meta = json.loads(first.with_suffix(".json").read_text())
+    assert meta["samples"] == session.samples > 0
+
+    later = profiler.start(ticker="MSFT")
+    profiler.stop(later)
+    second = write_profile(later, tmp_path, max_files=1)
+    # Retention keeps only the newest profile (and its sidecar).
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        second.name,
+        second.with_suffix(".json").name,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_profiling_middleware_is_opt_in_by_header(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = SimpleNamespace(
+        profile_header_enabled=True,
+        profile_sample_rate=0.0,
+        profile_interval_ms=1.0,
+        profile_dir=str(tmp_path),
+        profile_max_files=10,
+    )
+    monkeypatch.setattr(middleware, "get_settings", lambda: settings)
+
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/work/{ticker}")
+    async def work(ticker: str) -> dict[str, str]:
+        tag_profile(ticker=ticker)
+        _spin(0.05)
+        return {"ticker": ticker}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/work/MSFT")
+        resp = await client.get("/work/AAPL", headers={"X-Profile": "1", "X-Request-ID": "req-1"})
+
+    profiles = list(tmp_path.glob("*.folded"))
+    assert len(profiles) == 1
+    assert profiles[0].name.endswith("-AAPL-na-req-1.folded")
+    meta = json.loads(profiles[0].with_suffix(".json").read_text())
+    assert meta["tags"]["route"] == "/work/{ticker}"
+    assert resp.headers["x-request-id"] == "req-1"
+
+    settings.profile_header_enabled = False
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/work/AAPL", headers={"X-Profile": "1"})
+    assert len(list(tmp_path.glob("*.folded"))) == 1
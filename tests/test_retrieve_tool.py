@@ -29,6 +29,7 @@ class FakeVectorStore:
         self._scored = scored
 
     async def search(self, *args, **kwargs):
+        self.kwargs = kwargs
         # Respect top_k so retrieve_tenq_chunks can cap results.
         top_k = kwargs.get("top_k", len(self._scored))
         return self._scored[:top_k]
@@ -39,6 +40,7 @@ class FakeDeps(SimpleNamespace):
         super().__init__(
             embeddings=FakeEmbeddings(),
             vector_store=FakeVectorStore(scored),
+            accession_number="ACC-1",
         )
 
 
@@ -69,5 +71,6 @@ async def test_retrieve_tool_caps_top_k_and_truncates() -> None:
     out = await retrieve_tenq_chunks(ctx, ticker="AAPL", query="growth", top_k=999)
 
     assert len(out) == MAX_TOP_K
+    assert ctx.deps.vector_store.kwargs["accession_number"] == "ACC-1"
     for c in out:
         assert len(c.text) == MAX_CHUNK_CHARS
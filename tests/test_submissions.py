@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from app.edgar.models import CompanySubmissions
+from app.edgar.submissions import SubmissionsService
+
+
+def _block(rows: list[tuple[str, str, str, str]]) -> dict[str, list[str]]:
+    # rows of (form, filingDate, accessionNumber, reportDate)
+    return {
+        "form": [r[0] for r in rows],
+        "filingDate": [r[1] for r in rows],
+        "accessionNumber": [r[2] for r in rows],
+        "primaryDocument": [f"{r[2]}.htm" for r in rows],
+        "reportDate": [r[3] for r in rows],
+    }
+
+
+RECENT = _block(
+    [
+        ("8-K", "2025-10-30", "8K-1", ""),
+        ("10-Q", "2025-08-01", "Q-2025-2", "2025-06-28"),
+        ("10-Q", "2025-05-02", "Q-2025-1", "2025-03-29"),
+        ("10-Q/A", "2025-06-01", "QA-2025-1", "2025-03-29"),
+    ]
+)
+PAGE_1 = _block(
+    [
+        ("10-Q", "2019-08-02", "Q-2019-2", "2019-06-29"),
+        ("10-K", "2019-10-30", "K-2019", "2019-09-28"),
+    ]
+)
+SUBMISSIONS_JSON = {
+    "cik": "320193",
+    "name": "Apple Inc.",
+    "tickers": ["AAPL"],
+    "filings": {
+        "recent": RECENT,
+        "files": [
+            {
+                "name": "CIK0000320193-submissions-001.json",
+                "filingCount": 2,
+                "filingFrom": "2019-01-01",
+                "filingTo": "2019-12-31",
+            },
+            {
+                "name": "CIK0000320193-submissions-000.json",
+                "filingCount": 1,
+                "filingFrom": "2010-01-01",
+                "filingTo": "2010-12-31",
+            },
+        ],
+    },
+}
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.paths: list[str] = []
+
+    async def get_json(self, path: str, data_host: bool = False):
+        self.paths.append(path)
+        if path.endswith("CIK0000320193.json"):
+            return SUBMISSIONS_JSON
+        if path.endswith("-001.json"):
+            return PAGE_1
+        raise AssertionError(f"unexpected fetch {path}")
+
+
+def test_columnar_parse_keeps_only_10q_rows_sorted_by_period() -> None:
+    subs = CompanySubmissions.from_json(SUBMISSIONS_JSON)
+
+    assert [r.accession_number for r in subs.tenq_rows] == ["Q-2025-1", "QA-2025-1", "Q-2025-2"]
+    assert subs.latest_tenq().accession_number == "Q-2025-2"
+    # the later-filed amendment wins for its period
+    assert subs.tenq_for_period(date(2025, 3, 29)).accession_number == "QA-2025-1"
+    assert subs.tenq_for_period(date(2024, 12, 28)) is None
+
+
+@pytest.mark.asyncio
+async def test_older_periods_fetch_only_the_needed_history_page() -> None:
+    client = FakeClient()
+    service = SubmissionsService(client)  # type: ignore[arg-type]
+    subs = await service.fetch_submissions("0000320193")
+
+    assert service.select_latest_10q(subs, target_period=date(2019, 6, 29)) is None
+    assert client.paths == ["submissions/CIK0000320193.json"]
+
+    meta = await service.select_10q_for_period(subs, date(2019, 6, 29))
+    assert meta is not None
+    assert meta.accession_number == "Q-2019-2"
+    assert meta.period_of_report == date(2019, 6, 29)
+    # the 2010 page ends before the requested period and is never fetched
+    assert client.paths[-1] == "submissions/CIK0000320193-submissions-001.json"
+    assert len(client.paths) == 2
+
+    # already-loaded pages aren't fetched again
+    await service.load_history(subs, since=date(2019, 1, 1))
+    assert len(client.paths) == 2